@@ -0,0 +1,48 @@
+"""add_research_query_indexes
+
+Revision ID: 4a1c7e2b9d35
+Revises: 3348fc927232
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a1c7e2b9d35'
+down_revision: Union[str, None] = '3348fc927232'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so existing installs don't lock service_requests
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sr_active_requested_dt', 'service_requests',
+            [sa.text('requested_datetime DESC')],
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_sr_active_code_requested_dt', 'service_requests',
+            ['service_code', 'requested_datetime'],
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_sr_active_closed_dt', 'service_requests',
+            ['closed_datetime'],
+            postgresql_where=sa.text("deleted_at IS NULL AND status = 'closed'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_sr_active_closed_dt', table_name='service_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_sr_active_code_requested_dt', table_name='service_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_sr_active_requested_dt', table_name='service_requests', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,41 @@
+"""add_list_endpoint_indexes
+
+Revision ID: 7d3e9f1a2c48
+Revises: 4a1c7e2b9d35
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e9f1a2c48'
+down_revision: Union[str, None] = '4a1c7e2b9d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so existing installs don't lock users/service_requests
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_active_staff', 'users',
+            ['full_name', 'username'],
+            postgresql_where=sa.text("is_active AND role IN ('staff', 'admin')"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_sr_active_status_requested_dt', 'service_requests',
+            ['status', sa.text('requested_datetime DESC')],
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_sr_active_status_requested_dt', table_name='service_requests', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_active_staff', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -332,10 +332,11 @@ async def verify_audit_log_integrity(
     """
     from app.services.audit_service import AuditService
     
-    is_valid = await AuditService.verify_integrity(db)
+    is_valid, first_invalid_id = await AuditService.verify_integrity(db)
     
     return {
         "integrity_valid": is_valid,
+        "first_invalid_id": first_invalid_id,
         "message": "Audit log chain is intact" if is_valid else "WARNING: Tampering detected in audit logs",
         "timestamp": datetime.utcnow().isoformat()
     }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -13,6 +13,7 @@ from app.models import User
 from app.core.auth import create_access_token, get_current_user
 from app.services.auth0_service import Auth0Service
 from app.services.audit_service import AuditService
+from app.services.staff_directory import invalidate_staff_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -254,6 +255,7 @@ async def initiate_login(
 @router.get("/callback")
 async def auth0_callback(
     request: Request,
+    background_tasks: BackgroundTasks,
     state: str = Query(...),
     code: str | None = None,
     error: str | None = None,
@@ -315,15 +317,19 @@ async def auth0_callback(
         
         if user:
             # Update user info from provider
-            if user_info.get("name") and not user.full_name:
+            name_filled = bool(user_info.get("name") and not user.full_name)
+            if name_filled:
                 user.full_name = user_info["name"]
             if user_info.get("sub"):
                 user.auth0_id = user_info["sub"]
             await db.commit()
+            if name_filled:
+                # full_name appears in the cached staff rosters
+                await invalidate_staff_cache()
         else:
             # Log failed attempt - user not in system
-            await AuditService.log_login_failed(
-                db=db,
+            background_tasks.add_task(
+                AuditService.log_detached, AuditService.log_login_failed,
                 username=email,
                 ip_address=ip_address,
                 user_agent=user_agent,
@@ -337,8 +343,8 @@ async def auth0_callback(
         
         if not user.is_active:
             # Log failed attempt - account disabled
-            await AuditService.log_login_failed(
-                db=db,
+            background_tasks.add_task(
+                AuditService.log_detached, AuditService.log_login_failed,
                 username=user.username,
                 ip_address=ip_address,
                 user_agent=user_agent,
@@ -359,8 +365,8 @@ async def auth0_callback(
         session_id = decoded.get("jti", "unknown")
         
         # Log successful login
-        await AuditService.log_login_success(
-            db=db,
+        background_tasks.add_task(
+            AuditService.log_detached, AuditService.log_login_success,
             user=user,
             ip_address=ip_address,
             user_agent=user_agent,
@@ -397,6 +403,7 @@ async def auth0_callback(
 @router.get("/logout")
 async def logout(
     request: Request,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     return_to: str = Query(..., description="URL to return to after logout")
@@ -421,8 +428,8 @@ async def logout(
             pass  # JWT decode failed, session_id stays "unknown"
     
     # Log logout event
-    await AuditService.log_logout(
-        db=db,
+    background_tasks.add_task(
+        AuditService.log_detached, AuditService.log_logout,
         user=current_user,
         ip_address=ip_address,
         session_id=session_id
@@ -4,7 +4,8 @@ from sqlalchemy import select
 from typing import List
 
 from app.db.session import get_db
-from app.models import Department, User
+from app.models import Department, User, user_departments
+from app.services.staff_directory import refresh_department_summaries, invalidate_staff_cache
 from app.schemas import DepartmentCreate, DepartmentResponse
 from app.core.auth import get_current_admin, get_current_staff
 
@@ -17,8 +18,14 @@ async def list_departments(
     _: User = Depends(get_current_staff)
 ):
     """List all departments (staff only — routing_email is internal)"""
-    result = await db.execute(select(Department).where(Department.is_active == True))
-    return result.scalars().all()
+    # Only the DepartmentResponse columns; skips the translations JSON
+    result = await db.execute(
+        select(
+            Department.id, Department.name, Department.description,
+            Department.routing_email, Department.is_active
+        ).where(Department.is_active == True)
+    )
+    return result.all()
 
 
 @router.post("/", response_model=DepartmentResponse, status_code=status.HTTP_201_CREATED)
@@ -38,7 +45,6 @@ async def create_department(
     dept = Department(**dept_data.model_dump())
     db.add(dept)
     await db.commit()
-    await db.refresh(dept)
     return dept
 
 
@@ -68,5 +74,14 @@ async def delete_department(
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
     
+    member_ids = (await db.execute(
+        select(user_departments.c.user_id).where(user_departments.c.department_id == dept_id)
+    )).scalars().all()
+    
     await db.delete(dept)
+    await db.flush()
+    # Drop the department from its members' denormalized summaries
+    await refresh_department_summaries(db, member_ids)
     await db.commit()
+    if member_ids:
+        await invalidate_staff_cache()
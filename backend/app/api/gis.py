@@ -5,18 +5,23 @@ from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
+import asyncio
 import json
 import httpx
 
 from app.db.session import get_db
-from app.models import User, SystemSettings
+from app.models import User, SystemSettings, SystemSecret
 from app.core.auth import get_current_admin
+from app.core.http_client import get_http_client
 from app.services.geocoding import (
     get_geocoding_service, get_boundary_service
 )
 
 router = APIRouter()
 
+MAX_BOUNDARY_FILE_SIZE = 50 * 1024 * 1024  # 50MB; detailed township outlines run to several MB
+BOUNDARY_UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
 async def get_google_api_key(db: AsyncSession) -> Optional[str]:
     """Get Google Maps API key from Secret Manager (decrypted)"""
@@ -39,7 +44,7 @@ async def geocode_address(
     api_key = await get_google_api_key(db)
     service = get_geocoding_service(api_key)
     
-    result = await service.geocode(address)
+    result = await service.geocode(address, http_client=get_http_client())
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,7 +69,7 @@ async def reverse_geocode(
     api_key = await get_google_api_key(db)
     service = get_geocoding_service(api_key)
     
-    result = await service.reverse_geocode(lat, lng)
+    result = await service.reverse_geocode(lat, lng, http_client=get_http_client())
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -79,12 +84,9 @@ async def reverse_geocode(
 
 
 @router.get("/boundaries")
-async def list_boundaries(
-    db: AsyncSession = Depends(get_db)
-):
+async def list_boundaries():
     """List all configured boundaries"""
-    api_key = await get_google_api_key(db)
-    service = get_boundary_service(api_key)
+    service = get_boundary_service()
     
     boundaries = service.get_all_boundaries()
     return [
@@ -98,12 +100,10 @@ async def list_boundaries(
 
 @router.get("/boundaries/{name}")
 async def get_boundary(
-    name: str,
-    db: AsyncSession = Depends(get_db)
+    name: str
 ):
     """Get a specific boundary with full geometry"""
-    api_key = await get_google_api_key(db)
-    service = get_boundary_service(api_key)
+    service = get_boundary_service()
     
     boundary = service.get_boundary(name)
     if not boundary:
@@ -123,16 +123,30 @@ async def get_boundary(
 async def upload_boundary(
     name: str,
     file: UploadFile = File(...),
-    _: User = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db)
+    _: User = Depends(get_current_admin)
 ):
     """Upload a GeoJSON boundary file (admin only)"""
+    if file.size is not None and file.size > MAX_BOUNDARY_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size: {MAX_BOUNDARY_FILE_SIZE // (1024*1024)}MB"
+        )
+    
+    # Read in chunks so an oversized upload is rejected without buffering all of it
+    content = bytearray()
+    while chunk := await file.read(BOUNDARY_UPLOAD_CHUNK_SIZE):
+        content += chunk
+        if len(content) > MAX_BOUNDARY_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size: {MAX_BOUNDARY_FILE_SIZE // (1024*1024)}MB"
+            )
+    
     try:
-        content = await file.read()
-        geojson = json.loads(content.decode())
+        # Parse the (often multi-MB) GeoJSON off the event loop
+        geojson = await asyncio.to_thread(json.loads, content)
         
-        api_key = await get_google_api_key(db)
-        service = get_boundary_service(api_key)
+        service = get_boundary_service()
         service.load_boundary_from_geojson(name, geojson)
         
         return {"status": "success", "message": f"Boundary '{name}' loaded"}
@@ -152,12 +166,10 @@ async def upload_boundary(
 async def check_point_in_boundary(
     lat: float,
     lng: float,
-    boundary_name: str,
-    db: AsyncSession = Depends(get_db)
+    boundary_name: str
 ):
     """Check if a point is within a boundary"""
-    api_key = await get_google_api_key(db)
-    service = get_boundary_service(api_key)
+    service = get_boundary_service()
     
     is_inside = service.point_in_boundary(lat, lng, boundary_name)
     
@@ -172,13 +184,28 @@ async def check_point_in_boundary(
 @router.get("/config")
 async def get_maps_config(db: AsyncSession = Depends(get_db)):
     """Get maps configuration for frontend"""
-    api_key = await get_google_api_key(db)
+    from app.services.secret_manager import get_secret
+    
+    # Load both map secrets in one query for the database fallback instead of
+    # letting each get_secret call open its own session
+    result = await db.execute(
+        select(SystemSecret).where(
+            SystemSecret.key_name.in_(["GOOGLE_MAPS_API_KEY", "GOOGLE_MAPS_MAP_ID"])
+        )
+    )
+    secrets = {s.key_name: s for s in result.scalars().all()}
+    
+    api_key = None
+    try:
+        api_key = await get_secret("GOOGLE_MAPS_API_KEY", db_secrets=secrets)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(f"Could not get Google Maps API Key: {e}")
     
     # Get Map ID for vector maps (enables 45° tilt, rotation, 3D buildings)
     map_id = None
     try:
-        from app.services.secret_manager import get_secret
-        map_id = await get_secret("GOOGLE_MAPS_MAP_ID")
+        map_id = await get_secret("GOOGLE_MAPS_MAP_ID", db_secrets=secrets)
     except Exception as e:
         import logging
         logging.getLogger(__name__).warning(f"Could not get Google Maps Map ID: {e}")
@@ -286,13 +313,11 @@ async def search_census_boundary(
 async def save_census_boundary(
     name: str,
     geojson_data: dict,
-    _: User = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db)
+    _: User = Depends(get_current_admin)
 ):
     """Save a Census boundary as the township boundary"""
     try:
-        api_key = await get_google_api_key(db)
-        service = get_boundary_service(api_key)
+        service = get_boundary_service()
         
         # Convert single geometry/feature to GeoJSON FeatureCollection if needed
         if "type" in geojson_data and geojson_data["type"] in ["Polygon", "MultiPolygon"]:
@@ -11,9 +11,10 @@ Tests all integrations and provides detailed status for:
 """
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, select, Integer
-from typing import Dict, Any, Optional
+from sqlalchemy import select, text, Integer, event
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 import os
 
 from app.db.session import get_db
@@ -21,13 +22,61 @@ from app.core.auth import get_current_admin
 from app.models import SystemSecret
 from app.core.encryption import decrypt_safe
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+# SystemSecret rows keyed by key_name, prefetched once per health run
+SecretMap = Dict[str, SystemSecret]
 
-async def get_config_value(db: AsyncSession, key_name: str, env_name: Optional[str] = None) -> Optional[str]:
+# Check statuses that count toward an overall "healthy" result
+HEALTHY_STATUSES = frozenset({"healthy", "configured", "disabled", "fallback"})
+
+# Results of checks that only change when secrets are edited, keyed by check
+# name. Cleared on any SystemSecret write.
+_config_status_cache: Dict[str, Dict[str, Any]] = {}
+
+# Only statuses derived purely from configuration are cached; live probe
+# results ("healthy") and errors are recomputed on every run
+CACHEABLE_STATUSES = frozenset({"configured", "not_configured"})
+
+
+@event.listens_for(SystemSecret, "after_insert")
+@event.listens_for(SystemSecret, "after_update")
+@event.listens_for(SystemSecret, "after_delete")
+def _invalidate_config_status_cache(mapper, connection, target):
+    """Drop cached config-derived check results when a secret changes."""
+    _config_status_cache.clear()
+
+
+def clear_config_status_cache() -> None:
+    """Clear cached check results after Core-level SystemSecret writes (no mapper events)."""
+    _config_status_cache.clear()
+
+
+async def load_all_secrets(db: AsyncSession) -> Optional[SecretMap]:
+    """
+    Load every SystemSecret row in one query, keyed by key_name.
+    
+    The table holds a few dozen rows, so one SELECT is far cheaper than the
+    per-key lookups a full health run would otherwise make. Returns None if
+    the table can't be read, in which case checks fall back to per-key queries.
+    """
+    try:
+        result = await db.execute(select(SystemSecret))
+        return {secret.key_name: secret for secret in result.scalars()}
+    except Exception:
+        return None
+
+
+async def get_config_value(
+    db: AsyncSession,
+    key_name: str,
+    env_name: Optional[str] = None,
+    secrets: Optional[SecretMap] = None
+) -> Optional[str]:
     """
     Get a configuration value from environment variable OR database secret.
-    Prioritizes env var if set, falls back to database.
+    Prioritizes env var if set, falls back to database (or to the prefetched
+    secrets map from load_all_secrets, when given).
     """
     # Check environment variable first
     env_key = env_name or key_name
@@ -35,6 +84,12 @@ async def get_config_value(db: AsyncSession, key_name: str, env_name: Optional[s
     if env_value:
         return env_value
     
+    if secrets is not None:
+        secret = secrets.get(key_name)
+        if secret and secret.is_configured and secret.key_value:
+            return decrypt_safe(secret.key_value)
+        return None
+    
     # Fallback to database secret
     try:
         result = await db.execute(
@@ -49,13 +104,22 @@ async def get_config_value(db: AsyncSession, key_name: str, env_name: Optional[s
     return None
 
 
-async def check_database(db: AsyncSession) -> Dict[str, Any]:
+async def check_database(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     """Test database connectivity"""
     try:
         await db.execute(text("SELECT 1"))
+        from app.db.session import engine
+        pool = engine.pool
         return {
             "status": "healthy",
-            "message": "Database connection successful"
+            "message": "Database connection successful",
+            # Checkout pressure: sustained overflow means db_pool_size is too small
+            "pool": {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "idle": pool.checkedin()
+            }
         }
     except Exception as e:
         import logging
@@ -66,12 +130,12 @@ async def check_database(db: AsyncSession) -> Dict[str, Any]:
         }
 
 
-async def check_auth0(db: AsyncSession) -> Dict[str, Any]:
+async def check_auth0(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     """Test Auth0 SSO configuration"""
     from app.services.auth0_service import Auth0Service
     
     try:
-        status_info = await Auth0Service.check_status(db)
+        status_info = await Auth0Service.check_status(db, secrets=secrets)
         return status_info
     except Exception as e:
         import logging
@@ -83,14 +147,14 @@ async def check_auth0(db: AsyncSession) -> Dict[str, Any]:
 
 
 
-async def check_google_kms(db: AsyncSession) -> Dict[str, Any]:
+async def check_google_kms(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     """Test Google Cloud KMS for PII encryption"""
     try:
         # Check environment variables OR database secrets
-        project = await get_config_value(db, "GOOGLE_CLOUD_PROJECT")
-        key_ring = await get_config_value(db, "KMS_KEY_RING")
-        key_id = await get_config_value(db, "KMS_KEY_ID")
-        location = await get_config_value(db, "KMS_LOCATION") or "us-central1"
+        project = await get_config_value(db, "GOOGLE_CLOUD_PROJECT", secrets=secrets)
+        key_ring = await get_config_value(db, "KMS_KEY_RING", secrets=secrets)
+        key_id = await get_config_value(db, "KMS_KEY_ID", secrets=secrets)
+        location = await get_config_value(db, "KMS_LOCATION", secrets=secrets) or "us-central1"
         
         if not project:
             return {
@@ -156,14 +220,25 @@ async def check_google_kms(db: AsyncSession) -> Dict[str, Any]:
         }
 
 
-async def check_secret_manager(db: AsyncSession) -> Dict[str, Any]:
+async def check_secret_manager(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     """Test Google Secret Manager"""
+    cached = _config_status_cache.get("secret_manager")
+    if cached is not None:
+        return cached
+    
+    result = await _check_secret_manager(db, secrets)
+    if result["status"] in CACHEABLE_STATUSES:
+        _config_status_cache["secret_manager"] = result
+    return result
+
+
+async def _check_secret_manager(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     try:
         # Check for GCP project (from env OR database via Admin Console)
-        project = await get_config_value(db, "GOOGLE_CLOUD_PROJECT")
+        project = await get_config_value(db, "GOOGLE_CLOUD_PROJECT", secrets=secrets)
         
         # If GCP is configured via wizard, Secret Manager is available
-        has_gcp_credentials = await get_config_value(db, "GCP_SERVICE_ACCOUNT_JSON") is not None
+        has_gcp_credentials = await get_config_value(db, "GCP_SERVICE_ACCOUNT_JSON", secrets=secrets) is not None
         
         if not project:
             return {
@@ -203,10 +278,10 @@ async def check_secret_manager(db: AsyncSession) -> Dict[str, Any]:
         }
 
 
-async def check_vertex_ai(db: AsyncSession) -> Dict[str, Any]:
+async def check_vertex_ai(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     """Test Vertex AI (Gemini)"""
     try:
-        project = os.getenv("GOOGLE_VERTEX_PROJECT") or await get_config_value(db, "GOOGLE_CLOUD_PROJECT")
+        project = os.getenv("GOOGLE_VERTEX_PROJECT") or await get_config_value(db, "GOOGLE_CLOUD_PROJECT", secrets=secrets)
         location = os.getenv("GOOGLE_VERTEX_LOCATION", "us-central1")
         
         if not project:
@@ -238,13 +313,24 @@ async def check_vertex_ai(db: AsyncSession) -> Dict[str, Any]:
         }
 
 
-async def check_translation_api(db: AsyncSession) -> Dict[str, Any]:
+async def check_translation_api(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     """Test Google Translation API"""
+    cached = _config_status_cache.get("translation_api")
+    if cached is not None:
+        return cached
+    
+    result = await _check_translation_api(db, secrets)
+    if result["status"] in CACHEABLE_STATUSES:
+        _config_status_cache["translation_api"] = result
+    return result
+
+
+async def _check_translation_api(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     try:
         from app.services.secret_manager import get_secret
         
         # Check if API key is configured
-        api_key = await get_secret("GOOGLE_MAPS_API_KEY")
+        api_key = await get_secret("GOOGLE_MAPS_API_KEY", db_secrets=secrets)
         
         if not api_key:
             return {
@@ -269,14 +355,17 @@ async def check_translation_api(db: AsyncSession) -> Dict[str, Any]:
         }
 
 
-async def check_gcp_auth(db: AsyncSession) -> Dict[str, Any]:
+async def check_gcp_auth(db: AsyncSession, secrets: Optional[SecretMap] = None) -> Dict[str, Any]:
     """Test GCP authentication status using encrypted service account key"""
     try:
         # Check if there's an encrypted service account key
-        result = await db.execute(
-            select(SystemSecret).where(SystemSecret.key_name == "GCP_SERVICE_ACCOUNT_JSON")
-        )
-        sa_secret = result.scalar_one_or_none()
+        if secrets is not None:
+            sa_secret = secrets.get("GCP_SERVICE_ACCOUNT_JSON")
+        else:
+            result = await db.execute(
+                select(SystemSecret).where(SystemSecret.key_name == "GCP_SERVICE_ACCOUNT_JSON")
+            )
+            sa_secret = result.scalar_one_or_none()
         
         if sa_secret and sa_secret.is_configured:
             return {
@@ -298,6 +387,18 @@ async def check_gcp_auth(db: AsyncSession) -> Dict[str, Any]:
             "message": "GCP auth check failed"
         }
 
+# Checks reported by the admin health endpoint, in display order
+HEALTH_CHECKS: Tuple[Tuple[str, Callable[..., Awaitable[Dict[str, Any]]]], ...] = (
+    ("database", check_database),
+    ("auth0", check_auth0),
+    ("gcp_auth", check_gcp_auth),
+    ("google_kms", check_google_kms),
+    ("google_secret_manager", check_secret_manager),
+    ("vertex_ai", check_vertex_ai),
+    ("translation_api", check_translation_api),
+)
+
+
 @router.get("/")
 async def health_check(
     db: AsyncSession = Depends(get_db),
@@ -309,23 +410,27 @@ async def health_check(
     Admin only endpoint.
     """
     
-    # Run all checks
-    results = {
-        "database": await check_database(db),
-        "auth0": await check_auth0(db),
-        "gcp_auth": await check_gcp_auth(db),
-        "google_kms": await check_google_kms(db),
-        "google_secret_manager": await check_secret_manager(db),
-        "vertex_ai": await check_vertex_ai(db),
-        "translation_api": await check_translation_api(db)
-    }
-    
-    # Calculate overall health
-    statuses = [v["status"] for v in results.values()]
+    # Run all checks. They share one session, so they run one at a time,
+    # and read secrets from a single prefetched batch.
+    secrets = await load_all_secrets(db)
+    results = {}
+    for name, check_func in HEALTH_CHECKS:
+        results[name] = await check_func(db, secrets)
     
-    if all(s in ["healthy", "configured", "disabled", "fallback"] for s in statuses):
+    # Calculate overall health in a single pass over the results
+    has_error = False
+    all_ok = True
+    for check in results.values():
+        check_status = check["status"]
+        if check_status == "error":
+            has_error = True
+            all_ok = False
+        elif check_status not in HEALTHY_STATUSES:
+            all_ok = False
+
+    if all_ok:
         overall = "healthy"
-    elif any(s == "error" for s in statuses):
+    elif has_error:
         overall = "degraded"
     else:
         overall = "partial"
@@ -337,6 +442,10 @@ async def health_check(
     }
 
 
+# /quick is polled by external monitors; format its body directly as bytes
+_QUICK_BODY_TEMPLATE = b'{"status":"ok","timestamp":"%s"}'
+
+
 @router.get("/quick")
 async def quick_health_check():
     """
@@ -344,19 +453,31 @@ async def quick_health_check():
     
     Just checks if the API is responding.
     """
-    return {
-        "status": "ok",
-        "timestamp": __import__("datetime").datetime.now().isoformat()
-    }
+    return Response(
+        content=_QUICK_BODY_TEMPLATE % __import__("datetime").datetime.now().isoformat().encode(),
+        media_type="application/json"
+    )
 
 
 # ==================== UPTIME MONITORING ====================
 
+import asyncio
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from sqlalchemy import desc
+from sqlalchemy import desc, insert
 from app.models import UptimeRecord
 
 
+@dataclass(slots=True)
+class UptimeSample:
+    """One uptime history point (serialized as an object by orjson)."""
+    status: str
+    response_time_ms: Optional[int]
+    error: Optional[str]
+    checked_at: Optional[str]
+
+
 @router.get("/uptime/history")
 async def get_uptime_history(
     db: AsyncSession = Depends(get_db),
@@ -373,29 +494,37 @@ async def get_uptime_history(
     since = datetime.utcnow() - timedelta(hours=hours)
     
     result = await db.execute(
-        select(UptimeRecord)
+        select(
+            UptimeRecord.service_name,
+            UptimeRecord.status,
+            UptimeRecord.response_time_ms,
+            UptimeRecord.error_message,
+            UptimeRecord.checked_at
+        )
         .where(UptimeRecord.checked_at >= since)
         .order_by(desc(UptimeRecord.checked_at))
     )
-    records = result.scalars().all()
     
     # Group by service
-    history = {}
-    for record in records:
-        if record.service_name not in history:
-            history[record.service_name] = []
-        history[record.service_name].append({
-            "status": record.status,
-            "response_time_ms": record.response_time_ms,
-            "error": record.error_message,
-            "checked_at": record.checked_at.isoformat() if record.checked_at else None
-        })
+    history: Dict[str, List[UptimeSample]] = {}
+    for service_name, status, response_time_ms, error_message, checked_at in result:
+        samples = history.get(service_name)
+        if samples is None:
+            samples = history[service_name] = []
+        samples.append(UptimeSample(
+            status,
+            response_time_ms,
+            error_message,
+            checked_at.isoformat() if checked_at else None
+        ))
     
-    return {
+    # Returned directly so orjson serializes the slotted samples natively
+    # instead of FastAPI converting each one to a dict first
+    return ORJSONResponse({
         "period_hours": hours,
         "since": since.isoformat(),
         "services": history
-    }
+    })
 
 
 @router.get("/uptime/stats")
@@ -452,16 +581,97 @@ async def record_uptime_check(
     Record a health check result for a service.
     Called internally after health checks.
     """
-    record = UptimeRecord(
-        service_name=service_name,
-        status=status,
-        response_time_ms=response_time_ms,
-        error_message=error_message[:500] if error_message else None
-    )
-    db.add(record)
+    await record_uptime_checks(db, [(service_name, status, response_time_ms, error_message)])
     await db.commit()
 
 
+async def record_uptime_checks(
+    db: AsyncSession,
+    rows: List[Tuple[str, str, Optional[int], Optional[str]]]
+):
+    """
+    Insert a batch of (service_name, status, response_time_ms, error_message)
+    results as a single multi-row INSERT. Does not commit.
+    """
+    if not rows:
+        return
+    await db.execute(
+        insert(UptimeRecord),
+        [
+            {
+                "service_name": service_name,
+                "status": status,
+                "response_time_ms": response_time_ms,
+                "error_message": error_message[:500] if error_message else None
+            }
+            for service_name, status, response_time_ms, error_message in rows
+        ]
+    )
+
+
+# Services tracked by the uptime monitor. Shared by the background loop in
+# app.main and the manual check-now endpoint so both record the same set.
+UPTIME_CHECKS: Tuple[Tuple[str, Callable[..., Awaitable[Dict[str, Any]]]], ...] = (
+    ("database", check_database),
+    ("auth0", check_auth0),
+    ("google_kms", check_google_kms),
+    ("secret_manager", check_secret_manager),
+    ("vertex_ai", check_vertex_ai),
+    ("translation_api", check_translation_api),
+)
+
+# A manual check-now within this many seconds of the last run returns the
+# last run's results instead of hitting every integration again
+UPTIME_RECHECK_SECONDS = 30
+
+# Only one uptime run at a time across the monitor loop and check-now callers
+_uptime_lock = asyncio.Lock()
+_last_uptime_run: Dict[str, Any] = {"finished_at": None, "results": {}}
+
+
+async def run_uptime_checks(
+    db: AsyncSession,
+    max_age: Optional[float] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every uptime check, record the results in one INSERT, and return a
+    summary keyed by service name.
+    
+    Runs are serialized. If max_age is given and the previous run finished
+    less than max_age seconds ago (including a run that was in progress
+    while this call waited), its results are returned without re-checking.
+    """
+    async with _uptime_lock:
+        finished_at = _last_uptime_run["finished_at"]
+        if max_age is not None and finished_at is not None and time.monotonic() - finished_at < max_age:
+            return _last_uptime_run["results"]
+        
+        secrets = await load_all_secrets(db)
+        results = {}
+        rows = []
+        for service_name, check_func in UPTIME_CHECKS:
+            start = time.time()
+            try:
+                check_result = await check_func(db, secrets)
+                response_time = int((time.time() - start) * 1000)
+                status = "healthy" if check_result["status"] in HEALTHY_STATUSES else "down"
+                error = None if status == "healthy" else check_result.get("message")
+            except Exception as e:
+                response_time = int((time.time() - start) * 1000)
+                status = "down"
+                error = str(e)
+            
+            rows.append((service_name, status, response_time, error))
+            results[service_name] = {"status": status, "response_time_ms": response_time}
+        
+        await record_uptime_checks(db, rows)
+        await db.commit()
+        
+        _last_uptime_run["finished_at"] = time.monotonic()
+        _last_uptime_run["results"] = results
+        return results
+
+
 @router.post("/uptime/check-now")
 async def trigger_uptime_check(
     db: AsyncSession = Depends(get_db),
@@ -469,32 +679,9 @@ async def trigger_uptime_check(
 ):
     """
     Manually trigger an uptime check for all services and record results.
-    """
-    import time
-    
-    services_to_check = [
-        ("database", check_database),
-        ("auth0", check_auth0),
-        ("google_kms", check_google_kms),
-        ("secret_manager", check_secret_manager),
-        ("vertex_ai", check_vertex_ai),
-        ("translation_api", check_translation_api),
-    ]
-    
-    results = {}
-    for service_name, check_func in services_to_check:
-        start = time.time()
-        try:
-            check_result = await check_func(db)
-            response_time = int((time.time() - start) * 1000)
-            status = "healthy" if check_result["status"] in ["healthy", "configured", "fallback"] else "down"
-            error = None if status == "healthy" else check_result.get("message")
-        except Exception as e:
-            response_time = int((time.time() - start) * 1000)
-            status = "down"
-            error = str(e)
-        
-        await record_uptime_check(db, service_name, status, response_time, error)
-        results[service_name] = {"status": status, "response_time_ms": response_time}
     
+    Concurrent or back-to-back triggers share the most recent run rather
+    than repeating every integration check.
+    """
+    results = await run_uptime_checks(db, max_age=UPTIME_RECHECK_SECONDS)
     return {"checked": len(results), "results": results}
@@ -1,26 +1,85 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, update, delete
+from typing import List, Optional
+from pydantic import TypeAdapter
+import logging
 
 from app.db.session import get_db
 from app.models import MapLayer, User
 from app.schemas import MapLayerCreate, MapLayerUpdate, MapLayerResponse
 from app.core.auth import get_current_admin
+from app.services.response_cache import get_cached, set_cached, invalidate
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Public layer reads are cached as serialized JSON (invalidated on any admin write)
+PUBLIC_LAYERS_CACHE_KEY = "map_layers:public"
+LAYER_CACHE_KEY = "map_layers:layer:{}"
+LAYER_CACHE_TTL = 300  # seconds
+
+_layer_adapter = TypeAdapter(MapLayerResponse)
+_layer_list_adapter = TypeAdapter(List[MapLayerResponse])
+
+
+# GeoJSON geometry type -> map layer type
+GEOMETRY_LAYER_TYPES = {
+    "Polygon": "polygon",
+    "MultiPolygon": "polygon",
+    "LineString": "line",
+    "MultiLineString": "line",
+    "Point": "point",
+    "MultiPoint": "point",
+}
+
+
+def infer_layer_type(geojson: Optional[dict]) -> Optional[str]:
+    """Infer the layer type from a Feature or the first feature of a FeatureCollection"""
+    if not geojson:
+        return None
+    
+    geojson_type = geojson.get("type")
+    if geojson_type == "FeatureCollection":
+        features = geojson.get("features", [])
+        if not features:
+            return None
+        geometry = features[0].get("geometry")
+    elif geojson_type == "Feature":
+        geometry = geojson.get("geometry")
+    else:
+        return None
+    
+    return GEOMETRY_LAYER_TYPES.get((geometry or {}).get("type", ""))
+
+
+async def _invalidate_layer_cache(layer_id: Optional[int] = None):
+    """Drop the public layer list (and one layer's entry, if given) from the cache"""
+    keys = [PUBLIC_LAYERS_CACHE_KEY]
+    if layer_id is not None:
+        keys.append(LAYER_CACHE_KEY.format(layer_id))
+    await invalidate(*keys)
 
 
 @router.get("/", response_model=List[MapLayerResponse])
 async def list_public_layers(db: AsyncSession = Depends(get_db)):
-    """List all active layers visible on resident portal (public)"""
+    """List all active layers visible on resident portal (public, cached)"""
+    cached = await get_cached(PUBLIC_LAYERS_CACHE_KEY)
+    if cached:
+        return cached
+    
     result = await db.execute(
         select(MapLayer)
         .where(MapLayer.is_active == True)
         .where(MapLayer.show_on_resident_portal == True)
         .order_by(MapLayer.name)
     )
-    return result.scalars().all()
+    # Validate and serialize the whole list in one pass of the compiled validator
+    layers = _layer_list_adapter.validate_python(result.scalars().all(), from_attributes=True)
+    payload = _layer_list_adapter.dump_json(layers)
+    await set_cached(PUBLIC_LAYERS_CACHE_KEY, payload, LAYER_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/all", response_model=List[MapLayerResponse])
@@ -43,27 +102,7 @@ async def create_layer(
 ):
     """Create a new map layer (admin only)"""
     # Auto-detect layer type from GeoJSON if not provided
-    layer_type = layer_data.layer_type
-    if not layer_type and layer_data.geojson:
-        geojson = layer_data.geojson
-        if geojson.get("type") == "FeatureCollection":
-            features = geojson.get("features", [])
-            if features:
-                geom_type = features[0].get("geometry", {}).get("type", "")
-                if geom_type in ["Polygon", "MultiPolygon"]:
-                    layer_type = "polygon"
-                elif geom_type in ["LineString", "MultiLineString"]:
-                    layer_type = "line"
-                elif geom_type in ["Point", "MultiPoint"]:
-                    layer_type = "point"
-        elif geojson.get("type") == "Feature":
-            geom_type = geojson.get("geometry", {}).get("type", "")
-            if geom_type in ["Polygon", "MultiPolygon"]:
-                layer_type = "polygon"
-            elif geom_type in ["LineString", "MultiLineString"]:
-                layer_type = "line"
-            elif geom_type in ["Point", "MultiPoint"]:
-                layer_type = "point"
+    layer_type = layer_data.layer_type or infer_layer_type(layer_data.geojson)
     
     layer = MapLayer(
         name=layer_data.name,
@@ -83,20 +122,28 @@ async def create_layer(
     
     db.add(layer)
     await db.commit()
-    await db.refresh(layer)
+    await _invalidate_layer_cache()
     return layer
 
 
 @router.get("/{layer_id}", response_model=MapLayerResponse)
 async def get_layer(layer_id: int, db: AsyncSession = Depends(get_db)):
-    """Get a layer by ID"""
+    """Get a layer by ID (cached)"""
+    cache_key = LAYER_CACHE_KEY.format(layer_id)
+    cached = await get_cached(cache_key)
+    if cached:
+        return cached
+    
     result = await db.execute(
         select(MapLayer).where(MapLayer.id == layer_id)
     )
     layer = result.scalar_one_or_none()
     if not layer:
         raise HTTPException(status_code=404, detail="Layer not found")
-    return layer
+    
+    payload = _layer_adapter.dump_json(_layer_adapter.validate_python(layer, from_attributes=True))
+    await set_cached(cache_key, payload, LAYER_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.put("/{layer_id}", response_model=MapLayerResponse)
@@ -107,45 +154,30 @@ async def update_layer(
     _: User = Depends(get_current_admin)
 ):
     """Update a map layer (admin only)"""
+    # Only fields that were sent with a value are changed
+    values = layer_data.model_dump(exclude_none=True)
+    if not values:
+        result = await db.execute(
+            select(MapLayer).where(MapLayer.id == layer_id)
+        )
+        layer = result.scalar_one_or_none()
+        if not layer:
+            raise HTTPException(status_code=404, detail="Layer not found")
+        return layer
+    
+    # Single UPDATE ... RETURNING instead of load, mutate, commit, refresh
     result = await db.execute(
-        select(MapLayer).where(MapLayer.id == layer_id)
+        update(MapLayer)
+        .where(MapLayer.id == layer_id)
+        .values(**values)
+        .returning(MapLayer)
     )
     layer = result.scalar_one_or_none()
     if not layer:
         raise HTTPException(status_code=404, detail="Layer not found")
     
-    # Update fields
-    if layer_data.name is not None:
-        layer.name = layer_data.name
-    if layer_data.description is not None:
-        layer.description = layer_data.description
-    if layer_data.layer_type is not None:
-        layer.layer_type = layer_data.layer_type
-    if layer_data.fill_color is not None:
-        layer.fill_color = layer_data.fill_color
-    if layer_data.stroke_color is not None:
-        layer.stroke_color = layer_data.stroke_color
-    if layer_data.fill_opacity is not None:
-        layer.fill_opacity = layer_data.fill_opacity
-    if layer_data.stroke_width is not None:
-        layer.stroke_width = layer_data.stroke_width
-    if layer_data.is_active is not None:
-        layer.is_active = layer_data.is_active
-    if layer_data.show_on_resident_portal is not None:
-        layer.show_on_resident_portal = layer_data.show_on_resident_portal
-    if layer_data.visible_on_map is not None:
-        layer.visible_on_map = layer_data.visible_on_map
-    if layer_data.routing_mode is not None:
-        layer.routing_mode = layer_data.routing_mode
-    if layer_data.geojson is not None:
-        layer.geojson = layer_data.geojson
-    if layer_data.service_codes is not None:
-        layer.service_codes = layer_data.service_codes
-    if layer_data.routing_config is not None:
-        layer.routing_config = layer_data.routing_config
-    
     await db.commit()
-    await db.refresh(layer)
+    await _invalidate_layer_cache(layer_id)
     return layer
 
 
@@ -157,11 +189,10 @@ async def delete_layer(
 ):
     """Delete a map layer (admin only)"""
     result = await db.execute(
-        select(MapLayer).where(MapLayer.id == layer_id)
+        delete(MapLayer).where(MapLayer.id == layer_id).returning(MapLayer.id)
     )
-    layer = result.scalar_one_or_none()
-    if not layer:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Layer not found")
     
-    await db.delete(layer)
     await db.commit()
+    await _invalidate_layer_cache(layer_id)
@@ -15,22 +15,27 @@ All endpoints:
 - Query sanitized data (no PII)
 - Log all access for audit purposes
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, extract
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, extract, tuple_, event, table, column, text, DateTime, Float, Integer, String
+from sqlalchemy.orm import selectinload, load_only, raiseload
 from typing import Optional
-from datetime import datetime, date, timedelta
+from functools import lru_cache
+from datetime import datetime, date, time as dt_time, timedelta
+import asyncio
 import csv
 import io
 import json
 import logging
+import orjson
 import re
 import hashlib
+import time
+import zlib
 
-from app.db.session import get_db
-from app.models import ServiceRequest, SystemSettings, ResearchAccessLog
+from app.db.session import get_db, SessionLocal
+from app.models import ServiceRequest, RequestComment, RequestAuditLog, SystemSettings, ResearchAccessLog
 from app.core.auth import get_current_researcher
 from app.core.config import get_settings
 
@@ -38,6 +43,69 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Rows fetched per server-side cursor batch when streaming exports
+EXPORT_BATCH_SIZE = 500
+
+# Formatted CSV rows buffered per chunk sent to the client
+CSV_FLUSH_ROWS = 100
+
+# gzip level for streamed exports. Level 1 gets most of the size reduction on
+# repetitive CSV/JSON text at a fraction of the CPU of the default level.
+EXPORT_GZIP_LEVEL = 1
+
+# Exports only read these columns, so skip the encrypted contact fields,
+# geometry and other wide columns when hydrating ServiceRequest rows. The
+# relationships are still needed for comment counts and friction metrics.
+_EXPORT_LOAD_OPTIONS = (
+    load_only(
+        ServiceRequest.service_request_id, ServiceRequest.service_code, ServiceRequest.service_name,
+        ServiceRequest.description, ServiceRequest.status, ServiceRequest.closed_substatus,
+        ServiceRequest.priority, ServiceRequest.manual_priority_score, ServiceRequest.address,
+        ServiceRequest.lat, ServiceRequest.long, ServiceRequest.matched_asset, ServiceRequest.media_urls,
+        ServiceRequest.source, ServiceRequest.assigned_department_id, ServiceRequest.flagged,
+        ServiceRequest.flag_reason, ServiceRequest.ai_analysis, ServiceRequest.vertex_ai_summary,
+        ServiceRequest.vertex_ai_classification, ServiceRequest.vertex_ai_analyzed_at,
+        ServiceRequest.requested_datetime, ServiceRequest.updated_datetime, ServiceRequest.closed_datetime
+    ),
+    selectinload(ServiceRequest.comments).load_only(RequestComment.visibility),
+    selectinload(ServiceRequest.audit_logs).load_only(
+        RequestAuditLog.action, RequestAuditLog.old_value, RequestAuditLog.new_value, RequestAuditLog.created_at
+    ),
+    # Any other relationship (e.g. assigned_department) must be added above
+    # with an eager loader; touching it per row would otherwise be an N+1
+    raiseload("*"),
+)
+
+# Hourly pre-aggregated request counts for get_analytics. Created by the startup
+# schema migrations in app/db/init_db.py and refreshed from the app lifespan.
+research_summary_mv = table(
+    "research_request_summary_mv",
+    column("hour_bucket", DateTime(timezone=True)),
+    column("service_code", String),
+    column("service_name", String),
+    column("status", String),
+    column("source", String),
+    column("request_count", Integer),
+    column("resolution_hours_sum", Float),
+    column("resolved_count", Integer),
+)
+
+# Seconds between refreshes of research_request_summary_mv (analytics staleness bound)
+RESEARCH_SUMMARY_REFRESH_SECONDS = 300
+
+# Bounds used to turn date filters into inclusive datetime ranges
+_DAY_START = dt_time.min
+_DAY_END = dt_time.max
+
+
+def _day_range(start_date: Optional[date], end_date: Optional[date]) -> tuple:
+    """Expand optional date filters to (start of first day, end of last day)"""
+    return (
+        datetime.combine(start_date, _DAY_START) if start_date else None,
+        datetime.combine(end_date, _DAY_END) if end_date else None
+    )
+
+
 # Infrastructure category mapping for civil engineering research
 INFRASTRUCTURE_CATEGORIES = {
     "pothole": "roads_pavement",
@@ -58,21 +126,56 @@ INFRASTRUCTURE_CATEGORIES = {
 }
 
 
+# Seconds the research-relevant SystemSettings fields are reused before re-reading
+RESEARCH_SETTINGS_TTL = 30
+
+# (checked_at, research_portal enabled, custom_domain) from the last lookup
+_research_settings_cache: Optional[tuple] = None
+
+
+@event.listens_for(SystemSettings, "after_insert")
+@event.listens_for(SystemSettings, "after_update")
+def _invalidate_research_settings_cache(mapper, connection, target):
+    """Drop the cached settings when they are saved through the ORM."""
+    global _research_settings_cache
+    _research_settings_cache = None
+
+
+async def get_research_settings(db: AsyncSession) -> tuple:
+    """Return (research_portal enabled, custom_domain), cached for RESEARCH_SETTINGS_TTL"""
+    global _research_settings_cache
+    now = time.monotonic()
+    if _research_settings_cache and now - _research_settings_cache[0] < RESEARCH_SETTINGS_TTL:
+        return _research_settings_cache[1:]
+
+    result = await db.execute(select(SystemSettings.modules, SystemSettings.custom_domain).limit(1))
+    row = result.first()
+    modules, custom_domain = row if row else (None, None)
+    enabled = bool(modules.get("research_portal", False)) if modules else False
+    
+    _research_settings_cache = (now, enabled, custom_domain)
+    return enabled, custom_domain
+
+
 async def check_research_enabled(db: AsyncSession):
     """Check if research portal is enabled via Admin Console modules"""
     if getattr(settings, 'enable_research_suite', False):
         return True
-
-    result = await db.execute(select(SystemSettings).limit(1))
-    system_settings = result.scalar_one_or_none()
-    if system_settings and system_settings.modules:
-        return system_settings.modules.get("research_portal", False)
     
-    return False
+    enabled, _ = await get_research_settings(db)
+    return enabled
+
+
+async def refresh_research_summary(db: AsyncSession) -> bool:
+    """Refresh the analytics materialized view. Skipped while the research portal is off."""
+    if not await check_research_enabled(db):
+        return False
+    await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY research_request_summary_mv"))
+    await db.commit()
+    return True
 
 
 async def log_research_access(
-    db: AsyncSession,
     user_id: int,
     username: str,
     action: str,
@@ -80,42 +183,66 @@ async def log_research_access(
     record_count: int,
     privacy_mode: str = "fuzzed"
 ):
-    """Log research data access for audit purposes"""
-    log_entry = ResearchAccessLog(
-        user_id=user_id,
-        username=username,
-        action=action,
-        parameters=parameters,
-        record_count=record_count,
-        privacy_mode=privacy_mode
-    )
-    db.add(log_entry)
-    await db.commit()
+    """
+    Log research data access for audit purposes.
+    
+    Scheduled via BackgroundTasks so the insert runs after the response is
+    sent. Uses its own session since the request's session is closed by then.
+    """
+    try:
+        async with SessionLocal() as log_db:
+            log_db.add(ResearchAccessLog(
+                user_id=user_id,
+                username=username,
+                action=action,
+                parameters=parameters,
+                record_count=record_count,
+                privacy_mode=privacy_mode
+            ))
+            await log_db.commit()
+    except Exception as e:
+        logger.error(f"Failed to write research access log ({action}): {e}")
+
+
+# PII patterns masked by sanitize_description. The two phone formats are
+# combined into one alternation (parenthesized form first so it wins on overlap).
+_PHONE_RE = re.compile(r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}|\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_NAME_RE = re.compile(r'\b(Mr\.|Mrs\.|Ms\.|Dr\.)\s+[A-Z][a-z]+')
 
 
 def sanitize_description(description: str) -> str:
     """Mask PII patterns in description text"""
     if not description:
         return ""
-    result = description
     
     # Mask phone numbers
-    phone_patterns = [
-        r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
-        r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}',
-    ]
-    for pattern in phone_patterns:
-        result = re.sub(pattern, '[PHONE REDACTED]', result)
+    result = _PHONE_RE.sub('[PHONE REDACTED]', description)
     
     # Mask email addresses
-    result = re.sub(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', '[EMAIL REDACTED]', result)
+    result = _EMAIL_RE.sub('[EMAIL REDACTED]', result)
     
     # Mask potential names (patterns like "John Smith" or "Mr. Smith")
-    result = re.sub(r'\b(Mr\.|Mrs\.|Ms\.|Dr\.)\s+[A-Z][a-z]+', '[NAME REDACTED]', result)
+    result = _NAME_RE.sub('[NAME REDACTED]', result)
     
     return result
 
 
+def _csv_field(value) -> str:
+    """Format one CSV field the way csv.writer's default (excel) dialect does"""
+    if value is None:
+        return ""
+    text = value if isinstance(value, str) else str(value)
+    if '"' in text or ',' in text or '\n' in text or '\r' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _csv_line(values: list) -> str:
+    """Format a CSV row (with trailing CRLF) without a csv.writer/StringIO round trip"""
+    return ",".join([_csv_field(v) for v in values]) + "\r\n"
+
+
 def fuzz_location(lat: float, long: float, grid_size: float = 0.0003) -> tuple:
     """Snap coordinates to grid (~100ft precision for privacy)"""
     if lat is None or long is None:
@@ -125,6 +252,35 @@ def fuzz_location(lat: float, long: float, grid_size: float = 0.0003) -> tuple:
     return round(fuzzed_lat, 6), round(fuzzed_long, 6)
 
 
+async def gzip_stream(chunks, level: int = EXPORT_GZIP_LEVEL):
+    """Compress an async byte stream into a single gzip member as it is produced"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(request: Request, body, media_type: str, filename: str) -> StreamingResponse:
+    """Stream an export download, gzip-encoded when the client accepts it"""
+    headers = {"Content-Disposition": f"attachment; filename={filename}", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        body = gzip_stream(body)
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
+def fuzz_locations(points: list, grid_size: float = 0.0003) -> list:
+    """Batch form of fuzz_location for exports: same results, one call per cursor batch"""
+    _round = round
+    return [
+        (None, None) if lat is None or long is None
+        else (_round(_round(lat / grid_size) * grid_size, 6), _round(_round(long / grid_size) * grid_size, 6))
+        for lat, long in points
+    ]
+
+
 def anonymize_address(address: str, privacy_mode: str) -> str:
     """Anonymize address based on privacy mode"""
     if not address:
@@ -844,6 +1000,7 @@ async def research_status(
 
 @router.get("/analytics")
 async def get_analytics(
+    background_tasks: BackgroundTasks,
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
     service_code: Optional[str] = Query(None, description="Filter by service category"),
@@ -854,83 +1011,83 @@ async def get_analytics(
     if not await check_research_enabled(db):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Research Suite is not enabled")
     
-    base_conditions = [ServiceRequest.deleted_at.is_(None)]
+    # Reads the hourly rollup rather than service_requests; counts lag by at
+    # most RESEARCH_SUMMARY_REFRESH_SECONDS
+    mv = research_summary_mv.c
+    base_conditions = []
     
-    if start_date:
-        base_conditions.append(ServiceRequest.requested_datetime >= datetime.combine(start_date, datetime.min.time()))
-    if end_date:
-        base_conditions.append(ServiceRequest.requested_datetime <= datetime.combine(end_date, datetime.max.time()))
+    range_start, range_end = _day_range(start_date, end_date)
+    if range_start:
+        base_conditions.append(mv.hour_bucket >= range_start)
+    if range_end:
+        base_conditions.append(mv.hour_bucket <= range_end)
     if service_code:
-        base_conditions.append(ServiceRequest.service_code == service_code)
-    
-    # Total count
-    total_query = select(func.count(ServiceRequest.id)).where(*base_conditions)
-    total_result = await db.execute(total_query)
-    total_count = total_result.scalar() or 0
-    
-    # Status distribution
-    status_query = select(
-        ServiceRequest.status,
-        func.count(ServiceRequest.id)
-    ).where(*base_conditions).group_by(ServiceRequest.status)
-    status_result = await db.execute(status_query)
-    status_distribution = {row[0]: row[1] for row in status_result.all()}
-    
-    # Average resolution time
-    closed_conditions = base_conditions + [
-        ServiceRequest.status == "closed",
-        ServiceRequest.closed_datetime.isnot(None)
-    ]
-    avg_resolution_query = select(
-        func.avg(
-            func.extract('epoch', ServiceRequest.closed_datetime - ServiceRequest.requested_datetime) / 3600.0
-        )
-    ).where(*closed_conditions)
-    avg_result = await db.execute(avg_resolution_query)
-    avg_resolution_hours = avg_result.scalar()
-    
-    # Category distribution
-    category_query = select(
-        ServiceRequest.service_code,
-        ServiceRequest.service_name,
-        func.count(ServiceRequest.id)
-    ).where(*base_conditions).group_by(
-        ServiceRequest.service_code, 
-        ServiceRequest.service_name
-    ).order_by(func.count(ServiceRequest.id).desc())
-    category_result = await db.execute(category_query)
-    category_distribution = [
-        {"code": row[0], "name": row[1], "count": row[2]} 
-        for row in category_result.all()
-    ]
+        base_conditions.append(mv.service_code == service_code)
+    
+    # Every distribution is a grouping set over the same filtered rows, so
+    # they all come back from a single query. The GROUPING() flags identify
+    # which set a row belongs to (0 = column is part of that row's set).
+    hour_expr = extract('hour', mv.hour_bucket)
+    dow_expr = extract('dow', mv.hour_bucket)
+    agg_query = select(
+        func.grouping(mv.status),
+        func.grouping(mv.source),
+        func.grouping(mv.service_code),
+        func.grouping(hour_expr),
+        mv.status,
+        mv.source,
+        mv.service_code,
+        mv.service_name,
+        hour_expr,
+        dow_expr,
+        func.sum(mv.request_count),
+        # Resolution totals; only read from the status = 'closed' row
+        func.sum(mv.resolution_hours_sum),
+        func.sum(mv.resolved_count)
+    ).select_from(research_summary_mv).where(*base_conditions).group_by(func.grouping_sets(
+        tuple_(mv.status),
+        tuple_(mv.source),
+        tuple_(mv.service_code, mv.service_name),
+        tuple_(hour_expr),
+        tuple_(dow_expr)
+    ))
+    agg_result = await db.execute(agg_query)
     
-    # Source distribution (civic engagement metric)
-    source_query = select(
-        ServiceRequest.source,
-        func.count(ServiceRequest.id)
-    ).where(*base_conditions).group_by(ServiceRequest.source)
-    source_result = await db.execute(source_query)
-    source_distribution = {row[0] or "unknown": row[1] for row in source_result.all()}
+    dow_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+    status_distribution = {}
+    source_distribution = {}  # Civic engagement metric
+    category_distribution = []
+    hourly_counts = {}
+    daily_counts = {}
+    avg_resolution_hours = None
+    
+    for (g_status, g_source, g_category, g_hour,
+         req_status, source, code, name, hour, dow, count,
+         resolution_hours_sum, resolved_count) in agg_result.all():
+        count = int(count)
+        if not g_status:
+            status_distribution[req_status] = count
+            if req_status == "closed" and resolved_count:
+                avg_resolution_hours = float(resolution_hours_sum) / int(resolved_count)
+        elif not g_source:
+            source_distribution[source] = count
+        elif not g_category:
+            category_distribution.append({"code": code, "name": name, "count": count})
+        elif not g_hour:
+            if hour is not None:
+                hourly_counts[int(hour)] = count
+        elif dow is not None:
+            daily_counts[int(dow)] = count
+    
+    total_count = sum(status_distribution.values())
+    category_distribution.sort(key=lambda c: c["count"], reverse=True)
     
     # Temporal patterns (for equity/civics research)
-    hour_query = select(
-        extract('hour', ServiceRequest.requested_datetime).label('hour'),
-        func.count(ServiceRequest.id)
-    ).where(*base_conditions).group_by('hour').order_by('hour')
-    hour_result = await db.execute(hour_query)
-    hourly_distribution = {int(row[0]): row[1] for row in hour_result.all() if row[0] is not None}
-    
-    # Day of week distribution
-    dow_query = select(
-        extract('dow', ServiceRequest.requested_datetime).label('dow'),
-        func.count(ServiceRequest.id)
-    ).where(*base_conditions).group_by('dow').order_by('dow')
-    dow_result = await db.execute(dow_query)
-    dow_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-    daily_distribution = {dow_names[int(row[0])]: row[1] for row in dow_result.all() if row[0] is not None}
+    hourly_distribution = {hour: hourly_counts[hour] for hour in sorted(hourly_counts)}
+    daily_distribution = {dow_names[dow]: daily_counts[dow] for dow in sorted(daily_counts)}
     
-    await log_research_access(
-        db, current_user.id, current_user.username, "view_analytics",
+    background_tasks.add_task(
+        log_research_access, current_user.id, current_user.username, "view_analytics",
         {"start_date": str(start_date), "end_date": str(end_date), "service_code": service_code},
         total_count
     )
@@ -953,6 +1110,8 @@ async def get_analytics(
 
 @router.get("/export/csv")
 async def export_csv(
+    request: Request,
+    background_tasks: BackgroundTasks,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     service_code: Optional[str] = Query(None),
@@ -977,35 +1136,38 @@ async def export_csv(
             detail="Exact location export requires admin privileges"
         )
     
-    query = select(ServiceRequest).options(
-        selectinload(ServiceRequest.comments),
-        selectinload(ServiceRequest.audit_logs)
-    ).where(ServiceRequest.deleted_at.is_(None))
-    
-    if start_date:
-        query = query.where(ServiceRequest.requested_datetime >= datetime.combine(start_date, datetime.min.time()))
-    if end_date:
-        query = query.where(ServiceRequest.requested_datetime <= datetime.combine(end_date, datetime.max.time()))
+    conditions = [ServiceRequest.deleted_at.is_(None)]
+    range_start, range_end = _day_range(start_date, end_date)
+    if range_start:
+        conditions.append(ServiceRequest.requested_datetime >= range_start)
+    if range_end:
+        conditions.append(ServiceRequest.requested_datetime <= range_end)
     if service_code:
-        query = query.where(ServiceRequest.service_code == service_code)
-    
-    query = query.order_by(ServiceRequest.requested_datetime.desc())
-    
-    result = await db.execute(query)
-    requests = result.scalars().all()
-    
-    await log_research_access(
-        db, current_user.id, current_user.username, "export_csv",
+        conditions.append(ServiceRequest.service_code == service_code)
+    
+    # Rows are formatted in Python rather than with COPY ... TO STDOUT: most
+    # columns are derived (census/SVI lookups, weather, sentiment, audit log
+    # friction metrics) and can't be produced by the database alone.
+    query = select(ServiceRequest).options(*_EXPORT_LOAD_OPTIONS).where(*conditions).order_by(
+        ServiceRequest.requested_datetime.desc()
+    ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    # Count separately so the access log doesn't require loading every row up front
+    record_count = (await db.execute(
+        select(func.count(ServiceRequest.id)).where(*conditions)
+    )).scalar() or 0
+    
+    background_tasks.add_task(
+        log_research_access, current_user.id, current_user.username, "export_csv",
         {"start_date": str(start_date), "end_date": str(end_date), "service_code": service_code},
-        len(requests), privacy_mode
+        record_count, privacy_mode
     )
     
-    def generate_csv():
-        output = io.StringIO()
-        writer = csv.writer(output)
+    async def generate_csv():
+        pending = []
         
         # Enhanced headers for research
-        writer.writerow([
+        header = [
             # Identifiers
             "request_id",
             # Category & Infrastructure
@@ -1038,191 +1200,196 @@ async def export_csv(
             "days_to_first_update", "status_change_count",
             # Civic Engagement
             "submission_channel", "department_id", "comment_count", "public_comment_count",
-        ])
-        yield output.getvalue()
-        output.seek(0)
-        output.truncate(0)
+        ]
+        yield _csv_line(header).encode()
         
-        for req in requests:
-            # Privacy-aware location
-            if privacy_mode == "fuzzed":
-                lat, long = fuzz_location(req.lat, req.long)
-            else:
-                lat, long = req.lat, req.long
-            
-            # Calculate metrics
-            resolution_hours = None
-            business_hours = None
-            if req.closed_datetime and req.requested_datetime:
-                delta = req.closed_datetime - req.requested_datetime
-                resolution_hours = round(delta.total_seconds() / 3600, 2)
-                business_hours = calculate_business_hours(req.requested_datetime, req.closed_datetime)
-            
-            # Temporal data
-            time_info = get_time_period(req.requested_datetime)
-            
-            # Infrastructure category
-            infra_category = get_infrastructure_category(req.service_code)
-            
-            # Matched asset info
-            asset_type = None
-            if req.matched_asset and isinstance(req.matched_asset, dict):
-                asset_type = req.matched_asset.get('asset_type') or req.matched_asset.get('layer_name')
-            
-            # AI analysis data
-            # AI priority is now in ai_analysis JSON, not a separate column
-            ai_summary = sanitize_description(req.vertex_ai_summary) if req.vertex_ai_summary else None
-            ai_priority = req.ai_analysis.get('priority_score') if req.ai_analysis else None
-            ai_priority_diff = None
-            if ai_priority and req.manual_priority_score:
-                ai_priority_diff = round(req.manual_priority_score - ai_priority, 2)
-            
-            # Description metrics
-            desc_word_count = len(req.description.split()) if req.description else 0
-            
-            # Media presence
-            has_photos = bool(req.media_urls and len(req.media_urls) > 0)
-            photo_count = len(req.media_urls) if req.media_urls else 0
-            
-            # Resolution outcome classification
-            resolution_outcome = None
-            if req.status == 'closed':
-                if req.closed_substatus == 'resolved':
-                    resolution_outcome = 'completed'
-                elif req.closed_substatus == 'no_action':
-                    resolution_outcome = 'no_action_needed'
-                elif req.closed_substatus == 'third_party':
-                    resolution_outcome = 'referred_external'
-                else:
-                    resolution_outcome = 'closed_other'
-            elif req.status == 'in_progress':
-                resolution_outcome = 'in_progress'
-            else:
-                resolution_outcome = 'pending'
-            
-            # Days to first update
-            days_to_first_update = None
-            if req.updated_datetime and req.requested_datetime:
-                delta = req.updated_datetime - req.requested_datetime
-                days_to_first_update = round(delta.total_seconds() / 86400, 2)
-            
-            # Zone-based demographic proxies (for equity research)
-            zone_id = generate_zone_id(req.lat, req.long)
-            
-            # SOCIAL EQUITY PACK - Real Census-based metrics
-            census_geoid = get_census_tract_geoid(req.lat, req.long)  # Real API call (cached)
-            income_quintile = get_income_quintile_from_zone(zone_id, census_geoid)
-            pop_density = get_population_density_category(zone_id, census_geoid)
-            svi = get_social_vulnerability_index(census_geoid)
-            housing_tenure = get_housing_tenure_mix(census_geoid)
-            
-            # ENVIRONMENTAL CONTEXT PACK - Real weather data
-            weather = get_weather_context(req.requested_datetime, req.lat, req.long)
-            asset_age = get_asset_age_years(req.matched_asset)
-            asset_attributes = get_matched_asset_attributes(req.matched_asset)
-            
-            # SENTIMENT & TRUST PACK
-            sentiment = analyze_sentiment(req.description)
-            trust = detect_trust_indicators(req.description)
-            
-            # Season for infrastructure/weather research
-            season = get_season(req.requested_datetime)
-            
-            # Comment counts for civic engagement research  
-            total_comments = len(req.comments) if req.comments else 0
-            public_comments = len([c for c in req.comments if c.visibility == 'external']) if req.comments else 0
-            
-            # BUREAUCRATIC FRICTION PACK
-            time_to_triage = calculate_time_to_triage(req.requested_datetime, req.audit_logs)
-            reassignments = count_reassignments(req.audit_logs)
-            off_hours = is_off_hours_submission(req.requested_datetime)
-            escalation = calculate_escalation_occurred(req.audit_logs)
-            status_changes = len(req.audit_logs) if req.audit_logs else 0
-            
-            writer.writerow([
-                req.service_request_id,
-                req.service_code,
-                req.service_name,
-                infra_category,
-                asset_type,
-                asset_attributes,  # Full JSON of asset properties
-                sanitize_description(req.description),
-                desc_word_count,
-                has_photos,
-                photo_count,
-                req.flagged,
-                req.flag_reason,
-                ai_priority,  # Now from ai_analysis.priority_score
-                req.vertex_ai_classification,
-                ai_summary,
-                bool(req.vertex_ai_analyzed_at),
-                ai_priority_diff,
-                req.status,
-                req.closed_substatus,
-                req.priority,
-                resolution_outcome,
-                anonymize_address(req.address, privacy_mode),
-                lat,
-                long,
-                zone_id,
-                # Social Equity Pack
-                census_geoid,
-                svi,
-                housing_tenure,
-                income_quintile,
-                pop_density,
-                # Environmental Context Pack
-                weather.get('precip_24h_mm'),
-                weather.get('temp_max_c'),
-                weather.get('temp_min_c'),
-                weather.get('weather_code'),
-                asset_age,
-                # Sentiment & Trust Pack
-                sentiment,
-                trust.get('is_repeat_report'),
-                trust.get('prior_report_mentioned'),
-                trust.get('frustration_expressed'),
-                # Temporal
-                req.requested_datetime.isoformat() if req.requested_datetime else None,
-                req.closed_datetime.isoformat() if req.closed_datetime else None,
-                req.updated_datetime.isoformat() if req.updated_datetime else None,
-                time_info.get('hour_of_day'),
-                time_info.get('day_of_week'),
-                time_info.get('month'),
-                time_info.get('year'),
-                time_info.get('is_weekend'),
-                time_info.get('is_business_hours'),
-                season,
-                # Bureaucratic Friction Pack
-                time_to_triage,
-                reassignments,
-                off_hours,
-                escalation,
-                resolution_hours,
-                business_hours,
-                days_to_first_update,
-                status_changes,
-                # Civic Engagement
-                req.source,
-                req.assigned_department_id,
-                total_comments,
-                public_comments,
-            ])
-            yield output.getvalue()
-            output.seek(0)
-            output.truncate(0)
+        # Rows are pulled from a server-side cursor in batches. The request's
+        # session is closed before the response body streams, so use our own.
+        async with SessionLocal() as stream_db:
+            result = await stream_db.stream(query)
+            async for batch in result.scalars().partitions():
+                # Privacy-aware location, computed for the whole batch at once
+                points = [(req.lat, req.long) for req in batch]
+                if privacy_mode == "fuzzed":
+                    points = fuzz_locations(points)
+                
+                for req, (lat, long) in zip(batch, points):
+                    # Calculate metrics
+                    resolution_hours = None
+                    business_hours = None
+                    if req.closed_datetime and req.requested_datetime:
+                        delta = req.closed_datetime - req.requested_datetime
+                        resolution_hours = round(delta.total_seconds() / 3600, 2)
+                        business_hours = calculate_business_hours(req.requested_datetime, req.closed_datetime)
+                    
+                    # Temporal data
+                    time_info = get_time_period(req.requested_datetime)
+                    
+                    # Infrastructure category
+                    infra_category = get_infrastructure_category(req.service_code)
+                    
+                    # Matched asset info
+                    asset_type = None
+                    if req.matched_asset and isinstance(req.matched_asset, dict):
+                        asset_type = req.matched_asset.get('asset_type') or req.matched_asset.get('layer_name')
+                    
+                    # AI analysis data
+                    # AI priority is now in ai_analysis JSON, not a separate column
+                    ai_summary = sanitize_description(req.vertex_ai_summary) if req.vertex_ai_summary else None
+                    ai_priority = req.ai_analysis.get('priority_score') if req.ai_analysis else None
+                    ai_priority_diff = None
+                    if ai_priority and req.manual_priority_score:
+                        ai_priority_diff = round(req.manual_priority_score - ai_priority, 2)
+                    
+                    # Description metrics
+                    desc_word_count = len(req.description.split()) if req.description else 0
+                    
+                    # Media presence
+                    has_photos = bool(req.media_urls and len(req.media_urls) > 0)
+                    photo_count = len(req.media_urls) if req.media_urls else 0
+                    
+                    # Resolution outcome classification
+                    resolution_outcome = None
+                    if req.status == 'closed':
+                        if req.closed_substatus == 'resolved':
+                            resolution_outcome = 'completed'
+                        elif req.closed_substatus == 'no_action':
+                            resolution_outcome = 'no_action_needed'
+                        elif req.closed_substatus == 'third_party':
+                            resolution_outcome = 'referred_external'
+                        else:
+                            resolution_outcome = 'closed_other'
+                    elif req.status == 'in_progress':
+                        resolution_outcome = 'in_progress'
+                    else:
+                        resolution_outcome = 'pending'
+                    
+                    # Days to first update
+                    days_to_first_update = None
+                    if req.updated_datetime and req.requested_datetime:
+                        delta = req.updated_datetime - req.requested_datetime
+                        days_to_first_update = round(delta.total_seconds() / 86400, 2)
+                    
+                    # Zone-based demographic proxies (for equity research)
+                    zone_id = generate_zone_id(req.lat, req.long)
+                    
+                    # SOCIAL EQUITY PACK - Real Census-based metrics
+                    census_geoid = await get_census_tract_geoid(req.lat, req.long)  # Real API call (cached)
+                    income_quintile = await get_income_quintile_from_zone(zone_id, census_geoid)
+                    pop_density = await get_population_density_category(zone_id, census_geoid)
+                    svi = await get_social_vulnerability_index(census_geoid)
+                    housing_tenure = await get_housing_tenure_mix(census_geoid)
+                    
+                    # ENVIRONMENTAL CONTEXT PACK - Real weather data
+                    # requests-based lookup; run it off the event loop
+                    weather = await asyncio.to_thread(get_weather_context, req.requested_datetime, req.lat, req.long)
+                    asset_age = get_asset_age_years(req.matched_asset)
+                    asset_attributes = get_matched_asset_attributes(req.matched_asset)
+                    
+                    # SENTIMENT & TRUST PACK
+                    sentiment = analyze_sentiment(req.description)
+                    trust = detect_trust_indicators(req.description)
+                    
+                    # Season for infrastructure/weather research
+                    season = get_season(req.requested_datetime)
+                    
+                    # Comment counts for civic engagement research  
+                    total_comments = len(req.comments) if req.comments else 0
+                    public_comments = len([c for c in req.comments if c.visibility == 'external']) if req.comments else 0
+                    
+                    # BUREAUCRATIC FRICTION PACK
+                    time_to_triage = calculate_time_to_triage(req.requested_datetime, req.audit_logs)
+                    reassignments = count_reassignments(req.audit_logs)
+                    off_hours = is_off_hours_submission(req.requested_datetime)
+                    escalation = calculate_escalation_occurred(req.audit_logs)
+                    status_changes = len(req.audit_logs) if req.audit_logs else 0
+                    
+                    row = [
+                        req.service_request_id,
+                        req.service_code,
+                        req.service_name,
+                        infra_category,
+                        asset_type,
+                        asset_attributes,  # Full JSON of asset properties
+                        sanitize_description(req.description),
+                        desc_word_count,
+                        has_photos,
+                        photo_count,
+                        req.flagged,
+                        req.flag_reason,
+                        ai_priority,  # Now from ai_analysis.priority_score
+                        req.vertex_ai_classification,
+                        ai_summary,
+                        bool(req.vertex_ai_analyzed_at),
+                        ai_priority_diff,
+                        req.status,
+                        req.closed_substatus,
+                        req.priority,
+                        resolution_outcome,
+                        anonymize_address(req.address, privacy_mode),
+                        lat,
+                        long,
+                        zone_id,
+                        # Social Equity Pack
+                        census_geoid,
+                        svi,
+                        housing_tenure,
+                        income_quintile,
+                        pop_density,
+                        # Environmental Context Pack
+                        weather.get('precip_24h_mm'),
+                        weather.get('temp_max_c'),
+                        weather.get('temp_min_c'),
+                        weather.get('weather_code'),
+                        asset_age,
+                        # Sentiment & Trust Pack
+                        sentiment,
+                        trust.get('is_repeat_report'),
+                        trust.get('prior_report_mentioned'),
+                        trust.get('frustration_expressed'),
+                        # Temporal
+                        req.requested_datetime.isoformat() if req.requested_datetime else None,
+                        req.closed_datetime.isoformat() if req.closed_datetime else None,
+                        req.updated_datetime.isoformat() if req.updated_datetime else None,
+                        time_info.get('hour_of_day'),
+                        time_info.get('day_of_week'),
+                        time_info.get('month'),
+                        time_info.get('year'),
+                        time_info.get('is_weekend'),
+                        time_info.get('is_business_hours'),
+                        season,
+                        # Bureaucratic Friction Pack
+                        time_to_triage,
+                        reassignments,
+                        off_hours,
+                        escalation,
+                        resolution_hours,
+                        business_hours,
+                        days_to_first_update,
+                        status_changes,
+                        # Civic Engagement
+                        req.source,
+                        req.assigned_department_id,
+                        total_comments,
+                        public_comments,
+                    ]
+                    pending.append(_csv_line(row))
+                    if len(pending) >= CSV_FLUSH_ROWS:
+                        yield ''.join(pending).encode()
+                        pending.clear()
+        
+        if pending:
+            yield ''.join(pending).encode()
     
     filename = f"research_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     
-    return StreamingResponse(
-        generate_csv(),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return export_response(request, generate_csv(), "text/csv", filename)
 
 
 @router.get("/export/geojson")
 async def export_geojson(
+    request: Request,
+    background_tasks: BackgroundTasks,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     service_code: Optional[str] = Query(None),
@@ -1248,205 +1415,213 @@ async def export_geojson(
             detail="Exact location export requires admin privileges"
         )
     
-    query = select(ServiceRequest).options(
-        selectinload(ServiceRequest.comments),
-        selectinload(ServiceRequest.audit_logs)
-    ).where(
+    conditions = [
         ServiceRequest.deleted_at.is_(None),
         ServiceRequest.lat.isnot(None),
         ServiceRequest.long.isnot(None)
-    )
-    
-    if start_date:
-        query = query.where(ServiceRequest.requested_datetime >= datetime.combine(start_date, datetime.min.time()))
-    if end_date:
-        query = query.where(ServiceRequest.requested_datetime <= datetime.combine(end_date, datetime.max.time()))
+    ]
+    range_start, range_end = _day_range(start_date, end_date)
+    if range_start:
+        conditions.append(ServiceRequest.requested_datetime >= range_start)
+    if range_end:
+        conditions.append(ServiceRequest.requested_datetime <= range_end)
     if service_code:
-        query = query.where(ServiceRequest.service_code == service_code)
+        conditions.append(ServiceRequest.service_code == service_code)
+    
+    query = select(ServiceRequest).options(*_EXPORT_LOAD_OPTIONS).where(*conditions).execution_options(yield_per=EXPORT_BATCH_SIZE)
     
-    result = await db.execute(query)
-    requests = result.scalars().all()
+    # Count separately so the access log doesn't require loading every row up front
+    record_count = (await db.execute(
+        select(func.count(ServiceRequest.id)).where(*conditions)
+    )).scalar() or 0
     
-    await log_research_access(
-        db, current_user.id, current_user.username, "export_geojson",
+    background_tasks.add_task(
+        log_research_access, current_user.id, current_user.username, "export_geojson",
         {"start_date": str(start_date), "end_date": str(end_date), "service_code": service_code},
-        len(requests), privacy_mode
+        record_count, privacy_mode
     )
     
-    features = []
-    for req in requests:
-        # Privacy-aware location
-        if privacy_mode == "fuzzed":
-            lat, long = fuzz_location(req.lat, req.long)
-        else:
-            lat, long = req.lat, req.long
-        
-        if lat is None or long is None:
-            continue
-        
-        # Calculate metrics
-        resolution_hours = None
-        business_hours = None
-        if req.closed_datetime and req.requested_datetime:
-            delta = req.closed_datetime - req.requested_datetime
-            resolution_hours = round(delta.total_seconds() / 3600, 2)
-            business_hours = calculate_business_hours(req.requested_datetime, req.closed_datetime)
-        
-        time_info = get_time_period(req.requested_datetime)
-        infra_category = get_infrastructure_category(req.service_code)
-        
-        asset_type = None
-        if req.matched_asset and isinstance(req.matched_asset, dict):
-            asset_type = req.matched_asset.get('asset_type') or req.matched_asset.get('layer_name')
-        
-        # AI priority is now in ai_analysis JSON, not a separate column
-        ai_summary = sanitize_description(req.vertex_ai_summary) if req.vertex_ai_summary else None
-        ai_priority = req.ai_analysis.get('priority_score') if req.ai_analysis else None
-        ai_priority_diff = None
-        if ai_priority and req.manual_priority_score:
-            ai_priority_diff = round(req.manual_priority_score - ai_priority, 2)
+    async def generate_geojson():
+        # Features are written one at a time as rows stream in, so neither the
+        # feature list nor the full JSON document is ever held in memory
+        yield b'{"type":"FeatureCollection","features":['
+        feature_count = 0
         
-        # Description metrics
-        desc_word_count = len(req.description.split()) if req.description else 0
-        has_photos = bool(req.media_urls and len(req.media_urls) > 0)
-        
-        # Resolution outcome
-        resolution_outcome = None
-        if req.status == 'closed':
-            if req.closed_substatus == 'resolved':
-                resolution_outcome = 'completed'
-            elif req.closed_substatus == 'no_action':
-                resolution_outcome = 'no_action_needed'
-            elif req.closed_substatus == 'third_party':
-                resolution_outcome = 'referred_external'
-            else:
-                resolution_outcome = 'closed_other'
-        elif req.status == 'in_progress':
-            resolution_outcome = 'in_progress'
-        else:
-            resolution_outcome = 'pending'
-        
-        # Zone-based fields
-        zone_id = generate_zone_id(req.lat, req.long)
-        season = get_season(req.requested_datetime)
-        
-        # Comment counts
-        total_comments = len(req.comments) if req.comments else 0
-        public_comments = len([c for c in req.comments if c.visibility == 'external']) if req.comments else 0
-        
-        # SOCIAL EQUITY PACK - Real Census ACS data
-        census_geoid = get_census_tract_geoid(req.lat, req.long)
-        income_quintile = get_income_quintile_from_zone(zone_id, census_geoid)
-        pop_density = get_population_density_category(zone_id, census_geoid)
-        svi = get_social_vulnerability_index(census_geoid)
-        housing_tenure = get_housing_tenure_mix(census_geoid)
-        
-        # ENVIRONMENTAL CONTEXT PACK - Real weather data
-        weather = get_weather_context(req.requested_datetime, req.lat, req.long)
-        asset_age = get_asset_age_years(req.matched_asset)
-        asset_attributes = get_matched_asset_attributes(req.matched_asset)
-        
-        # SENTIMENT & TRUST PACK
-        sentiment = analyze_sentiment(req.description)
-        trust = detect_trust_indicators(req.description)
-        
-        # BUREAUCRATIC FRICTION PACK
-        time_to_triage = calculate_time_to_triage(req.requested_datetime, req.audit_logs)
-        reassignments = count_reassignments(req.audit_logs)
-        off_hours = is_off_hours_submission(req.requested_datetime)
-        escalation = calculate_escalation_occurred(req.audit_logs)
-        
-        features.append({
-            "type": "Feature",
-            "geometry": {
-                "type": "Point",
-                "coordinates": [long, lat]
-            },
-            "properties": {
-                # Identifiers
-                "request_id": req.service_request_id,
-                "zone_id": zone_id,
-                
-                # Category & Infrastructure
-                "service_code": req.service_code,
-                "service_name": req.service_name,
-                "infrastructure_category": infra_category,
-                "matched_asset_type": asset_type,
-                "matched_asset_attributes": asset_attributes,  # Full JSON of asset properties
-                
-                # Issue Details
-                "description_word_count": desc_word_count,
-                "has_photos": has_photos,
-                
-                # AI Analysis (for ML/NLP research)
-                "ai_flagged": req.flagged,
-                "ai_flag_reason": req.flag_reason,
-                "ai_priority_score": ai_priority,  # Now from ai_analysis.priority_score
-                "ai_classification": req.vertex_ai_classification,
-                "ai_summary_sanitized": ai_summary,
-                "ai_analyzed": bool(req.vertex_ai_analyzed_at),
-                "ai_vs_manual_priority_diff": ai_priority_diff,
-                
-                # Status & Resolution
-                "status": req.status,
-                "closed_substatus": req.closed_substatus,
-                "priority": req.priority,
-                "resolution_outcome": resolution_outcome,
-                
-                # SOCIAL EQUITY PACK
-                "census_tract_geoid": census_geoid,
-                "social_vulnerability_index": svi,
-                "housing_tenure_renter_pct": housing_tenure,
-                "income_quintile": income_quintile,
-                "population_density": pop_density,
-                
-                # ENVIRONMENTAL CONTEXT PACK
-                "weather_precip_24h_mm": weather.get('precip_24h_mm'),
-                "weather_temp_max_c": weather.get('temp_max_c'),
-                "weather_temp_min_c": weather.get('temp_min_c'),
-                "weather_code": weather.get('weather_code'),
-                "nearby_asset_age_years": asset_age,
+        # The request's session is closed before the response body streams, so use our own
+        async with SessionLocal() as stream_db:
+            result = await stream_db.stream(query)
+            async for batch in result.scalars().partitions():
+                # Privacy-aware location, computed for the whole batch at once
+                points = [(req.lat, req.long) for req in batch]
+                if privacy_mode == "fuzzed":
+                    points = fuzz_locations(points)
                 
-                # SENTIMENT & TRUST PACK
-                "sentiment_score": sentiment,
-                "is_repeat_report": trust.get('is_repeat_report'),
-                "prior_report_mentioned": trust.get('prior_report_mentioned'),
-                "frustration_expressed": trust.get('frustration_expressed'),
-                
-                # Temporal
-                "submitted_datetime": req.requested_datetime.isoformat() if req.requested_datetime else None,
-                "closed_datetime": req.closed_datetime.isoformat() if req.closed_datetime else None,
-                "submission_hour": time_info.get('hour_of_day'),
-                "submission_day_of_week": time_info.get('day_of_week'),
-                "submission_month": time_info.get('month'),
-                "submission_year": time_info.get('year'),
-                "is_weekend": time_info.get('is_weekend'),
-                "is_business_hours": time_info.get('is_business_hours'),
-                "season": season,
-                
-                # BUREAUCRATIC FRICTION PACK
-                "time_to_triage_hours": time_to_triage,
-                "reassignment_count": reassignments,
-                "off_hours_submission": off_hours,
-                "escalation_occurred": escalation,
-                "total_hours_to_resolve": resolution_hours,
-                "business_hours_to_resolve": business_hours,
-                
-                # Civic Engagement
-                "submission_channel": req.source,
-                "department_id": req.assigned_department_id,
-                "comment_count": total_comments,
-                "public_comment_count": public_comments,
-            }
-        })
-    
-    geojson = {
-        "type": "FeatureCollection",
-        "features": features,
-        "metadata": {
+                for req, (lat, long) in zip(batch, points):
+                    if lat is None or long is None:
+                        continue
+                    
+                    # Calculate metrics
+                    resolution_hours = None
+                    business_hours = None
+                    if req.closed_datetime and req.requested_datetime:
+                        delta = req.closed_datetime - req.requested_datetime
+                        resolution_hours = round(delta.total_seconds() / 3600, 2)
+                        business_hours = calculate_business_hours(req.requested_datetime, req.closed_datetime)
+                    
+                    time_info = get_time_period(req.requested_datetime)
+                    infra_category = get_infrastructure_category(req.service_code)
+                    
+                    asset_type = None
+                    if req.matched_asset and isinstance(req.matched_asset, dict):
+                        asset_type = req.matched_asset.get('asset_type') or req.matched_asset.get('layer_name')
+                    
+                    # AI priority is now in ai_analysis JSON, not a separate column
+                    ai_summary = sanitize_description(req.vertex_ai_summary) if req.vertex_ai_summary else None
+                    ai_priority = req.ai_analysis.get('priority_score') if req.ai_analysis else None
+                    ai_priority_diff = None
+                    if ai_priority and req.manual_priority_score:
+                        ai_priority_diff = round(req.manual_priority_score - ai_priority, 2)
+                    
+                    # Description metrics
+                    desc_word_count = len(req.description.split()) if req.description else 0
+                    has_photos = bool(req.media_urls and len(req.media_urls) > 0)
+                    
+                    # Resolution outcome
+                    resolution_outcome = None
+                    if req.status == 'closed':
+                        if req.closed_substatus == 'resolved':
+                            resolution_outcome = 'completed'
+                        elif req.closed_substatus == 'no_action':
+                            resolution_outcome = 'no_action_needed'
+                        elif req.closed_substatus == 'third_party':
+                            resolution_outcome = 'referred_external'
+                        else:
+                            resolution_outcome = 'closed_other'
+                    elif req.status == 'in_progress':
+                        resolution_outcome = 'in_progress'
+                    else:
+                        resolution_outcome = 'pending'
+                    
+                    # Zone-based fields
+                    zone_id = generate_zone_id(req.lat, req.long)
+                    season = get_season(req.requested_datetime)
+                    
+                    # Comment counts
+                    total_comments = len(req.comments) if req.comments else 0
+                    public_comments = len([c for c in req.comments if c.visibility == 'external']) if req.comments else 0
+                    
+                    # SOCIAL EQUITY PACK - Real Census ACS data
+                    census_geoid = await get_census_tract_geoid(req.lat, req.long)
+                    income_quintile = await get_income_quintile_from_zone(zone_id, census_geoid)
+                    pop_density = await get_population_density_category(zone_id, census_geoid)
+                    svi = await get_social_vulnerability_index(census_geoid)
+                    housing_tenure = await get_housing_tenure_mix(census_geoid)
+                    
+                    # ENVIRONMENTAL CONTEXT PACK - Real weather data
+                    weather = await asyncio.to_thread(get_weather_context, req.requested_datetime, req.lat, req.long)
+                    asset_age = get_asset_age_years(req.matched_asset)
+                    asset_attributes = get_matched_asset_attributes(req.matched_asset)
+                    
+                    # SENTIMENT & TRUST PACK
+                    sentiment = analyze_sentiment(req.description)
+                    trust = detect_trust_indicators(req.description)
+                    
+                    # BUREAUCRATIC FRICTION PACK
+                    time_to_triage = calculate_time_to_triage(req.requested_datetime, req.audit_logs)
+                    reassignments = count_reassignments(req.audit_logs)
+                    off_hours = is_off_hours_submission(req.requested_datetime)
+                    escalation = calculate_escalation_occurred(req.audit_logs)
+                    
+                    feature = {
+                        "type": "Feature",
+                        "geometry": {
+                            "type": "Point",
+                            "coordinates": [long, lat]
+                        },
+                        "properties": {
+                            # Identifiers
+                            "request_id": req.service_request_id,
+                            "zone_id": zone_id,
+                            
+                            # Category & Infrastructure
+                            "service_code": req.service_code,
+                            "service_name": req.service_name,
+                            "infrastructure_category": infra_category,
+                            "matched_asset_type": asset_type,
+                            "matched_asset_attributes": asset_attributes,  # Full JSON of asset properties
+                            
+                            # Issue Details
+                            "description_word_count": desc_word_count,
+                            "has_photos": has_photos,
+                            
+                            # AI Analysis (for ML/NLP research)
+                            "ai_flagged": req.flagged,
+                            "ai_flag_reason": req.flag_reason,
+                            "ai_priority_score": ai_priority,  # Now from ai_analysis.priority_score
+                            "ai_classification": req.vertex_ai_classification,
+                            "ai_summary_sanitized": ai_summary,
+                            "ai_analyzed": bool(req.vertex_ai_analyzed_at),
+                            "ai_vs_manual_priority_diff": ai_priority_diff,
+                            
+                            # Status & Resolution
+                            "status": req.status,
+                            "closed_substatus": req.closed_substatus,
+                            "priority": req.priority,
+                            "resolution_outcome": resolution_outcome,
+                            
+                            # SOCIAL EQUITY PACK
+                            "census_tract_geoid": census_geoid,
+                            "social_vulnerability_index": svi,
+                            "housing_tenure_renter_pct": housing_tenure,
+                            "income_quintile": income_quintile,
+                            "population_density": pop_density,
+                            
+                            # ENVIRONMENTAL CONTEXT PACK
+                            "weather_precip_24h_mm": weather.get('precip_24h_mm'),
+                            "weather_temp_max_c": weather.get('temp_max_c'),
+                            "weather_temp_min_c": weather.get('temp_min_c'),
+                            "weather_code": weather.get('weather_code'),
+                            "nearby_asset_age_years": asset_age,
+                            
+                            # SENTIMENT & TRUST PACK
+                            "sentiment_score": sentiment,
+                            "is_repeat_report": trust.get('is_repeat_report'),
+                            "prior_report_mentioned": trust.get('prior_report_mentioned'),
+                            "frustration_expressed": trust.get('frustration_expressed'),
+                            
+                            # Temporal
+                            "submitted_datetime": req.requested_datetime.isoformat() if req.requested_datetime else None,
+                            "closed_datetime": req.closed_datetime.isoformat() if req.closed_datetime else None,
+                            "submission_hour": time_info.get('hour_of_day'),
+                            "submission_day_of_week": time_info.get('day_of_week'),
+                            "submission_month": time_info.get('month'),
+                            "submission_year": time_info.get('year'),
+                            "is_weekend": time_info.get('is_weekend'),
+                            "is_business_hours": time_info.get('is_business_hours'),
+                            "season": season,
+                            
+                            # BUREAUCRATIC FRICTION PACK
+                            "time_to_triage_hours": time_to_triage,
+                            "reassignment_count": reassignments,
+                            "off_hours_submission": off_hours,
+                            "escalation_occurred": escalation,
+                            "total_hours_to_resolve": resolution_hours,
+                            "business_hours_to_resolve": business_hours,
+                            
+                            # Civic Engagement
+                            "submission_channel": req.source,
+                            "department_id": req.assigned_department_id,
+                            "comment_count": total_comments,
+                            "public_comment_count": public_comments,
+                        }
+                    }
+                    yield (b"," if feature_count else b"") + orjson.dumps(feature)
+                    feature_count += 1
+        
+        metadata = {
             "exported_at": datetime.now().isoformat(),
             "privacy_mode": privacy_mode,
-            "record_count": len(features),
+            "record_count": feature_count,
             "coordinate_precision": "fuzzed_100ft" if privacy_mode == "fuzzed" else "exact",
             "research_packs": {
                 "social_equity": ["social_vulnerability_index", "housing_tenure_renter_pct", "income_quintile", "population_density"],
@@ -1457,15 +1632,11 @@ async def export_geojson(
                 "ai_ml_research": ["ai_flagged", "ai_priority_score", "ai_classification", "ai_summary_sanitized", "ai_vs_manual_priority_diff"]
             }
         }
-    }
+        yield b'],"metadata":' + orjson.dumps(metadata) + b'}'
     
     filename = f"research_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.geojson"
     
-    return StreamingResponse(
-        iter([json.dumps(geojson, indent=2)]),
-        media_type="application/geo+json",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return export_response(request, generate_geojson(), "application/geo+json", filename)
 
 
 @router.get("/data-dictionary")
@@ -1990,9 +2161,14 @@ async def get_code_snippets(
     if not await check_research_enabled(db):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Research Suite is not enabled")
     
-    result = await db.execute(select(SystemSettings).limit(1))
-    system_settings = result.scalar_one_or_none()
-    base_url = f"https://{system_settings.custom_domain}" if system_settings and system_settings.custom_domain else "https://your-311-domain.com"
+    _, custom_domain = await get_research_settings(db)
+    return _build_code_snippets(custom_domain)
+
+
+@lru_cache(maxsize=8)
+def _build_code_snippets(custom_domain: Optional[str]) -> dict:
+    """Render the R and Python snippets for a domain. Only changes with custom_domain."""
+    base_url = f"https://{custom_domain}" if custom_domain else "https://your-311-domain.com"
     
     python_snippet = f'''# Python - Research Data Analysis
 import requests
@@ -2108,22 +2284,20 @@ async def get_access_logs(
             detail="Admin access required to view access logs"
         )
     
-    query = select(ResearchAccessLog).order_by(ResearchAccessLog.created_at.desc()).limit(limit)
-    result = await db.execute(query)
-    logs = result.scalars().all()
+    # Plain column rows; ORJSONResponse serializes created_at natively
+    result = await db.execute(
+        select(
+            ResearchAccessLog.id,
+            ResearchAccessLog.username,
+            ResearchAccessLog.action,
+            ResearchAccessLog.parameters,
+            ResearchAccessLog.record_count,
+            ResearchAccessLog.privacy_mode,
+            ResearchAccessLog.created_at
+        ).order_by(ResearchAccessLog.created_at.desc()).limit(limit)
+    )
     
-    return [
-        {
-            "id": log.id,
-            "username": log.username,
-            "action": log.action,
-            "parameters": log.parameters,
-            "record_count": log.record_count,
-            "privacy_mode": log.privacy_mode,
-            "created_at": log.created_at.isoformat() if log.created_at else None
-        }
-        for log in logs
-    ]
+    return ORJSONResponse([dict(row._mapping) for row in result])
 
 
 # ============================================================================
@@ -2149,6 +2323,7 @@ class ResearchChatResponse(BaseModel):
 @router.post("/chat", response_model=ResearchChatResponse)
 async def research_chat(
     body: ResearchChatRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_researcher)
 ):
@@ -2399,8 +2574,8 @@ async def research_chat(
             ai_response = "I wasn't able to generate a response. Please try rephrasing your question."
 
         # Log the research chat access
-        await log_research_access(
-            db, current_user.id, current_user.username,
+        background_tasks.add_task(
+            log_research_access, current_user.id, current_user.username,
             "ai_chat", {"message_preview": body.message[:100]},
             0, "n/a"
         )
@@ -1,16 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func as sa_func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, delete, insert, literal, func as sa_func
+from sqlalchemy.orm import selectinload, load_only
 from typing import List
 
 from app.db.session import get_db
-from app.models import ServiceDefinition, Department, User
+from app.models import ServiceDefinition, Department, User, service_departments
 from app.schemas import ServiceCreate, ServiceResponse, ServiceUpdate, ServiceReorderRequest
 from app.core.auth import get_current_admin
 
 router = APIRouter()
 
+# Service fields translated for non-English list responses; everything else is copied as-is
+TRANSLATABLE_FIELDS = ("service_name", "description")
+
+# Columns the list endpoints serialize (ServiceResponse / DepartmentResponse).
+# Leaves out the per-row translations JSON and created_at.
+_SERVICE_LIST_OPTIONS = (
+    load_only(
+        ServiceDefinition.service_code, ServiceDefinition.service_name, ServiceDefinition.description,
+        ServiceDefinition.icon, ServiceDefinition.is_active, ServiceDefinition.display_order,
+        ServiceDefinition.routing_mode, ServiceDefinition.routing_config,
+        ServiceDefinition.assigned_department_id
+    ),
+    selectinload(ServiceDefinition.departments).load_only(
+        Department.name, Department.description, Department.routing_email, Department.is_active
+    ),
+)
+
 
 @router.get("/", response_model=List[ServiceResponse])
 async def list_services(
@@ -21,7 +38,7 @@ async def list_services(
     result = await db.execute(
         select(ServiceDefinition)
         .where(ServiceDefinition.is_active == True)
-        .options(selectinload(ServiceDefinition.departments))
+        .options(*_SERVICE_LIST_OPTIONS)
         .order_by(ServiceDefinition.display_order, ServiceDefinition.service_name)
     )
     services = result.scalars().all()
@@ -32,7 +49,7 @@ async def list_services(
     
     # If not English, translate the response (not the database objects)
     if target_lang != 'en':
-        from app.services.translation import translate_service_response
+        from app.services.translation import translate_batch
         translated_services = []
         for service in services:
             service_dict = {
@@ -48,8 +65,18 @@ async def list_services(
                 "departments": [{"id": d.id, "name": d.name, "description": d.description, "is_active": d.is_active, "routing_email": d.routing_email} for d in service.departments],
                 "assigned_department": {"id": service.assigned_department.id, "name": service.assigned_department.name, "description": service.assigned_department.description, "is_active": service.assigned_department.is_active, "routing_email": service.assigned_department.routing_email} if service.assigned_department else None
             }
-            translated = await translate_service_response(service_dict, target_lang)
-            translated_services.append(translated)
+            translated_services.append(service_dict)
+        
+        # Translate every name and description in one batch call instead of per field
+        texts = [
+            svc[field] for svc in translated_services
+            for field in TRANSLATABLE_FIELDS if svc[field]
+        ]
+        translations = await translate_batch(texts, 'en', target_lang)
+        for service_dict in translated_services:
+            for field in TRANSLATABLE_FIELDS:
+                if service_dict[field]:
+                    service_dict[field] = translations.get(service_dict[field]) or service_dict[field]
         return translated_services
     
     return services
@@ -63,7 +90,7 @@ async def list_all_services(
     """List all service categories including inactive (admin only)"""
     result = await db.execute(
         select(ServiceDefinition)
-        .options(selectinload(ServiceDefinition.departments))
+        .options(*_SERVICE_LIST_OPTIONS)
         .order_by(ServiceDefinition.display_order, ServiceDefinition.service_name)
     )
     return result.scalars().all()
@@ -161,41 +188,36 @@ async def update_service(
     _: User = Depends(get_current_admin)
 ):
     """Update service category with routing configuration (admin only)"""
-    result = await db.execute(
-        select(ServiceDefinition)
-        .where(ServiceDefinition.id == service_id)
-        .options(selectinload(ServiceDefinition.departments))
-        .options(selectinload(ServiceDefinition.assigned_department))
-    )
-    service = result.scalar_one_or_none()
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
+    # Only fields that were provided (non-None) are written, as before
+    values = service_data.model_dump(exclude_none=True, exclude={"department_ids"})
     
-    if service_data.service_name is not None:
-        service.service_name = service_data.service_name
-    if service_data.description is not None:
-        service.description = service_data.description
-    if service_data.icon is not None:
-        service.icon = service_data.icon
-    if service_data.is_active is not None:
-        service.is_active = service_data.is_active
-    if service_data.routing_mode is not None:
-        service.routing_mode = service_data.routing_mode
-    if service_data.routing_config is not None:
-        service.routing_config = service_data.routing_config
-    if service_data.assigned_department_id is not None:
-        service.assigned_department_id = service_data.assigned_department_id
-    if service_data.display_order is not None:
-        service.display_order = service_data.display_order
+    if values:
+        result = await db.execute(
+            update(ServiceDefinition)
+            .where(ServiceDefinition.id == service_id)
+            .values(**values)
+            .returning(ServiceDefinition.id)
+        )
+    else:
+        result = await db.execute(
+            select(ServiceDefinition.id).where(ServiceDefinition.id == service_id)
+        )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Service not found")
     
     if service_data.department_ids is not None:
-        departments = []
-        for dept_id in service_data.department_ids:
-            result = await db.execute(select(Department).where(Department.id == dept_id))
-            dept = result.scalar_one_or_none()
-            if dept:
-                departments.append(dept)
-        service.departments = departments
+        # Replace the department links in place; unknown department ids are skipped
+        await db.execute(
+            delete(service_departments).where(service_departments.c.service_id == service_id)
+        )
+        if service_data.department_ids:
+            await db.execute(
+                insert(service_departments).from_select(
+                    ["service_id", "department_id"],
+                    select(literal(service_id), Department.id)
+                    .where(Department.id.in_(service_data.department_ids))
+                )
+            )
     
     await db.commit()
     
@@ -215,14 +237,19 @@ async def delete_service(
     _: User = Depends(get_current_admin)
 ):
     """Delete service category (admin only)"""
+    # Association rows go first; the ORM cascade used to handle this
+    await db.execute(
+        delete(service_departments).where(service_departments.c.service_id == service_id)
+    )
     result = await db.execute(
-        select(ServiceDefinition).where(ServiceDefinition.id == service_id)
+        delete(ServiceDefinition)
+        .where(ServiceDefinition.id == service_id)
+        .returning(ServiceDefinition.id)
     )
-    service = result.scalar_one_or_none()
-    if not service:
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Service not found")
     
-    await db.delete(service)
     await db.commit()
 
 
@@ -7,22 +7,58 @@ Security: All endpoints require admin authentication and log actions to audit tr
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any
+import asyncio
 import logging
-import httpx
 import json
 
 from app.db.session import get_db
-from app.core.auth import get_current_user
-from app.models import User, SystemSecret
+from app.core.auth import get_current_admin
+from app.models import User, SystemSecret, SystemSettings, ServiceRequest
 from app.services.audit_service import AuditService
-from app.core.encryption import encrypt
+from app.services.auth0_service import Auth0Service
+from app.core.encryption import (
+    encrypt, decrypt_safe, decrypt_pii, encrypt_pii,
+    KMS_ENCRYPTED_PREFIX, ENCRYPTED_PREFIX, _is_kms_available
+)
+from app.api.health import clear_config_status_cache
+from app.core.http_client import get_http_client
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+async def upsert_secrets(db: AsyncSession, values: Dict[str, str], describe: Callable[[str], str]) -> None:
+    """
+    Encrypt and store several SystemSecret values in one INSERT ... ON CONFLICT.
+    
+    describe(key_name) gives the description for newly created rows; existing
+    rows keep theirs. Caller commits.
+    """
+    # encrypt() is local Fernet with a cached key (microseconds per value), so
+    # it runs inline; fanning out to threads would cost more than it saves
+    rows = [
+        {
+            "key_name": key,
+            "key_value": encrypt(value),
+            "is_configured": True,
+            "description": describe(key)
+        }
+        for key, value in values.items()
+    ]
+    stmt = pg_insert(SystemSecret).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SystemSecret.key_name],
+        set_={"key_value": stmt.excluded.key_value, "is_configured": True}
+    )
+    await db.execute(stmt)
+    
+    # Core statements skip the ORM events that normally invalidate this
+    clear_config_status_cache()
+
+
 # Request/Response Models
 class Auth0SetupRequest(BaseModel):
     """Request body for Auth0 automated setup"""
@@ -48,7 +84,7 @@ class SetupStatusResponse(BaseModel):
 
 @router.get("/status")
 async def get_setup_status(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -58,9 +94,6 @@ async def get_setup_status(
     GCP is checked first since it's a dependency for Auth0 credential storage.
     Requires admin authentication.
     """
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     
     # Check GCP status (check if we have project_id secret configured)
     gcp_result = await db.execute(
@@ -84,7 +117,6 @@ async def get_setup_status(
     # Get details if configured
     auth0_details = None
     if auth0_configured:
-        from app.core.encryption import decrypt_safe
         domain = decrypt_safe(auth0_secrets.get("AUTH0_DOMAIN", {}).key_value) if auth0_secrets.get("AUTH0_DOMAIN") else None
         client_id = auth0_secrets.get("AUTH0_CLIENT_ID", {}).key_value if auth0_secrets.get("AUTH0_CLIENT_ID") else None
         auth0_details = {
@@ -94,7 +126,6 @@ async def get_setup_status(
     
     gcp_details = None
     if gcp_configured:
-        from app.core.encryption import decrypt_safe
         project_id = decrypt_safe(gcp_secret.key_value) if gcp_secret else None
         gcp_details = {"project_id": project_id}
     
@@ -109,7 +140,7 @@ async def get_setup_status(
 @router.post("/gcp/configure")
 async def configure_gcp(
     request: GCPSetupRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -122,9 +153,6 @@ async def configure_gcp(
     
     Requires admin authentication and logs all actions.
     """
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     try:
         # Validate the service account JSON
         try:
@@ -146,28 +174,14 @@ async def configure_gcp(
         
         
         # Store credentials in database
-        for key, value in [
-            ("GOOGLE_CLOUD_PROJECT", request.project_id),
-            ("GCP_SERVICE_ACCOUNT_JSON", request.service_account_json)
-        ]:
-            result = await db.execute(
-                select(SystemSecret).where(SystemSecret.key_name == key)
-            )
-            secret = result.scalar_one_or_none()
-            
-            encrypted_value = encrypt(value)
-            
-            if secret:
-                secret.key_value = encrypted_value
-                secret.is_configured = True
-            else:
-                secret = SystemSecret(
-                    key_name=key,
-                    key_value=encrypted_value,
-                    is_configured=True,
-                    description=f"GCP {key.replace('_', ' ').lower()}"
-                )
-                db.add(secret)
+        await upsert_secrets(
+            db,
+            {
+                "GOOGLE_CLOUD_PROJECT": request.project_id,
+                "GCP_SERVICE_ACCOUNT_JSON": request.service_account_json
+            },
+            lambda key: f"GCP {key.replace('_', ' ').lower()}"
+        )
         
         await db.commit()
         
@@ -225,28 +239,15 @@ async def configure_gcp(
             kms_created = True
             
             # Store KMS configuration
-            for key, value in [
-                ("KMS_KEY_RING", kms_keyring),
-                ("KMS_KEY_ID", kms_key),
-                ("KMS_LOCATION", kms_location)
-            ]:
-                result = await db.execute(
-                    select(SystemSecret).where(SystemSecret.key_name == key)
-                )
-                secret = result.scalar_one_or_none()
-                encrypted_value = encrypt(value)
-                
-                if secret:
-                    secret.key_value = encrypted_value
-                    secret.is_configured = True
-                else:
-                    secret = SystemSecret(
-                        key_name=key,
-                        key_value=encrypted_value,
-                        is_configured=True,
-                        description=f"KMS {key.replace('_', ' ').lower()}"
-                    )
-                    db.add(secret)
+            await upsert_secrets(
+                db,
+                {
+                    "KMS_KEY_RING": kms_keyring,
+                    "KMS_KEY_ID": kms_key,
+                    "KMS_LOCATION": kms_location
+                },
+                lambda key: f"KMS {key.replace('_', ' ').lower()}"
+            )
             
             await db.commit()
             
@@ -258,8 +259,7 @@ async def configure_gcp(
             logger.warning(f"KMS auto-setup failed (will use Fernet fallback): {e}")
         
         # Log successful setup
-        await AuditService.log_event(
-            db=db,
+        AuditService.enqueue_event(
             event_type="gcp_configured",
             success=True,
             user_id=current_user.id,
@@ -288,8 +288,7 @@ async def configure_gcp(
         raise
     except Exception as e:
         logger.error(f"GCP setup failed: {str(e)}")
-        await AuditService.log_event(
-            db=db,
+        AuditService.enqueue_event(
             event_type="gcp_configuration_failed",
             success=False,
             user_id=current_user.id,
@@ -306,7 +305,7 @@ async def configure_gcp(
 @router.post("/auth0/configure")
 async def configure_auth0(
     request: Auth0SetupRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -320,245 +319,205 @@ async def configure_auth0(
     
     Requires admin authentication and logs all actions.
     """
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     try:
-        # Get Management API access token
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                f"https://{request.domain}/oauth/token",
-                json={
-                    "client_id": request.management_client_id,
-                    "client_secret": request.management_client_secret,
-                    "audience": f"https://{request.domain}/api/v2/",
-                    "grant_type": "client_credentials"
-                }
-            )
-            
-            if token_response.status_code != 200:
-                logger.error(f"Auth0 Management API token failed: {token_response.text}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to get Management API token"
-                )
-            
-            access_token = token_response.json()["access_token"]
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
+        # Shared pooled client, so keep-alive connections to the tenant are reused
+        client = get_http_client()
+        
+        # Get Management API access token (reused across setup runs until it expires)
+        access_token = await Auth0Service.get_management_token(
+            request.domain, request.management_client_id, request.management_client_secret
+        )
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+        
+        # Create application
+        base_url = request.callback_url.rsplit('/', 1)[0] if '/' in request.callback_url else request.callback_url
+        app_response = await client.post(
+            f"https://{request.domain}/api/v2/clients",
+            headers=headers,
+            json={
+                "name": "Pinpoint 311 Portal",
+                "app_type": "regular_web",
+                "callbacks": [
+                    request.callback_url,
+                    f"{base_url}/api/auth/callback"
+                ],
+                "allowed_logout_urls": [base_url],
+                "web_origins": [base_url],
+                "oidc_conformant": True,
+                "grant_types": ["authorization_code", "refresh_token"],
+                "token_endpoint_auth_method": "client_secret_post"
             }
-            
-            # Create application
-            base_url = request.callback_url.rsplit('/', 1)[0] if '/' in request.callback_url else request.callback_url
-            app_response = await client.post(
-                f"https://{request.domain}/api/v2/clients",
+        )
+        
+        if app_response.status_code != 201:
+            logger.error(f"Auth0 application creation failed: {app_response.text}")
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to create Auth0 application"
+            )
+        
+        app_data = app_response.json()
+        client_id = app_data["client_id"]
+        client_secret = app_data["client_secret"]
+        
+        # Township branding for the Auth0 hosted login page
+        settings_result = await db.execute(select(SystemSettings).limit(1))
+        settings = settings_result.scalar_one_or_none()
+        
+        primary_color = settings.primary_color if settings else "#6366f1"
+        logo_url = settings.logo_url if settings else None
+        township_name = settings.township_name if settings else "Pinpoint 311"
+        
+        branding_payload = {
+            "colors": {
+                "primary": primary_color,
+                "page_background": "#0f172a"  # Dark slate background matching our UI
+            },
+            "favicon_url": logo_url if logo_url else None
+        }
+        
+        # Remove None values
+        branding_payload = {k: v for k, v in branding_payload.items() if v is not None}
+        if "colors" in branding_payload:
+            branding_payload["colors"] = {k: v for k, v in branding_payload["colors"].items() if v is not None}
+        
+        # MFA (push notifications), brute force protection, branding and Universal
+        # Login prompts are independent tenant settings, so send them concurrently
+        # over the shared client's pooled connections.
+        (
+            mfa_result, brute_force_result, branding_result, prompts_result, custom_text_result
+        ) = await asyncio.gather(
+            client.patch(
+                f"https://{request.domain}/api/v2/guardian/factors/push-notification",
+                headers=headers,
+                json={"enabled": True}
+            ),
+            client.patch(
+                f"https://{request.domain}/api/v2/attack-protection/brute-force-protection",
                 headers=headers,
                 json={
-                    "name": "Pinpoint 311 Portal",
-                    "app_type": "regular_web",
-                    "callbacks": [
-                        request.callback_url,
-                        f"{base_url}/api/auth/callback"
-                    ],
-                    "allowed_logout_urls": [base_url],
-                    "web_origins": [base_url],
-                    "oidc_conformant": True,
-                    "grant_types": ["authorization_code", "refresh_token"],
-                    "token_endpoint_auth_method": "client_secret_post"
+                    "enabled": True,
+                    "shields": ["block", "user_notification"],
+                    "mode": "count_per_identifier_and_ip",
+                    "allowlist": [],
+                    "max_attempts": 5
                 }
-            )
-            
-            if app_response.status_code != 201:
-                logger.error(f"Auth0 application creation failed: {app_response.text}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to create Auth0 application"
-                )
-            
-            app_data = app_response.json()
-            client_id = app_data["client_id"]
-            client_secret = app_data["client_secret"]
-            
-            # Configure MFA (enable push notifications)
-            try:
-                await client.patch(
-                    f"https://{request.domain}/api/v2/guardian/factors/push-notification",
-                    headers=headers,
-                    json={"enabled": True}
-                )
-            except Exception as e:
-                logger.warning(f"Failed to enable MFA: {e}")
-            
-            # Configure brute force protection
-            try:
-                await client.patch(
-                    f"https://{request.domain}/api/v2/attack-protection/brute-force-protection",
-                    headers=headers,
-                    json={
-                        "enabled": True,
-                        "shields": ["block", "user_notification"],
-                        "mode": "count_per_identifier_and_ip",
-                        "allowlist": [],
-                        "max_attempts": 5
+            ),
+            client.patch(
+                f"https://{request.domain}/api/v2/branding",
+                headers=headers,
+                json=branding_payload
+            ),
+            # New Universal Login
+            client.put(
+                f"https://{request.domain}/api/v2/prompts",
+                headers=headers,
+                json={"identifier_first": True}
+            ),
+            # Custom login page text (may require a specific plan, so failures are ignored)
+            client.patch(
+                f"https://{request.domain}/api/v2/prompts/login/custom-text/en",
+                headers=headers,
+                json={
+                    "login": {
+                        "title": f"{township_name} Staff Portal",
+                        "description": "Sign in to access the staff dashboard"
                     }
-                )
-            except Exception as e:
-                logger.warning(f"Failed to configure brute force protection: {e}")
-            
-            # Configure branding to match township branding
-            try:
-                # Get current system settings for branding
-                from app.models import SystemSettings
-                settings_result = await db.execute(select(SystemSettings).limit(1))
-                settings = settings_result.scalar_one_or_none()
-                
-                primary_color = settings.primary_color if settings else "#6366f1"
-                logo_url = settings.logo_url if settings else None
-                township_name = settings.township_name if settings else "Pinpoint 311"
-                
-                # Configure Auth0 branding
-                branding_payload = {
-                    "colors": {
-                        "primary": primary_color,
-                        "page_background": "#0f172a"  # Dark slate background matching our UI
-                    },
-                    "favicon_url": logo_url if logo_url else None
                 }
-                
-                # Remove None values
-                branding_payload = {k: v for k, v in branding_payload.items() if v is not None}
-                if "colors" in branding_payload:
-                    branding_payload["colors"] = {k: v for k, v in branding_payload["colors"].items() if v is not None}
-                
-                await client.patch(
-                    f"https://{request.domain}/api/v2/branding",
+            ),
+            return_exceptions=True
+        )
+        if isinstance(mfa_result, Exception):
+            logger.warning(f"Failed to enable MFA: {mfa_result}")
+        if isinstance(brute_force_result, Exception):
+            logger.warning(f"Failed to configure brute force protection: {brute_force_result}")
+        branding_error = next(
+            (r for r in (branding_result, prompts_result) if isinstance(r, Exception)), None
+        )
+        if branding_error:
+            logger.warning(f"Failed to configure Auth0 branding: {branding_error}")
+        else:
+            logger.info(f"Auth0 branding configured with primary color {primary_color}")
+        
+        # Enable social connections (Google and Microsoft)
+        social_connections_enabled = []
+        social_connections_errors = []
+        
+        for conn_name, conn_strategy in [
+            ("google-oauth2", "google-oauth2"),
+            ("windowslive", "windowslive")  # Microsoft
+        ]:
+            try:
+                # Check if connection already exists
+                conn_list_response = await client.get(
+                    f"https://{request.domain}/api/v2/connections",
                     headers=headers,
-                    json=branding_payload
+                    params={"name": conn_name}
                 )
                 
-                # Configure Universal Login branding (New Universal Login)
-                universal_login_payload = {
-                    "identifier_first": True
-                }
-                await client.put(
-                    f"https://{request.domain}/api/v2/prompts",
-                    headers=headers,
-                    json=universal_login_payload
-                )
+                existing_conns = conn_list_response.json() if conn_list_response.status_code == 200 else []
                 
-                # Set up custom login page text if possible
-                try:
-                    await client.patch(
-                        f"https://{request.domain}/api/v2/prompts/login/custom-text/en",
+                if existing_conns:
+                    # Connection exists, enable it for this app
+                    conn_id = existing_conns[0]["id"]
+                    enabled_clients = existing_conns[0].get("enabled_clients", [])
+                    
+                    if client_id not in enabled_clients:
+                        enabled_clients.append(client_id)
+                        await client.patch(
+                            f"https://{request.domain}/api/v2/connections/{conn_id}",
+                            headers=headers,
+                            json={"enabled_clients": enabled_clients}
+                        )
+                    
+                    social_connections_enabled.append(conn_name)
+                    logger.info(f"Enabled existing {conn_name} connection for client {client_id}")
+                else:
+                    # Connection doesn't exist - create with placeholder
+                    # Note: Actual credentials must be configured in Auth0 dashboard
+                    create_response = await client.post(
+                        f"https://{request.domain}/api/v2/connections",
                         headers=headers,
                         json={
-                            "login": {
-                                "title": f"{township_name} Staff Portal",
-                                "description": "Sign in to access the staff dashboard"
-                            }
+                            "name": conn_name,
+                            "strategy": conn_strategy,
+                            "enabled_clients": [client_id],
+                            "options": {}  # Placeholder - user needs to add OAuth credentials in Auth0 dashboard
                         }
                     )
-                except Exception:
-                    pass  # Custom text may require specific plan
-                
-                # Branding configured successfully
-                logger.info(f"Auth0 branding configured with primary color {primary_color}")
-                
-            except Exception as e:
-                logger.warning(f"Failed to configure Auth0 branding: {e}")
-            
-            # Enable social connections (Google and Microsoft)
-            social_connections_enabled = []
-            social_connections_errors = []
-            
-            for conn_name, conn_strategy in [
-                ("google-oauth2", "google-oauth2"),
-                ("windowslive", "windowslive")  # Microsoft
-            ]:
-                try:
-                    # Check if connection already exists
-                    conn_list_response = await client.get(
-                        f"https://{request.domain}/api/v2/connections",
-                        headers=headers,
-                        params={"name": conn_name}
-                    )
-                    
-                    existing_conns = conn_list_response.json() if conn_list_response.status_code == 200 else []
                     
-                    if existing_conns:
-                        # Connection exists, enable it for this app
-                        conn_id = existing_conns[0]["id"]
-                        enabled_clients = existing_conns[0].get("enabled_clients", [])
-                        
-                        if client_id not in enabled_clients:
-                            enabled_clients.append(client_id)
-                            await client.patch(
-                                f"https://{request.domain}/api/v2/connections/{conn_id}",
-                                headers=headers,
-                                json={"enabled_clients": enabled_clients}
-                            )
-                        
+                    if create_response.status_code in [200, 201]:
                         social_connections_enabled.append(conn_name)
-                        logger.info(f"Enabled existing {conn_name} connection for client {client_id}")
+                        logger.info(f"Created and enabled {conn_name} social connection")
                     else:
-                        # Connection doesn't exist - create with placeholder
-                        # Note: Actual credentials must be configured in Auth0 dashboard
-                        create_response = await client.post(
-                            f"https://{request.domain}/api/v2/connections",
-                            headers=headers,
-                            json={
-                                "name": conn_name,
-                                "strategy": conn_strategy,
-                                "enabled_clients": [client_id],
-                                "options": {}  # Placeholder - user needs to add OAuth credentials in Auth0 dashboard
-                            }
-                        )
+                        # Some strategies require developer keys configured first
+                        error_detail = create_response.text[:100]
+                        social_connections_errors.append(f"{conn_name}: {error_detail}")
+                        logger.warning(f"Could not create {conn_name} connection: {error_detail}")
                         
-                        if create_response.status_code in [200, 201]:
-                            social_connections_enabled.append(conn_name)
-                            logger.info(f"Created and enabled {conn_name} social connection")
-                        else:
-                            # Some strategies require developer keys configured first
-                            error_detail = create_response.text[:100]
-                            social_connections_errors.append(f"{conn_name}: {error_detail}")
-                            logger.warning(f"Could not create {conn_name} connection: {error_detail}")
-                            
-                except Exception as conn_err:
-                    social_connections_errors.append(f"{conn_name}: {str(conn_err)[:50]}")
-                    logger.warning(f"Failed to enable {conn_name} social connection: {conn_err}")
-            
+            except Exception as conn_err:
+                social_connections_errors.append(f"{conn_name}: {str(conn_err)[:50]}")
+                logger.warning(f"Failed to enable {conn_name} social connection: {conn_err}")
+        
         # Store credentials in database
         
-        for key, value in [
-            ("AUTH0_DOMAIN", request.domain),
-            ("AUTH0_CLIENT_ID", client_id),
-            ("AUTH0_CLIENT_SECRET", client_secret)
-        ]:
-            result = await db.execute(
-                select(SystemSecret).where(SystemSecret.key_name == key)
-            )
-            secret = result.scalar_one_or_none()
-            
-            encrypted_value = encrypt(value)
-            
-            if secret:
-                secret.key_value = encrypted_value
-                secret.is_configured = True
-            else:
-                secret = SystemSecret(
-                    key_name=key,
-                    key_value=encrypted_value,
-                    is_configured=True,
-                    description=f"Auth0 {key.split('_')[1].lower()}"
-                )
-                db.add(secret)
+        await upsert_secrets(
+            db,
+            {
+                "AUTH0_DOMAIN": request.domain,
+                "AUTH0_CLIENT_ID": client_id,
+                "AUTH0_CLIENT_SECRET": client_secret
+            },
+            lambda key: f"Auth0 {key.split('_')[1].lower()}"
+        )
         
         await db.commit()
         
         # Log successful setup
-        await AuditService.log_event(
-            db=db,
+        AuditService.enqueue_event(
             event_type="auth0_configured",
             success=True,
             user_id=current_user.id,
@@ -588,8 +547,7 @@ async def configure_auth0(
         raise
     except Exception as e:
         logger.error(f"Auth0 setup failed: {str(e)}")
-        await AuditService.log_event(
-            db=db,
+        AuditService.enqueue_event(
             event_type="auth0_configuration_failed",
             success=False,
             user_id=current_user.id,
@@ -605,7 +563,7 @@ async def configure_auth0(
 
 @router.post("/verify")
 async def verify_setup(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -613,11 +571,6 @@ async def verify_setup(
     
     Tests that credentials work and services are reachable.
     """
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    from app.core.encryption import decrypt_safe
-    
     results = {
         "gcp": {"configured": False, "reachable": False, "error": None},
         "auth0": {"configured": False, "reachable": False, "error": None}
@@ -667,11 +620,10 @@ async def verify_setup(
             results["auth0"]["domain"] = domain
             
             # Test OIDC discovery endpoint
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    f"https://{domain}/.well-known/openid-configuration"
-                )
-                results["auth0"]["reachable"] = response.status_code == 200
+            response = await get_http_client().get(
+                f"https://{domain}/.well-known/openid-configuration"
+            )
+            results["auth0"]["reachable"] = response.status_code == 200
     except Exception as e:
         results["auth0"]["error"] = str(e)
     
@@ -680,7 +632,7 @@ async def verify_setup(
 
 @router.post("/reencrypt-pii")
 async def reencrypt_pii(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -694,12 +646,6 @@ async def reencrypt_pii(
 
     Admin only. Processes in batches of 100.
     """
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
-    from app.core.encryption import decrypt_pii, encrypt_pii, KMS_ENCRYPTED_PREFIX, ENCRYPTED_PREFIX, _is_kms_available
-    from app.models import ServiceRequest
-
     if not _is_kms_available():
         raise HTTPException(
             status_code=400,
@@ -768,8 +714,7 @@ async def reencrypt_pii(
         await db.commit()
 
     # Audit log
-    await AuditService.log_event(
-        db=db,
+    AuditService.enqueue_event(
         event_type="pii_reencryption",
         success=True,
         user_id=current_user.id,
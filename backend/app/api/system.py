@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Query
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, bindparam
 from typing import List
+from pydantic import TypeAdapter
 import subprocess
 import os
+import re
 import uuid
 import logging
 import aiofiles
@@ -11,31 +14,55 @@ import aiofiles
 logger = logging.getLogger(__name__)
 
 from app.db.session import get_db
-from app.models import SystemSettings, SystemSecret, ServiceRequest, User, DisclaimerAcknowledgment, AuditLog
+from app.models import SystemSettings, SystemSecret, ServiceRequest, User, DisclaimerAcknowledgment
 from app.schemas import (
     SystemSettingsBase, SystemSettingsResponse,
     SecretCreate, SecretResponse,
     StatisticsResponse
 )
 from app.core.auth import get_current_admin, get_current_staff
+from app.services.audit_service import AuditService
+from app.services import branding_cache
 
 router = APIRouter()
 
+# Statements reused by the settings/secrets routes, built once at import
+_SETTINGS_STMT = select(SystemSettings).limit(1)
+_SECRET_BY_KEY = select(SystemSecret).where(SystemSecret.key_name == bindparam("key_name"))
+
+_settings_adapter = TypeAdapter(SystemSettingsResponse)
+
 
 # ============ Settings ============
 
 @router.get("/settings", response_model=SystemSettingsResponse)
 async def get_settings(db: AsyncSession = Depends(get_db)):
     """Get system settings (public - for branding)"""
-    result = await db.execute(select(SystemSettings).limit(1))
-    settings = result.scalar_one_or_none()
-    if not settings:
-        # Create default settings if none exist
-        settings = SystemSettings()
-        db.add(settings)
-        await db.commit()
-        await db.refresh(settings)
-    return settings
+    
+    cached = branding_cache.get("branding")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    async with branding_cache.lock:
+        # Another request may have filled the cache while we waited
+        cached = branding_cache.get("branding")
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
+        result = await db.execute(_SETTINGS_STMT)
+        settings = result.scalar_one_or_none()
+        if not settings:
+            # Create default settings if none exist
+            settings = SystemSettings()
+            db.add(settings)
+            await db.commit()
+        
+        # Cache the serialized bytes so hits skip validation and JSON encoding
+        payload = _settings_adapter.dump_json(
+            _settings_adapter.validate_python(settings, from_attributes=True)
+        )
+        branding_cache.put("branding", payload)
+        return Response(content=payload, media_type="application/json")
 
 
 @router.post("/settings", response_model=SystemSettingsResponse)
@@ -45,7 +72,7 @@ async def update_settings(
     _: User = Depends(get_current_admin)
 ):
     """Update system settings (admin only)"""
-    result = await db.execute(select(SystemSettings).limit(1))
+    result = await db.execute(_SETTINGS_STMT)
     settings = result.scalar_one_or_none()
     
     if not settings:
@@ -55,11 +82,20 @@ async def update_settings(
         # IMPORTANT: Only update fields that were explicitly provided in the request
         # Using exclude_unset=True prevents default values in the schema from 
         # overwriting saved values when the frontend doesn't send all fields
-        for key, value in settings_data.model_dump(exclude_unset=True).items():
+        changes = {
+            key: value
+            for key, value in settings_data.model_dump(exclude_unset=True).items()
+            if getattr(settings, key) != value
+        }
+        # Nothing differs from what's stored: skip the write and keep the cache warm
+        if not changes:
+            return settings
+        for key, value in changes.items():
             setattr(settings, key, value)
     
     await db.commit()
-    await db.refresh(settings)
+    
+    branding_cache.invalidate("branding")
     return settings
 
 
@@ -105,6 +141,9 @@ async def log_disclaimer_acknowledgment(
 
 # ============ Secrets ============
 
+_secret_list_adapter = TypeAdapter(List[SecretResponse])
+
+
 @router.get("/secrets", response_model=List[SecretResponse])
 async def list_secrets(
     db: AsyncSession = Depends(get_db),
@@ -117,13 +156,12 @@ async def list_secrets(
     result = await db.execute(select(SystemSecret))
     secrets = result.scalars().all()
     
-    response = []
-    for secret in secrets:
-        data = SecretResponse.model_validate(secret)
+    # One validator pass over the list instead of model_validate per row
+    response = _secret_list_adapter.validate_python(secrets, from_attributes=True)
+    for data, secret in zip(response, secrets):
         # Only include key_value for non-sensitive config options
         if secret.key_name in SAFE_TO_RETURN and secret.is_configured:
             data.key_value = secret.key_value
-        response.append(data)
     
     return response
 
@@ -153,7 +191,7 @@ async def create_or_update_secret(
     
     # Always store in database as backup (encrypted)
     result = await db.execute(
-        select(SystemSecret).where(SystemSecret.key_name == secret_data.key_name)
+        _SECRET_BY_KEY, {"key_name": secret_data.key_name}
     )
     secret = result.scalar_one_or_none()
     
@@ -173,7 +211,6 @@ async def create_or_update_secret(
         db.add(secret)
     
     await db.commit()
-    await db.refresh(secret)
     
     return {
         **secret.__dict__,
@@ -194,7 +231,7 @@ async def sync_secrets(
     added = []
     for secret_data in DEFAULT_SECRETS:
         result = await db.execute(
-            select(SystemSecret).where(SystemSecret.key_name == secret_data["key_name"])
+            _SECRET_BY_KEY, {"key_name": secret_data["key_name"]}
         )
         existing = result.scalar_one_or_none()
         
@@ -300,7 +337,7 @@ async def get_current_retention_policy(
     """Get current retention policy configuration"""
     from app.services.retention_service import get_retention_policy, get_retention_stats
     
-    result = await db.execute(select(SystemSettings).limit(1))
+    result = await db.execute(_SETTINGS_STMT)
     settings = result.scalar_one_or_none()
     
     state_code = settings.retention_state_code if settings else "NJ"
@@ -331,7 +368,7 @@ async def update_retention_policy(
     """Update retention policy configuration (admin only)"""
     from app.services.retention_service import get_retention_policy
     
-    result = await db.execute(select(SystemSettings).limit(1))
+    result = await db.execute(_SETTINGS_STMT)
     settings = result.scalar_one_or_none()
     
     if not settings:
@@ -356,7 +393,6 @@ async def update_retention_policy(
         settings.retention_mode = mode
     
     await db.commit()
-    await db.refresh(settings)
     
     return {
         "status": "updated",
@@ -438,7 +474,7 @@ async def export_for_public_records(
     from fastapi.responses import StreamingResponse
     
     # Get current state policy
-    result = await db.execute(select(SystemSettings).limit(1))
+    result = await db.execute(_SETTINGS_STMT)
     settings = result.scalar_one_or_none()
     state_code = settings.retention_state_code if settings else "NJ"
     policy = get_retention_policy(state_code)
@@ -580,6 +616,10 @@ except ImportError:
 STATS_CACHE_TTL = 300  # 5 minutes
 
 
+# Status columns shown in the weekly/monthly trend charts
+TREND_STATUSES = ("open", "in_progress", "closed")
+
+
 @router.get("/advanced-statistics", response_model=AdvancedStatisticsResponse)
 async def get_advanced_statistics(
     db: AsyncSession = Depends(get_db),
@@ -1042,16 +1082,17 @@ async def get_advanced_statistics(
         week_label = f"W{8-i}"
         
         week_stats = {"period": week_label, "open": 0, "in_progress": 0, "closed": 0, "total": 0}
-        for status in ["open", "in_progress", "closed"]:
-            count_result = await db.execute(
-                select(func.count(ServiceRequest.id)).where(
-                    ServiceRequest.deleted_at.is_(None),
-                    ServiceRequest.status == status,
-                    ServiceRequest.requested_datetime >= week_start,
-                    ServiceRequest.requested_datetime < week_end
-                )
-            )
-            week_stats[status] = count_result.scalar() or 0
+        # One grouped count per period instead of a query per status
+        count_result = await db.execute(
+            select(ServiceRequest.status, func.count(ServiceRequest.id)).where(
+                ServiceRequest.deleted_at.is_(None),
+                ServiceRequest.status.in_(TREND_STATUSES),
+                ServiceRequest.requested_datetime >= week_start,
+                ServiceRequest.requested_datetime < week_end
+            ).group_by(ServiceRequest.status)
+        )
+        for request_status, count in count_result:
+            week_stats[request_status] = count
         week_stats["total"] = week_stats["open"] + week_stats["in_progress"] + week_stats["closed"]
         weekly_trend.append(TrendData(**week_stats))
     
@@ -1066,16 +1107,17 @@ async def get_advanced_statistics(
         month_label = month_start.strftime("%b")
         
         month_stats = {"period": month_label, "open": 0, "in_progress": 0, "closed": 0, "total": 0}
-        for status in ["open", "in_progress", "closed"]:
-            count_result = await db.execute(
-                select(func.count(ServiceRequest.id)).where(
-                    ServiceRequest.deleted_at.is_(None),
-                    ServiceRequest.status == status,
-                    ServiceRequest.requested_datetime >= month_start,
-                    ServiceRequest.requested_datetime < month_end
-                )
-            )
-            month_stats[status] = count_result.scalar() or 0
+        # One grouped count per period instead of a query per status
+        count_result = await db.execute(
+            select(ServiceRequest.status, func.count(ServiceRequest.id)).where(
+                ServiceRequest.deleted_at.is_(None),
+                ServiceRequest.status.in_(TREND_STATUSES),
+                ServiceRequest.requested_datetime >= month_start,
+                ServiceRequest.requested_datetime < month_end
+            ).group_by(ServiceRequest.status)
+        )
+        for request_status, count in count_result:
+            month_stats[request_status] = count
         month_stats["total"] = month_stats["open"] + month_stats["in_progress"] + month_stats["closed"]
         monthly_trend.append(TrendData(**month_stats))
     
@@ -1254,6 +1296,11 @@ async def get_heatmap_data(
 
 # ============ System Update ============
 
+# Changed files in `git pull` output that mean the container needs a restart
+RESTART_TRIGGER_PATTERN = re.compile(
+    "|".join(map(re.escape, ['requirements.txt', 'dockerfile', 'docker-compose', 'package.json'])),
+    re.IGNORECASE
+)
 
 @router.post("/update")
 async def update_system(_: User = Depends(get_current_admin)):
@@ -1290,9 +1337,7 @@ async def update_system(_: User = Depends(get_current_admin)):
         git_output = pull_result.stdout.strip()
         
         # Determine if restart is needed
-        needs_restart = any(x in git_output.lower() for x in [
-            'requirements.txt', 'dockerfile', 'docker-compose', 'package.json'
-        ])
+        needs_restart = RESTART_TRIGGER_PATTERN.search(git_output) is not None
         
         return {
             "status": "success",
@@ -1954,7 +1999,8 @@ async def switch_version(
         
         # ===== STEP 7: Log to Audit =====
         try:
-            audit_entry = AuditLog(
+            await AuditService.log_event(
+                db=db,
                 user_id=current_user.id,
                 username=current_user.username if hasattr(current_user, 'username') else str(current_user.id),
                 event_type="version_deployed",
@@ -1969,8 +2015,6 @@ async def switch_version(
                     "steps": state["steps_completed"]
                 }
             )
-            db.add(audit_entry)
-            await db.commit()
         except Exception as e:
             logger.warning(f"Failed to log deployment to audit: {e}")
         
@@ -1996,7 +2040,8 @@ async def switch_version(
         
         # Log failed deployment to audit
         try:
-            audit_entry = AuditLog(
+            await AuditService.log_event(
+                db=db,
                 user_id=current_user.id,
                 username=current_user.username if hasattr(current_user, 'username') else str(current_user.id),
                 event_type="version_deployment_failed",
@@ -2010,8 +2055,6 @@ async def switch_version(
                     "steps": state["steps_completed"]
                 }
             )
-            db.add(audit_entry)
-            await db.commit()
         except Exception as audit_error:
             logger.warning(f"Failed to log deployment failure: {audit_error}")
         
@@ -2052,7 +2095,7 @@ async def configure_domain(
         )
     
     # Save domain to settings
-    result = await db.execute(select(SystemSettings).limit(1))
+    result = await db.execute(_SETTINGS_STMT)
     settings = result.scalar_one_or_none()
     if settings:
         settings.custom_domain = domain
@@ -2148,7 +2191,7 @@ async def get_domain_status(
     _: User = Depends(get_current_admin)
 ):
     """Get current domain configuration status"""
-    result = await db.execute(select(SystemSettings).limit(1))
+    result = await db.execute(_SETTINGS_STMT)
     settings = result.scalar_one_or_none()
     
     return {
@@ -2162,6 +2205,31 @@ async def get_domain_status(
 UPLOAD_DIR = os.environ.get("UPLOAD_DIR", "/project/uploads")
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read/written per step when saving uploads
+
+
+async def save_upload_streaming(file: UploadFile, file_path: str, max_size: int) -> int:
+    """
+    Copy an upload to disk in UPLOAD_CHUNK_SIZE pieces without holding it in memory.
+    
+    Returns the number of bytes written. Raises a 400 and removes the partial
+    file if the upload exceeds max_size.
+    """
+    written = 0
+    async with aiofiles.open(file_path, 'wb') as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_size:
+                break
+            await f.write(chunk)
+    
+    if written > max_size:
+        os.remove(file_path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size: {max_size // (1024*1024)}MB"
+        )
+    return written
 
 
 @router.post("/upload/image")
@@ -2178,9 +2246,8 @@ async def upload_image(
             detail=f"File type not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # Read and validate file size
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
+    # Reject early when the client declared an oversized body
+    if file.size is not None and file.size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
@@ -2192,10 +2259,9 @@ async def upload_image(
     # Ensure upload directory exists
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     
-    # Save file
+    # Save file, enforcing the size limit while streaming
     file_path = os.path.join(UPLOAD_DIR, unique_filename)
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(content)
+    await save_upload_streaming(file, file_path, MAX_FILE_SIZE)
     
     # Return URL (relative to API)
     return {
@@ -2726,7 +2792,7 @@ async def analytics_chat(
     now = datetime.utcnow()
     
     # ========== 1. System Settings (Township Identity) ==========
-    settings_result = await db.execute(select(SystemSettings).limit(1))
+    settings_result = await db.execute(_SETTINGS_STMT)
     settings = settings_result.scalar_one_or_none()
     township_name = settings.township_name if settings and hasattr(settings, 'township_name') and settings.township_name else "the municipality"
     context_used.append("system_settings")
@@ -1,27 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import List
-
-from app.db.session import get_db
-from app.models import User
-from app.schemas import UserCreate, UserResponse, UserUpdate
+from sqlalchemy import select, update, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, selectinload
+from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter
+import logging
+
+from app.db.session import get_db, SessionLocal
+from app.models import User, Department
+from app.schemas import UserCreate, UserResponse, UserUpdate, DepartmentBrief, NotificationPreferencesUpdate
 from app.core.auth import get_password_hash, get_current_admin, get_current_staff
+from app.services.response_cache import get_cached, set_cached
+from app.services.staff_directory import (
+    STAFF_CACHE_KEY, STAFF_PUBLIC_CACHE_KEY, STAFF_CACHE_TTL, invalidate_staff_cache
+)
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-
-# Minimal response schema for staff assignment dropdown
-from pydantic import BaseModel
-from typing import Optional
-
+# Minimal response schema for staff assignment dropdown.
+# Response-only models here are frozen: they're built once and never mutated.
 class DepartmentMinimal(BaseModel):
     id: int
     name: str
     
     class Config:
         from_attributes = True
+        frozen = True
 
 class StaffMemberResponse(BaseModel):
     id: int
@@ -32,6 +39,21 @@ class StaffMemberResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        frozen = True
+
+
+def _staff_to_dto(row, departments: list) -> StaffMemberResponse:
+    """Build the response from a trusted column row without re-validating it."""
+    return StaffMemberResponse.model_construct(
+        id=row.id,
+        username=row.username,
+        full_name=row.full_name,
+        role=row.role,
+        departments=departments
+    )
+
+
+_staff_list_adapter = TypeAdapter(List[StaffMemberResponse])
 
 
 @router.get("/staff", response_model=List[StaffMemberResponse])
@@ -40,13 +62,26 @@ async def list_staff_members(
     _: User = Depends(get_current_staff)
 ):
     """List staff and admin users for assignment (accessible by any staff user)"""
+    cached = await get_cached(STAFF_CACHE_KEY)
+    if cached:
+        return cached
+    
+    # Single-table read: departments come from the denormalized summary column
     result = await db.execute(
-        select(User)
-        .options(selectinload(User.departments))
+        select(User.id, User.username, User.full_name, User.role, User.department_summary)
         .where(User.role.in_(['staff', 'admin']), User.is_active == True)
         .order_by(User.full_name, User.username)
     )
-    return result.scalars().all()
+    staff = [
+        _staff_to_dto(row, [
+            DepartmentMinimal.model_construct(id=d["id"], name=d["name"])
+            for d in row.department_summary or []
+        ])
+        for row in result
+    ]
+    payload = _staff_list_adapter.dump_json(staff)
+    await set_cached(STAFF_CACHE_KEY, payload, STAFF_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 class PublicStaffResponse(BaseModel):
@@ -56,31 +91,80 @@ class PublicStaffResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        frozen = True
+
+
+_public_staff_list_adapter = TypeAdapter(List[PublicStaffResponse])
 
 
 @router.get("/staff/public", response_model=List[PublicStaffResponse])
 async def list_staff_public(db: AsyncSession = Depends(get_db)):
     """List staff usernames for public filters (no auth required)"""
+    cached = await get_cached(STAFF_PUBLIC_CACHE_KEY)
+    if cached:
+        return cached
+    
     result = await db.execute(
-        select(User)
+        select(User.username, User.full_name, User.role)
         .where(User.role.in_(['staff', 'admin']), User.is_active == True)
         .order_by(User.full_name, User.username)
     )
-    return result.scalars().all()
+    staff = [
+        PublicStaffResponse.model_construct(username=row.username, full_name=row.full_name, role=row.role)
+        for row in result
+    ]
+    payload = _public_staff_list_adapter.dump_json(staff)
+    await set_cached(STAFF_PUBLIC_CACHE_KEY, payload, STAFF_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
+
+
+def _user_to_dto(user: User) -> UserResponse:
+    """Build the admin user response from a trusted ORM row without re-validating it."""
+    return UserResponse.model_construct(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        role=user.role,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        departments=[DepartmentBrief.model_construct(id=d.id, name=d.name) for d in user.departments],
+        notification_preferences=user.notification_preferences,
+        phone=user.phone
+    )
+
+
+_user_adapter = TypeAdapter(UserResponse)
+USER_STREAM_BATCH_SIZE = 200  # rows fetched per server-side cursor batch
 
 
 @router.get("/", response_model=List[UserResponse])
 async def list_users(
-    db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_admin)
 ):
     """List all users (admin only)"""
-    result = await db.execute(
+    query = (
         select(User)
-        .options(selectinload(User.departments))
+        .options(selectinload(User.departments), raiseload('*'))
         .order_by(User.created_at.desc())
+        .execution_options(yield_per=USER_STREAM_BATCH_SIZE)
     )
-    return result.scalars().all()
+    
+    async def body():
+        # The request's session is closed before the body streams, so use our own
+        async with SessionLocal() as stream_db:
+            result = await stream_db.stream(query)
+            yield b"["
+            first = True
+            async for batch in result.scalars().partitions():
+                for user in batch:
+                    # role is stored as a plain string (including roles outside UserRole), so skip enum warnings
+                    payload = _user_adapter.dump_json(_user_to_dto(user), warnings=False)
+                    yield payload if first else b"," + payload
+                    first = False
+            yield b"]"
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -96,19 +180,18 @@ async def create_user(
     Auth0 SSO using their email address. No password is required as 
     authentication is handled by Auth0.
     """
-    from app.models import Department
-    
-    # Check for existing username
-    result = await db.execute(select(User).where(User.username == user_data.username))
-    if result.scalar_one_or_none():
+    # Check for existing username or email in one round-trip
+    result = await db.execute(
+        select(User.username, User.email)
+        .where(or_(User.username == user_data.username, User.email == user_data.email))
+    )
+    existing = result.all()
+    if any(row.username == user_data.username for row in existing):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists"
         )
-    
-    # Check for existing email
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    if result.scalar_one_or_none():
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already exists"
@@ -124,37 +207,58 @@ async def create_user(
         is_active=True
     )
     
-    # Assign departments if provided
+    # Assign departments if provided. Always set the collection so the response
+    # can be built from the in-memory user without reloading it after commit.
+    departments = []
     if user_data.department_ids:
         result = await db.execute(
             select(Department).where(Department.id.in_(user_data.department_ids))
         )
         departments = result.scalars().all()
-        user.departments = list(departments)
+    user.departments = list(departments)
+    user.department_summary = [
+        {"id": d.id, "name": d.name} for d in sorted(departments, key=lambda d: d.name)
+    ]
     
     db.add(user)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent create won the race past the pre-check; the unique indexes catch it
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username or email already exists"
+        )
+    await invalidate_staff_cache()
     
-    # Reload with departments relationship for response
-    result = await db.execute(
-        select(User)
-        .where(User.id == user.id)
-        .options(selectinload(User.departments))
+    # id and created_at come back from the INSERT ... RETURNING
+    return Response(
+        content=_user_to_dto(user).model_dump_json(warnings=False),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
     )
-    return result.scalar_one()
+
+
+async def _get_user_or_404(db: AsyncSession, user_id: int, current_user: User) -> User:
+    """Load a user by id, reusing the already-loaded admin when it's their own row."""
+    if current_user.id == user_id:
+        return current_user
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_admin)
+    current_user: User = Depends(get_current_admin)
 ):
     """Get user by ID (admin only)"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await _get_user_or_404(db, user_id, current_user)
     return user
 
 
@@ -163,23 +267,26 @@ async def update_user(
     user_id: int,
     user_data: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_admin)
+    current_user: User = Depends(get_current_admin)
 ):
     """Update user (admin only)"""
-    result = await db.execute(select(User).where(User.id == user_id))
+    # department_ids isn't a users column; membership isn't edited here
+    update_data = user_data.model_dump(exclude_unset=True, exclude_none=True, exclude={"department_ids"})
+    if not update_data:
+        return await _get_user_or_404(db, user_id, current_user)
+    if "role" in update_data:
+        update_data["role"] = update_data["role"].value
+    
+    # One UPDATE ... RETURNING instead of load + setattr + flush
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(**update_data).returning(User)
+    )
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    update_data = user_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        if value is not None:
-            if field == "role":
-                value = value.value
-            setattr(user, field, value)
-    
     await db.commit()
-    await db.refresh(user)
+    await invalidate_staff_cache()
     return user
 
 
@@ -203,6 +310,7 @@ async def delete_user(
     
     await db.delete(user)
     await db.commit()
+    await invalidate_staff_cache()
 
 
 @router.post("/{user_id}/reset-password", response_model=UserResponse)
@@ -210,22 +318,16 @@ async def reset_password(
     user_id: int,
     new_password: str,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_admin)
+    current_user: User = Depends(get_current_admin)
 ):
     """Reset user password (admin only)"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await _get_user_or_404(db, user_id, current_user)
     
     user.hashed_password = get_password_hash(new_password)
     await db.commit()
-    await db.refresh(user)
     return user
 
 
-from pydantic import BaseModel
-
 class PasswordResetRequest(BaseModel):
     new_password: str
 
@@ -235,22 +337,17 @@ async def reset_password_json(
     user_id: int,
     data: PasswordResetRequest,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_admin)
+    current_user: User = Depends(get_current_admin)
 ):
     """Reset user password via JSON body (admin only)"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await _get_user_or_404(db, user_id, current_user)
     
     user.hashed_password = get_password_hash(data.new_password)
     await db.commit()
-    await db.refresh(user)
     return user
 
 
 # ============ Notification Preferences ============
-from app.schemas import NotificationPreferencesUpdate
 
 
 class NotificationPreferencesResponse(BaseModel):
@@ -264,6 +361,7 @@ class NotificationPreferencesResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        frozen = True
 
 
 @router.get("/me/notification-preferences", response_model=NotificationPreferencesResponse)
@@ -291,8 +389,8 @@ async def update_my_notification_preferences(
     current_user: User = Depends(get_current_staff)
 ):
     """Update current user's notification preferences"""
-    # Get current preferences or initialize empty
-    current_prefs = current_user.notification_preferences or {}
+    # Work on a copy so the JSON column sees a new value and is written on commit
+    current_prefs = dict(current_user.notification_preferences or {})
     
     # Update only the fields that were provided
     update_data = prefs.model_dump(exclude_unset=True, exclude={"phone"})
@@ -307,7 +405,6 @@ async def update_my_notification_preferences(
         current_user.phone = prefs.phone
     
     await db.commit()
-    await db.refresh(current_user)
     
     return NotificationPreferencesResponse(
         email_new_requests=current_prefs.get("email_new_requests", True),
@@ -7,6 +7,14 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "postgresql+asyncpg://township:township@db/township_db"
     
+    # Database connection pool (async engine)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_recycle: int = 300  # seconds; recycle before server/proxy idle timeouts
+    db_connect_timeout: int = 10  # seconds
+    db_statement_cache_size: int = 1024  # asyncpg server-side prepared statements per connection
+    db_query_cache_size: int = 1200  # SQLAlchemy compiled SQL cache entries
+    
     # Redis
     redis_url: str = "redis://redis:6379/0"
     
@@ -0,0 +1,39 @@
+"""
+Shared outbound HTTP client.
+
+A single pooled httpx.AsyncClient for the API process, so repeated calls to
+the same host (Auth0 discovery, token and userinfo endpoints) reuse open
+keep-alive connections instead of paying a new TCP + TLS handshake each time.
+
+Only use this from code running on the FastAPI event loop. Celery tasks and
+helpers that spin up their own loop with asyncio.run() should keep using
+short-lived clients, since a pooled client is bound to the loop it was first
+used on.
+"""
+import httpx
+from typing import Optional
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=5.0,
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=8,
+                keepalive_expiry=30.0
+            )
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client. Called from the app lifespan on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
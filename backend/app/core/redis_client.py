@@ -0,0 +1,12 @@
+"""
+Shared Redis client for cached response payloads.
+
+decode_responses is left off, so cached JSON comes back as the bytes it was
+stored as and goes straight into the response body without a decode/encode
+round trip.
+"""
+import redis.asyncio as redis
+
+from app.core.config import get_settings
+
+redis_client = redis.from_url(get_settings().redis_url)
@@ -162,6 +162,31 @@ async def _run_schema_migrations():
     migrations = [
         # Service category ordering (added 2026-03-14)
         "ALTER TABLE service_definitions ADD COLUMN IF NOT EXISTS display_order INTEGER DEFAULT 0",
+        # Pre-aggregated research analytics, refreshed by the app lifespan (added 2026-10-15)
+        """CREATE MATERIALIZED VIEW IF NOT EXISTS research_request_summary_mv AS
+            SELECT date_trunc('hour', requested_datetime) AS hour_bucket,
+                   service_code,
+                   service_name,
+                   status,
+                   COALESCE(source, 'unknown') AS source,
+                   count(*) AS request_count,
+                   sum(extract(epoch FROM closed_datetime - requested_datetime) / 3600.0)
+                       FILTER (WHERE status = 'closed' AND closed_datetime IS NOT NULL) AS resolution_hours_sum,
+                   count(*) FILTER (WHERE status = 'closed' AND closed_datetime IS NOT NULL) AS resolved_count
+            FROM service_requests
+            WHERE deleted_at IS NULL
+            GROUP BY 1, 2, 3, 4, 5""",
+        # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_research_summary_mv_key ON research_request_summary_mv "
+        "(hour_bucket, service_code, service_name, status, source)",
+        # Denormalized department list for staff dropdowns (added 2026-10-15)
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS department_summary JSON",
+        """UPDATE users SET department_summary = COALESCE((
+                SELECT json_agg(json_build_object('id', d.id, 'name', d.name) ORDER BY d.name)
+                FROM user_departments ud JOIN departments d ON d.id = ud.department_id
+                WHERE ud.user_id = users.id
+            ), '[]'::json)
+            WHERE department_summary IS NULL""",
     ]
     
     try:
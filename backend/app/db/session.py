@@ -10,8 +10,16 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args={
+        "timeout": settings.db_connect_timeout,
+        # Repeat-shaped lookups stay prepared on the server across pool checkouts
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size
+    }
 )
 
 # Sync engine for non-async contexts (encryption, health checks)
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import Response
+from fastapi.responses import ORJSONResponse, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from contextlib import asynccontextmanager
 import os
@@ -23,6 +23,7 @@ if SENTRY_DSN:
 
 from app.api import auth, users, departments, services, system, open311, gis, map_layers, comments, research, health, audit, setup, api_usage, data_export
 from app.db.init_db import seed_database
+from app.core.config import get_settings
 
 # Rate limiting setup
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -91,12 +92,6 @@ class DemoModeMiddleware(BaseHTTPMiddleware):
     ]
     
     async def dispatch(self, request: Request, call_next):
-        from app.core.config import get_settings
-        settings = get_settings()
-        
-        if not settings.demo_mode:
-            return await call_next(request)
-        
         method = request.method.upper()
         path = request.url.path
         
@@ -110,8 +105,7 @@ class DemoModeMiddleware(BaseHTTPMiddleware):
                 return await call_next(request)
         
         # Block all other mutations
-        from fastapi.responses import JSONResponse
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=403,
             content={"detail": "Demo mode — this action is disabled. Deploy your own instance to configure settings."},
         )
@@ -122,11 +116,8 @@ async def lifespan(app: FastAPI):
     """Application lifecycle manager"""
     import asyncio
     from app.db.session import SessionLocal
-    from app.api.health import (
-        check_database, check_auth0, check_google_kms,
-        check_secret_manager, check_vertex_ai, check_translation_api,
-        record_uptime_check
-    )
+    from app.api.health import run_uptime_checks
+    from app.services.audit_service import run_audit_writer
     import time
     
     # Background task for uptime monitoring
@@ -135,28 +126,7 @@ async def lifespan(app: FastAPI):
         while True:
             try:
                 async with SessionLocal() as db:
-                    services_to_check = [
-                        ("database", check_database),
-                        ("auth0", check_auth0),
-                        ("google_kms", check_google_kms),
-                        ("secret_manager", check_secret_manager),
-                        ("vertex_ai", check_vertex_ai),
-                        ("translation_api", check_translation_api),
-                    ]
-                    
-                    for service_name, check_func in services_to_check:
-                        start = time.time()
-                        try:
-                            check_result = await check_func(db)
-                            response_time = int((time.time() - start) * 1000)
-                            status = "healthy" if check_result["status"] in ["healthy", "configured", "fallback", "disabled"] else "down"
-                            error = None if status == "healthy" else check_result.get("message")
-                        except Exception as e:
-                            response_time = int((time.time() - start) * 1000)
-                            status = "down"
-                            error = str(e)
-                        
-                        await record_uptime_check(db, service_name, status, response_time, error)
+                    await run_uptime_checks(db)
                     
                     # Cleanup: Delete records older than 30 days
                     from datetime import datetime, timedelta, timezone
@@ -179,22 +149,53 @@ async def lifespan(app: FastAPI):
             # Wait 5 minutes before next check
             await asyncio.sleep(300)
     
+    # Background task keeping the research analytics rollup fresh
+    async def research_summary_refresher():
+        """Refresh research_request_summary_mv on a fixed interval."""
+        from app.api.research import refresh_research_summary, RESEARCH_SUMMARY_REFRESH_SECONDS
+        while True:
+            try:
+                async with SessionLocal() as db:
+                    if await refresh_research_summary(db):
+                        logger.debug("[Research Summary] Materialized view refreshed")
+            except Exception as e:
+                logger.error(f"[Research Summary] Refresh error: {e}")
+            
+            await asyncio.sleep(RESEARCH_SUMMARY_REFRESH_SECONDS)
+    
     # Startup: Initialize database with default data
     await seed_database()
     
+    from app.db.session import engine
+    logger.info(f"[DB] Async pool ready: {engine.pool.status()}")
+    
     # Start background uptime monitoring task
     uptime_task = asyncio.create_task(uptime_monitor())
     logger.info("[Uptime Monitor] Started background health monitoring (every 5 minutes)")
     
+    research_summary_task = asyncio.create_task(research_summary_refresher())
+    
+    # Writer for audit events queued with AuditService.enqueue_event
+    audit_writer_task = asyncio.create_task(run_audit_writer())
+    
     yield
     
-    # Shutdown: Cancel background task
-    uptime_task.cancel()
-    try:
-        await uptime_task
-    except asyncio.CancelledError:
-        pass  # Expected during shutdown
+    # Shutdown: Cancel background tasks
+    for task in (uptime_task, research_summary_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass  # Expected during shutdown
     logger.info("[Uptime Monitor] Stopped background health monitoring")
+    
+    # The audit writer is stopped, not cancelled, so an in-flight batch isn't lost
+    from app.services.audit_service import stop_audit_writer, flush_audit_queue
+    await stop_audit_writer(audit_writer_task)
+    await flush_audit_queue()
+    
+    from app.core.http_client import close_http_client
+    await close_http_client()
 
 
 app = FastAPI(
@@ -204,6 +205,7 @@ app = FastAPI(
     docs_url=None,  # Disable default - we serve custom below
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -245,8 +247,11 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Security headers middleware (added first, runs last)
 app.add_middleware(SecurityHeadersMiddleware)
 
-# Demo mode middleware — block admin mutations
-app.add_middleware(DemoModeMiddleware)
+# Demo mode middleware — block admin mutations. Settings are fixed for the
+# process lifetime, so outside demo mode it isn't installed at all and
+# responses aren't wrapped by an extra BaseHTTPMiddleware layer.
+if get_settings().demo_mode:
+    app.add_middleware(DemoModeMiddleware)
 
 # CORS middleware - use environment-based origins for production security
 # In production, set CORS_ORIGINS environment variable (comma-separated)
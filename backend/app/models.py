@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Text, Boolean, Table
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Text, Boolean, Table, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
@@ -50,6 +50,9 @@ class User(Base):
     phone = Column(String(50))  # Staff phone for SMS alerts
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Denormalized [{id, name}] copy of departments for list reads (kept in sync by the users/departments APIs)
+    department_summary = Column(JSON, default=list)
+    
     # Staff can be assigned to multiple departments
     departments = relationship(
         "Department",
@@ -57,6 +60,14 @@ class User(Base):
         back_populates="staff_members"
     )
 
+    # Staff dropdowns: active staff/admins in (full_name, username) order, read straight off the index
+    __table_args__ = (
+        Index(
+            "ix_users_active_staff", "full_name", "username",
+            postgresql_where=text("is_active AND role IN ('staff', 'admin')")
+        ),
+    )
+
 
 class Department(Base):
     __tablename__ = "departments"
@@ -128,6 +139,8 @@ class ServiceDefinition(Base):
 
 class ServiceRequest(Base):
     __tablename__ = "service_requests"
+    # Load onupdate=func.now() timestamps via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     service_request_id = Column(String(50), unique=True, index=True, nullable=False)
@@ -138,6 +151,9 @@ class ServiceRequest(Base):
     description = Column(Text, nullable=False)
     
     # Status
+    # Kept as VARCHAR rather than a native ENUM: the values are 4-11 bytes (no wider
+    # than an enum's 4-byte OID plus header in practice), research_request_summary_mv
+    # and the partial indexes depend on the column type, and new statuses don't need DDL.
     status = Column(String(20), default="open", index=True)  # open, in_progress, closed
     priority = Column(Integer, default=5)  # 1-10
     
@@ -296,10 +312,33 @@ class ServiceRequest(Base):
     # Document retention / archival
     archived_at = Column(DateTime(timezone=True), index=True)  # When record was archived
 
+    # Partial indexes for the research/analytics filters, which always exclude
+    # soft-deleted rows and range over requested_datetime
+    __table_args__ = (
+        Index(
+            "ix_sr_active_requested_dt", text("requested_datetime DESC"),
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+        Index(
+            "ix_sr_active_code_requested_dt", "service_code", "requested_datetime",
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+        Index(
+            "ix_sr_active_closed_dt", "closed_datetime",
+            postgresql_where=text("deleted_at IS NULL AND status = 'closed'")
+        ),
+        # Staff request list: WHERE status = ? ORDER BY requested_datetime DESC LIMIT 100
+        Index(
+            "ix_sr_active_status_requested_dt", "status", text("requested_datetime DESC"),
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+    )
+
 
 class RequestComment(Base):
     """Two-way comments on service requests with visibility control"""
     __tablename__ = "request_comments"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     service_request_id = Column(Integer, ForeignKey("service_requests.id"), nullable=False, index=True)
@@ -353,6 +392,7 @@ class RequestAuditLog(Base):
 
 class SystemSettings(Base):
     __tablename__ = "system_settings"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     township_name = Column(String(200), default="Your Township")
@@ -411,6 +451,7 @@ class SystemSecret(Base):
 class MapLayer(Base):
     """Custom GeoJSON layers for township assets (parks, storm drains, utilities, etc.)"""
     __tablename__ = "map_layers"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)  # "Parks", "Storm Drains", etc.
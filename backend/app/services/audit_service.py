@@ -3,14 +3,77 @@ Audit logging service for government-compliant authentication event tracking.
 Implements NIST 800-53 AU-2, AU-3, AU-6, AU-9, AU-12 controls.
 """
 
+import asyncio
 import hashlib
 import json
+import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Awaitable, Callable, Optional, Dict, Any, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, event
 from app.models import AuditLog, User
 
+logger = logging.getLogger(__name__)
+
+# Queued audit events are buffered here and written by run_audit_writer.
+# Items are (event kwargs, future or None); the future resolves once committed.
+AUDIT_QUEUE_MAXSIZE = 10_000
+
+# Most events the writer commits in a single transaction
+AUDIT_BATCH_SIZE = 100
+
+# How long shutdown waits for the writer to drain the queue before cancelling it
+AUDIT_SHUTDOWN_TIMEOUT = 10  # seconds
+
+# Queued by stop_audit_writer; the writer exits once everything ahead of it is written
+_STOP_WRITER = object()
+
+# Rows fetched per round trip when verify_integrity walks the chain
+AUDIT_VERIFY_BATCH_SIZE = 1000
+
+_audit_queue: Optional[asyncio.Queue] = None
+_audit_writer_running = False
+
+# Shared encoder for entry hashing; json.dumps(..., sort_keys=True) builds a new
+# JSONEncoder on every call
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
+# Hash of the newest chained entry, so writes don't re-read it with a SELECT.
+# Only trusted while _last_hash_known; any other AuditLog insert clears it.
+_last_hash: Optional[str] = None
+_last_hash_known = False
+
+# Counts AuditLog inserts made outside AuditService. A writer re-caches its
+# hash only if this didn't move while it held _chain_lock, so it can't undo
+# a clear that happened mid-commit.
+_foreign_inserts = 0
+
+# Serializes chained writes so two events never link to the same predecessor
+_chain_lock = asyncio.Lock()
+
+
+def _get_audit_queue() -> asyncio.Queue:
+    global _audit_queue
+    if _audit_queue is None:
+        _audit_queue = asyncio.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+    return _audit_queue
+
+
+def _remember_last_hash(entry_hash: Optional[str]) -> None:
+    global _last_hash, _last_hash_known
+    _last_hash = entry_hash
+    _last_hash_known = entry_hash is not None
+
+
+@event.listens_for(AuditLog, "after_insert")
+def _forget_last_hash(mapper, connection, target):
+    # Covers rows added outside AuditService; our own writers re-set it after commit
+    global _foreign_inserts
+    if getattr(target, "_chained", False):
+        return
+    _foreign_inserts += 1
+    _remember_last_hash(None)
+
 
 class AuditService:
     """
@@ -22,13 +85,16 @@ class AuditService:
     @staticmethod
     def _compute_hash(entry_data: Dict[str, Any]) -> str:
         """Compute SHA-256 hash of audit log entry for tamper detection"""
-        # Sort keys for consistent hashing
-        canonical = json.dumps(entry_data, sort_keys=True)
+        # Sort keys for consistent hashing. Must stay byte-identical to
+        # json.dumps(entry_data, sort_keys=True) or stored chains stop verifying.
+        canonical = _CANONICAL_ENCODER.encode(entry_data)
         return hashlib.sha256(canonical.encode()).hexdigest()
     
     @staticmethod
     async def _get_last_entry_hash(db) -> Optional[str]:
         """Get hash of the most recent audit log entry"""
+        if _last_hash_known:
+            return _last_hash
         result = await db.execute(
             select(AuditLog.entry_hash)
             .order_by(desc(AuditLog.id))
@@ -38,8 +104,8 @@ class AuditService:
         return last_entry
     
     @staticmethod
-    async def log_event(
-        db: Session,
+    def _build_entry(
+        previous_hash: Optional[str],
         event_type: str,
         success: bool,
         username: Optional[str] = None,
@@ -50,26 +116,7 @@ class AuditService:
         failure_reason: Optional[str] = None,
         details: Optional[Dict[str, Any]] = None
     ) -> AuditLog:
-        """
-        Log an authentication event to the audit trail.
-        
-        Args:
-            event_type: Type of event (login_success, login_failed, etc.)
-            success: Whether the event was successful
-            username: Username (for failed attempts, this is the attempted username)
-            user_id: User ID (null for failed login attempts)
-            ip_address: Client IP address
-            user_agent: Client user agent string
-            session_id: Session/JWT identifier
-            failure_reason: Reason for failure (if success=False)
-            details: Additional event-specific data
-        
-        Returns:
-            Created AuditLog entry
-        """
-        # Get previous hash for integrity chain
-        previous_hash = await AuditService._get_last_entry_hash(db)
-        
+        """Create an AuditLog chained to previous_hash"""
         # Prepare entry data for hashing
         entry_data = {
             "event_type": event_type,
@@ -85,8 +132,7 @@ class AuditService:
         # Compute this entry's hash
         entry_hash = AuditService._compute_hash(entry_data)
         
-        # Create audit log entry
-        audit_log = AuditLog(
+        entry = AuditLog(
             user_id=user_id,
             username=username,
             event_type=event_type,
@@ -99,10 +145,125 @@ class AuditService:
             previous_hash=previous_hash,
             entry_hash=entry_hash
         )
+        entry._chained = True
+        return entry
+    
+    @staticmethod
+    def enqueue_event(**event: Any) -> None:
+        """
+        Queue an audit event without waiting for the database write.
         
-        db.add(audit_log)
-        await db.commit()
-        await db.refresh(audit_log)
+        Takes the same keyword arguments as log_event (minus db). Used on admin
+        mutation paths so the audit INSERT doesn't delay the response; the
+        entry is written by run_audit_writer shortly after.
+        """
+        try:
+            _get_audit_queue().put_nowait((event, None))
+        except asyncio.QueueFull:
+            logger.error(f"Audit queue full, dropping {event.get('event_type')} event")
+    
+    @staticmethod
+    async def _write_events(db, events: List[Dict[str, Any]]) -> List[AuditLog]:
+        """Chain and insert a batch of queued events in one transaction"""
+        async with _chain_lock:
+            generation = _foreign_inserts
+            previous_hash = await AuditService._get_last_entry_hash(db)
+            entries = []
+            for queued in events:
+                entry = AuditService._build_entry(previous_hash, **queued)
+                entries.append(entry)
+                previous_hash = entry.entry_hash
+            db.add_all(entries)
+            try:
+                await db.commit()
+            except BaseException:
+                # Includes cancellation: the commit may or may not have landed
+                _remember_last_hash(None)
+                raise
+            _remember_last_hash(previous_hash if _foreign_inserts == generation else None)
+            return entries
+    
+    @staticmethod
+    async def log_detached(log_fn: Callable[..., Awaitable[AuditLog]], **kwargs: Any) -> None:
+        """
+        Run log_event or one of the log_* helpers on a fresh session.
+        
+        Meant for BackgroundTasks: the request's session is closed by the
+        time the task runs, so this opens its own.
+        """
+        from app.db.session import SessionLocal
+        
+        try:
+            async with SessionLocal() as db:
+                await log_fn(db=db, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to write audit event via {log_fn.__name__}: {e}")
+    
+    @staticmethod
+    async def log_event(
+        db: Session,
+        event_type: str,
+        success: bool,
+        username: Optional[str] = None,
+        user_id: Optional[int] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        session_id: Optional[str] = None,
+        failure_reason: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None
+    ) -> AuditLog:
+        """
+        Log an authentication event to the audit trail.
+        
+        While other events are already queued (a burst of logins, say) the
+        event joins the queue and this waits for the writer's batched commit
+        instead of issuing its own; otherwise it's written directly on db.
+        
+        Args:
+            event_type: Type of event (login_success, login_failed, etc.)
+            success: Whether the event was successful
+            username: Username (for failed attempts, this is the attempted username)
+            user_id: User ID (null for failed login attempts)
+            ip_address: Client IP address
+            user_agent: Client user agent string
+            session_id: Session/JWT identifier
+            failure_reason: Reason for failure (if success=False)
+            details: Additional event-specific data
+        
+        Returns:
+            Created AuditLog entry
+        """
+        event = {
+            "event_type": event_type,
+            "success": success,
+            "username": username,
+            "user_id": user_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "session_id": session_id,
+            "failure_reason": failure_reason,
+            "details": details,
+        }
+        queue = _get_audit_queue()
+        if _audit_writer_running and not queue.empty() and not queue.full():
+            future = asyncio.get_running_loop().create_future()
+            queue.put_nowait((event, future))
+            return await future
+        
+        async with _chain_lock:
+            generation = _foreign_inserts
+            # Get previous hash for integrity chain
+            previous_hash = await AuditService._get_last_entry_hash(db)
+            
+            audit_log = AuditService._build_entry(previous_hash, **event)
+            
+            db.add(audit_log)
+            try:
+                await db.commit()
+            except BaseException:
+                _remember_last_hash(None)
+                raise
+            _remember_last_hash(audit_log.entry_hash if _foreign_inserts == generation else None)
         
         return audit_log
     
@@ -194,25 +355,32 @@ class AuditService:
         )
     
     @staticmethod
-    async def verify_integrity(db: Session, start_id: Optional[int] = None) -> bool:
+    async def verify_integrity(db: Session, start_id: Optional[int] = None) -> Tuple[bool, Optional[int]]:
         """
         Verify the integrity of the audit log chain.
         
+        Rows are streamed in batches of AUDIT_VERIFY_BATCH_SIZE rather than
+        loaded all at once, and the walk stops at the first bad entry.
+        
         Args:
             start_id: Optional starting ID to verify from (verifies all if None)
         
         Returns:
-            True if chain is intact, False if tampering detected
+            (True, None) if chain is intact, (False, id of first bad entry) if
+            tampering detected
         """
-        query = select(AuditLog).order_by(AuditLog.id)
+        query = select(
+            AuditLog.id, AuditLog.event_type, AuditLog.success, AuditLog.username,
+            AuditLog.user_id, AuditLog.ip_address, AuditLog.timestamp, AuditLog.session_id,
+            AuditLog.details, AuditLog.previous_hash, AuditLog.entry_hash
+        ).order_by(AuditLog.id).execution_options(yield_per=AUDIT_VERIFY_BATCH_SIZE)
         if start_id:
             query = query.where(AuditLog.id >= start_id)
         
-        result = db.execute(query)
-        logs = result.scalars().all()
+        result = await db.stream(query)
         
         previous_hash = None
-        for log in logs:
+        async for log in result:
             # Verify this entry's hash matches stored hash
             entry_data = {
                 "event_type": log.event_type,
@@ -227,12 +395,97 @@ class AuditService:
             computed_hash = AuditService._compute_hash(entry_data)
             
             if computed_hash != log.entry_hash:
-                return False  # Entry has been tampered with
+                await result.close()
+                return False, log.id  # Entry has been tampered with
             
             # Verify chain linkage
             if previous_hash != log.previous_hash:
-                return False  # Chain has been broken
+                await result.close()
+                return False, log.id  # Chain has been broken
             
             previous_hash = log.entry_hash
         
-        return True
+        return True, None
+
+
+async def _write_batch(batch: List[tuple]) -> None:
+    """Write queued (event, future) pairs and resolve their futures."""
+    from app.db.session import SessionLocal
+    
+    try:
+        async with SessionLocal() as db:
+            entries = await AuditService._write_events(db, [event for event, _ in batch])
+    except asyncio.CancelledError:
+        for _, future in batch:
+            if future is not None and not future.done():
+                future.cancel()
+        raise
+    except Exception as e:
+        logger.error(f"Failed to write {len(batch)} audit events: {e}")
+        for _, future in batch:
+            if future is not None and not future.done():
+                future.set_exception(e)
+        return
+    
+    for (_, future), entry in zip(batch, entries):
+        if future is not None and not future.done():
+            future.set_result(entry)
+
+
+async def run_audit_writer() -> None:
+    """
+    Drain the audit queue until stop_audit_writer is called, committing up to
+    AUDIT_BATCH_SIZE events per transaction. Started from the app lifespan;
+    being the only consumer keeps the hash chain in queue order.
+    """
+    global _audit_writer_running
+    
+    queue = _get_audit_queue()
+    _audit_writer_running = True
+    try:
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP_WRITER:
+                break
+            batch = [item]
+            while len(batch) < AUDIT_BATCH_SIZE and not queue.empty():
+                item = queue.get_nowait()
+                if item is _STOP_WRITER:
+                    stopping = True
+                    break
+                batch.append(item)
+            await _write_batch(batch)
+    finally:
+        _audit_writer_running = False
+
+
+async def stop_audit_writer(task: asyncio.Task) -> None:
+    """
+    Let the writer finish its current batch and everything queued, then exit.
+    Only cancels it if that takes longer than AUDIT_SHUTDOWN_TIMEOUT.
+    """
+    try:
+        await asyncio.wait_for(_get_audit_queue().put(_STOP_WRITER), AUDIT_SHUTDOWN_TIMEOUT)
+        await asyncio.wait_for(task, AUDIT_SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Audit writer didn't drain in time, cancelling it")
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    except Exception as e:
+        logger.error(f"Audit writer stopped with an error: {e}")
+
+
+async def flush_audit_queue() -> None:
+    """Write whatever is still queued. Called on shutdown once the writer has stopped."""
+    queue = _get_audit_queue()
+    batch = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is not _STOP_WRITER:
+            batch.append(item)
+    if batch:
+        await _write_batch(batch)
@@ -3,12 +3,23 @@ Auth0 authentication service using pure OAuth 2.0 / OpenID Connect.
 Clean abstraction with no Auth0 SDK dependencies.
 """
 
+import hashlib
 import httpx
 import jwt
-from typing import Optional, Dict, Any
+import logging
+import time
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Management API tokens keyed by (domain, client_id, secret digest) -> (expires_at, token).
+# Tokens are reused until MGMT_TOKEN_EXPIRY_MARGIN seconds before they expire.
+_mgmt_token_cache: Dict[Tuple[str, str, str], Tuple[float, str]] = {}
+MGMT_TOKEN_EXPIRY_MARGIN = 60
 
 
 class Auth0Service:
@@ -18,19 +29,22 @@ class Auth0Service:
     """
     
     @staticmethod
-    async def get_config(db: Session) -> Optional[Dict[str, str]]:
+    async def get_config(db: Session, secrets: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, str]]:
         """
         Retrieve Auth0 configuration from Secret Manager (GCP) or database fallback.
         
+        Pass secrets (SystemSecret rows keyed by key_name) to reuse an
+        already loaded batch for the database fallback.
+        
         Returns dict with: domain, client_id, client_secret
         Returns None if not configured.
         """
         from app.services.secret_manager import get_secret
         
         # Use Secret Manager (checks GCP first, falls back to DB)
-        domain = await get_secret("AUTH0_DOMAIN")
-        client_id = await get_secret("AUTH0_CLIENT_ID")
-        client_secret = await get_secret("AUTH0_CLIENT_SECRET")
+        domain = await get_secret("AUTH0_DOMAIN", db_secrets=secrets)
+        client_id = await get_secret("AUTH0_CLIENT_ID", db_secrets=secrets)
+        client_secret = await get_secret("AUTH0_CLIENT_SECRET", db_secrets=secrets)
         
         if not all([domain, client_id, client_secret]):
             return None
@@ -105,26 +119,62 @@ class Auth0Service:
         client_secret = config["client_secret"]
         
         # Exchange code for tokens
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"https://{domain}/oauth/token",
-                json={
-                    "grant_type": "authorization_code",
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                    "code": code,
-                    "redirect_uri": redirect_uri
-                },
-                headers={
-                    "Content-Type": "application/json"
-                }
+        client = get_http_client()
+        response = await client.post(
+            f"https://{domain}/oauth/token",
+            json={
+                "grant_type": "authorization_code",
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "code": code,
+                "redirect_uri": redirect_uri
+            },
+            headers={
+                "Content-Type": "application/json"
+            }
+        )
+        
+        if response.status_code != 200:
+            error_detail = response.json().get("error_description", "Token exchange failed")
+            raise HTTPException(status_code=400, detail=error_detail)
+        
+        return response.json()
+    
+    @staticmethod
+    async def get_management_token(domain: str, client_id: str, client_secret: str) -> str:
+        """
+        Get a Management API token via client credentials, reusing a cached one
+        while it is still valid.
+        
+        The secret is part of the cache key (as a digest) so a different secret
+        is always checked against Auth0 rather than served a cached token.
+        """
+        cache_key = (domain, client_id, hashlib.sha256(client_secret.encode()).hexdigest())
+        cached = _mgmt_token_cache.get(cache_key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        response = await get_http_client().post(
+            f"https://{domain}/oauth/token",
+            json={
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "audience": f"https://{domain}/api/v2/",
+                "grant_type": "client_credentials"
+            }
+        )
+        if response.status_code != 200:
+            logger.error(f"Auth0 Management API token failed: {response.text}")
+            raise HTTPException(status_code=400, detail="Failed to get Management API token")
+        
+        token_data = response.json()
+        expires_in = token_data.get("expires_in", 0)
+        if expires_in > MGMT_TOKEN_EXPIRY_MARGIN:
+            _mgmt_token_cache[cache_key] = (
+                time.monotonic() + expires_in - MGMT_TOKEN_EXPIRY_MARGIN,
+                token_data["access_token"]
             )
-            
-            if response.status_code != 200:
-                error_detail = response.json().get("error_description", "Token exchange failed")
-                raise HTTPException(status_code=400, detail=error_detail)
-            
-            return response.json()
+        return token_data["access_token"]
     
     @staticmethod
     async def get_jwks(domain: str) -> Dict[str, Any]:
@@ -137,10 +187,9 @@ class Auth0Service:
         Returns:
             JWKS dictionary
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://{domain}/.well-known/jwks.json")
-            response.raise_for_status()
-            return response.json()
+        response = await get_http_client().get(f"https://{domain}/.well-known/jwks.json")
+        response.raise_for_status()
+        return response.json()
     
     @staticmethod
     async def verify_token(token: str, db: Session) -> Dict[str, Any]:
@@ -213,28 +262,31 @@ class Auth0Service:
         
         domain = config["domain"]
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://{domain}/userinfo",
-                headers={
-                    "Authorization": f"Bearer {access_token}"
-                }
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=400, detail="Failed to fetch user info")
-            
-            return response.json()
+        response = await get_http_client().get(
+            f"https://{domain}/userinfo",
+            headers={
+                "Authorization": f"Bearer {access_token}"
+            }
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(status_code=400, detail="Failed to fetch user info")
+        
+        return response.json()
     
     @staticmethod
-    async def check_status(db: Session) -> Dict[str, Any]:
+    async def check_status(db: Session, secrets: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Check Auth0 configuration status for health check.
         
+        Args:
+            db: Database session
+            secrets: Optional prefetched SystemSecret rows keyed by key_name
+        
         Returns:
             Dict with status, domain, client_id (masked), and connectivity
         """
-        config = await Auth0Service.get_config(db)
+        config = await Auth0Service.get_config(db, secrets=secrets)
         
         if not config:
             return {
@@ -245,13 +297,12 @@ class Auth0Service:
         domain = config["domain"]
         client_id = config["client_id"]
         
-        # Test OIDC discovery endpoint
+        # Test OIDC discovery endpoint (pooled client keeps the TLS session warm between probes)
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    f"https://{domain}/.well-known/openid-configuration"
-                )
-                oidc_reachable = response.status_code == 200
+            response = await get_http_client().get(
+                f"https://{domain}/.well-known/openid-configuration"
+            )
+            oidc_reachable = response.status_code == 200
         except Exception:
             oidc_reachable = False
         
@@ -0,0 +1,48 @@
+"""
+In-process cache for the public system settings (branding) payload.
+
+GET /api/system/settings is hit on every page load but the row only changes
+when an admin saves settings. Entries expire after BRANDING_CACHE_TTL seconds
+and are dropped whenever SystemSettings is written through the ORM.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.models import SystemSettings
+
+BRANDING_CACHE_TTL = 60
+
+_cache: Dict[str, Tuple[float, Any]] = {}
+
+# Serializes cold-cache loads so concurrent requests don't all hit the database
+lock = asyncio.Lock()
+
+
+def get(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None if missing or expired."""
+    entry = _cache.get(key)
+    if entry and time.monotonic() - entry[0] < BRANDING_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def put(key: str, value: Any) -> None:
+    """Store value under key."""
+    _cache[key] = (time.monotonic(), value)
+
+
+def invalidate(key: Optional[str] = None) -> None:
+    """Drop one key, or everything when key is None."""
+    if key is None:
+        _cache.clear()
+    else:
+        _cache.pop(key, None)
+
+
+@event.listens_for(SystemSettings, "after_insert")
+@event.listens_for(SystemSettings, "after_update")
+def _invalidate_on_settings_write(mapper, connection, target):
+    invalidate()
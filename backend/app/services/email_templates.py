@@ -4,7 +4,8 @@ Branded Email Templates for Township 311 System
 Generates beautiful, responsive HTML email templates with township branding.
 Pulls configuration from SystemSettings for logo, colors, and township name.
 """
-from typing import Optional, Dict
+import functools
+from typing import Optional, Dict, Tuple
 
 
 # Email template translations for common languages
@@ -291,6 +292,9 @@ EMAIL_I18N = {
 # Cache for translated email strings: {(key, lang): translated_value}
 _email_translation_cache: Dict[tuple, str] = {}
 
+# Fully translated string sets per language, so repeat sends skip the per-key loop
+_email_i18n_cache: Dict[str, Dict[str, str]] = {}
+
 
 async def get_i18n_async(lang: str) -> Dict[str, str]:
     """
@@ -308,6 +312,10 @@ async def get_i18n_async(lang: str) -> Dict[str, str]:
     if lang == "en":
         return EMAIL_I18N["en"]
     
+    cached = _email_i18n_cache.get(lang)
+    if cached is not None:
+        return cached
+    
     # For other languages, translate using Google Translate API with caching
     from app.services.translation import translate_text
     
@@ -333,6 +341,7 @@ async def get_i18n_async(lang: str) -> Dict[str, str]:
     
     english_strings = EMAIL_I18N["en"]
     translated = {}
+    complete = True
     
     for key, english_value in english_strings.items():
         cache_key = (key, lang)
@@ -356,9 +365,14 @@ async def get_i18n_async(lang: str) -> Dict[str, str]:
             else:
                 # Fallback to English if translation fails
                 translated[key] = english_value
+                complete = False
         except Exception:
             translated[key] = english_value
+            complete = False
     
+    # Only keep sets with no English fallbacks, so failed keys are retried next time
+    if complete:
+        _email_i18n_cache[lang] = translated
     return translated
 
 
@@ -370,6 +384,10 @@ def get_i18n(lang: str) -> Dict[str, str]:
     return EMAIL_I18N.get(lang, EMAIL_I18N["en"])
 
 
+# Stand-in rendered into the base template so it can be split around the content
+_CONTENT_SLOT = "\x00content\x00"
+
+
 def get_base_template(
     township_name: str,
     logo_url: Optional[str],
@@ -382,6 +400,37 @@ def get_base_template(
     Base responsive email template with township branding.
     Uses inline CSS for maximum email client compatibility.
     """
+    head, tail = _base_template_parts(township_name, logo_url, primary_color, footer_text, language)
+    return head + content + tail
+
+
+@functools.lru_cache(maxsize=64)
+def _base_template_parts(
+    township_name: str,
+    logo_url: Optional[str],
+    primary_color: str,
+    footer_text: str,
+    language: str
+) -> Tuple[str, str]:
+    """
+    Render the branded wrapper once per township/branding/language and return
+    the HTML before and after the content slot. Only the content changes
+    between sends, so the surrounding page is built once.
+    """
+    head, _, tail = _render_base_template(
+        township_name, logo_url, primary_color, _CONTENT_SLOT, footer_text, language
+    ).partition(_CONTENT_SLOT)
+    return head, tail
+
+
+def _render_base_template(
+    township_name: str,
+    logo_url: Optional[str],
+    primary_color: str,
+    content: str,
+    footer_text: str,
+    language: str
+) -> str:
     i18n = get_i18n(language)
     dir_attr = 'dir="rtl"' if language in ['ar', 'he', 'fa', 'ur', 'yi', 'ps'] else ''
     
@@ -4,8 +4,9 @@ Supports Google Maps API and OpenStreetMap as fallback.
 """
 import httpx
 import logging
+from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any, List, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,22 @@ class BoundaryInfo:
     name: str
     geometry: Dict[str, Any]  # GeoJSON geometry
     bounds: Dict[str, float]  # {north, south, east, west}
+    # Non-horizontal edges of the outer ring as (yi, yj, xi, dx/dy), built once
+    # at load so point checks don't re-walk the GeoJSON
+    edges: List[Tuple[float, float, float, float]] = field(default_factory=list)
+    # The same edges bucketed into equal-height latitude bands between south
+    # and north; a point only needs the edges of the band it falls in
+    edge_bands: List[List[Tuple[float, float, float, float]]] = field(default_factory=list)
+
+
+@asynccontextmanager
+async def _client_or_new(http_client: Optional[httpx.AsyncClient]):
+    """Use the caller's pooled client if given, else a short-lived one"""
+    if http_client is not None:
+        yield http_client
+    else:
+        async with httpx.AsyncClient() as client:
+            yield client
 
 
 class GeocodingService:
@@ -36,22 +53,31 @@ class GeocodingService:
         self.google_base_url = "https://maps.googleapis.com/maps/api/geocode/json"
         self.osm_base_url = "https://nominatim.openstreetmap.org"
     
-    async def geocode(self, address: str) -> Optional[GeocodingResult]:
-        """Convert address to coordinates"""
+    async def geocode(
+        self, address: str, http_client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[GeocodingResult]:
+        """
+        Convert address to coordinates.
+        
+        API routes pass the shared pooled client (app.core.http_client) to
+        reuse keep-alive connections; Celery tasks leave it None.
+        """
         if self.google_api_key:
-            return await self._geocode_google(address)
-        return await self._geocode_osm(address)
+            return await self._geocode_google(address, http_client)
+        return await self._geocode_osm(address, http_client)
     
-    async def reverse_geocode(self, lat: float, lng: float) -> Optional[GeocodingResult]:
-        """Convert coordinates to address"""
+    async def reverse_geocode(
+        self, lat: float, lng: float, http_client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[GeocodingResult]:
+        """Convert coordinates to address (see geocode for http_client)"""
         if self.google_api_key:
-            return await self._reverse_geocode_google(lat, lng)
-        return await self._reverse_geocode_osm(lat, lng)
+            return await self._reverse_geocode_google(lat, lng, http_client)
+        return await self._reverse_geocode_osm(lat, lng, http_client)
     
-    async def _geocode_google(self, address: str) -> Optional[GeocodingResult]:
+    async def _geocode_google(self, address: str, http_client: Optional[httpx.AsyncClient] = None) -> Optional[GeocodingResult]:
         """Geocode using Google Maps API"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with _client_or_new(http_client) as client:
                 response = await client.get(
                     self.google_base_url,
                     params={
@@ -95,10 +121,10 @@ class GeocodingService:
             logger.warning(f"Google geocoding error: {e}")
         return None
     
-    async def _reverse_geocode_google(self, lat: float, lng: float) -> Optional[GeocodingResult]:
+    async def _reverse_geocode_google(self, lat: float, lng: float, http_client: Optional[httpx.AsyncClient] = None) -> Optional[GeocodingResult]:
         """Reverse geocode using Google Maps API"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with _client_or_new(http_client) as client:
                 response = await client.get(
                     self.google_base_url,
                     params={
@@ -134,10 +160,10 @@ class GeocodingService:
             logger.warning(f"Google reverse geocoding error: {e}")
         return None
     
-    async def _geocode_osm(self, address: str) -> Optional[GeocodingResult]:
+    async def _geocode_osm(self, address: str, http_client: Optional[httpx.AsyncClient] = None) -> Optional[GeocodingResult]:
         """Geocode using OpenStreetMap Nominatim (free fallback)"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with _client_or_new(http_client) as client:
                 response = await client.get(
                     f"{self.osm_base_url}/search",
                     params={
@@ -160,10 +186,10 @@ class GeocodingService:
             logger.warning(f"OSM geocoding error: {e}")
         return None
     
-    async def _reverse_geocode_osm(self, lat: float, lng: float) -> Optional[GeocodingResult]:
+    async def _reverse_geocode_osm(self, lat: float, lng: float, http_client: Optional[httpx.AsyncClient] = None) -> Optional[GeocodingResult]:
         """Reverse geocode using OpenStreetMap Nominatim"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with _client_or_new(http_client) as client:
                 response = await client.get(
                     f"{self.osm_base_url}/reverse",
                     params={
@@ -199,13 +225,57 @@ class BoundaryService:
         
         # Calculate bounds from geometry
         bounds = self._calculate_bounds(geometry)
+        edges = self._prepare_edges(geometry)
         
         self.boundaries[name] = BoundaryInfo(
             name=name,
             geometry=geometry,
-            bounds=bounds
+            bounds=bounds,
+            edges=edges,
+            edge_bands=self._index_edges(edges, bounds)
         )
     
+    def _prepare_edges(self, geometry: Dict[str, Any]) -> List[Tuple[float, float, float, float]]:
+        """Precompute the ray-casting edge table for a Polygon's outer ring"""
+        if geometry.get("type") != "Polygon":
+            return []
+        
+        coords = geometry.get("coordinates", [[]])[0]
+        edges = []
+        j = len(coords) - 1
+        for i in range(len(coords)):
+            xi, yi = float(coords[i][0]), float(coords[i][1])
+            xj, yj = float(coords[j][0]), float(coords[j][1])
+            # Horizontal edges can never straddle the ray, so skip them
+            if yi != yj:
+                edges.append((yi, yj, xi, (xj - xi) / (yj - yi)))
+            j = i
+        return edges
+    
+    @staticmethod
+    def _band_index(lat: float, south: float, band_height: float, band_count: int) -> int:
+        return min(max(int((lat - south) / band_height), 0), band_count - 1)
+    
+    def _index_edges(
+        self,
+        edges: List[Tuple[float, float, float, float]],
+        bounds: Dict[str, float]
+    ) -> List[List[Tuple[float, float, float, float]]]:
+        """Bucket edges by the latitude bands they span (about sqrt(n) bands)"""
+        if not edges or bounds["north"] <= bounds["south"]:
+            return [edges]
+        
+        band_count = max(1, int(len(edges) ** 0.5))
+        band_height = (bounds["north"] - bounds["south"]) / band_count
+        bands: List[List[Tuple[float, float, float, float]]] = [[] for _ in range(band_count)]
+        for edge in edges:
+            yi, yj = edge[0], edge[1]
+            first = self._band_index(min(yi, yj), bounds["south"], band_height, band_count)
+            last = self._band_index(max(yi, yj), bounds["south"], band_height, band_count)
+            for band in range(first, last + 1):
+                bands[band].append(edge)
+        return bands
+    
     def _calculate_bounds(self, geometry: Dict[str, Any]) -> Dict[str, float]:
         """Calculate bounding box from geometry"""
         coords = self._extract_coordinates(geometry)
@@ -256,25 +326,20 @@ class BoundaryService:
         
         # For precise check, use PostGIS via database query
         # This is a simplified ray-casting for client-side
-        return self._point_in_polygon(lat, lng, boundary.geometry)
+        bands = boundary.edge_bands
+        if len(bands) > 1:
+            band_height = (bounds["north"] - bounds["south"]) / len(bands)
+            edges = bands[self._band_index(lat, bounds["south"], band_height, len(bands))]
+        else:
+            edges = boundary.edges
+        return self._point_in_polygon(lat, lng, edges)
     
-    def _point_in_polygon(self, lat: float, lng: float, geometry: Dict[str, Any]) -> bool:
+    def _point_in_polygon(self, lat: float, lng: float, edges: List[Tuple[float, float, float, float]]) -> bool:
         """Ray-casting algorithm for point-in-polygon check"""
-        if geometry.get("type") != "Polygon":
-            return False
-        
-        coords = geometry.get("coordinates", [[]])[0]
-        n = len(coords)
         inside = False
-        
-        j = n - 1
-        for i in range(n):
-            xi, yi = coords[i][0], coords[i][1]
-            xj, yj = coords[j][0], coords[j][1]
-            
-            if ((yi > lat) != (yj > lat)) and (lng < (xj - xi) * (lat - yi) / (yj - yi) + xi):
+        for yi, yj, xi, slope in edges:
+            if ((yi > lat) != (yj > lat)) and (lng < slope * (lat - yi) + xi):
                 inside = not inside
-            j = i
         
         return inside
     
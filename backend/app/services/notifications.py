@@ -1,12 +1,16 @@
 """
 Notification services for SMS and Email with configurable providers.
 """
+import asyncio
+import hashlib
 import httpx
 import logging
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
@@ -103,6 +107,29 @@ class GenericHTTPSMSProvider(SMSProvider):
 
 # ============ Email Provider ============
 
+# Logged-in SMTP sessions reused across sends, keyed by server and login, so a
+# burst of notifications pays the connect/STARTTLS/AUTH handshake once. These are
+# plain sockets (no event loop), so they survive across Celery tasks in a worker.
+# Values are (session, monotonic time it was last returned to the pool).
+_smtp_connections: Dict[tuple, Tuple[smtplib.SMTP, float]] = {}
+_smtp_lock = threading.Lock()
+
+# Socket timeout for every SMTP operation, so a half-open connection raises
+# instead of blocking the worker forever
+SMTP_TIMEOUT = 30  # seconds
+
+# Pooled sessions idle longer than this are closed rather than reused; servers
+# commonly drop idle clients after a minute or so
+SMTP_MAX_IDLE = 60  # seconds
+
+
+def _close_quietly(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
 class EmailProvider:
     """SMTP Email provider"""
     
@@ -124,6 +151,66 @@ class EmailProvider:
         self.from_name = from_name
         self.use_tls = use_tls
     
+    def _connection_key(self) -> tuple:
+        password_digest = hashlib.sha256((self.smtp_password or "").encode()).hexdigest()
+        return (self.smtp_host, self.smtp_port, self.smtp_user, password_digest, self.use_tls)
+    
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_tls:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=SMTP_TIMEOUT)
+        else:
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=SMTP_TIMEOUT)
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            _close_quietly(server)
+            raise
+        return server
+    
+    def _send(self, msg: MIMEMultipart) -> None:
+        """Send on a pooled session, reconnecting once if the server dropped it"""
+        key = self._connection_key()
+        # The lock only guards the pool; connecting and sending happen outside it
+        with _smtp_lock:
+            pooled = _smtp_connections.pop(key, None)
+        
+        server = None
+        if pooled is not None:
+            server, returned_at = pooled
+            if time.monotonic() - returned_at > SMTP_MAX_IDLE:
+                # Likely already dropped by the server; don't wait on a QUIT
+                server.close()
+                server = None
+        
+        if server is not None:
+            try:
+                server.send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # Idle session timed out on the server side; open a new one
+                server.close()
+                server = None
+            except Exception:
+                # Session state is unknown after a failed send; never pool it again
+                _close_quietly(server)
+                raise
+        
+        if server is None:
+            server = self._connect()
+            try:
+                server.send_message(msg)
+            except Exception:
+                _close_quietly(server)
+                raise
+        
+        with _smtp_lock:
+            # A concurrent send may have pooled its own session meanwhile; keep one
+            displaced = _smtp_connections.pop(key, None)
+            _smtp_connections[key] = (server, time.monotonic())
+        if displaced is not None:
+            _close_quietly(displaced[0])
+    
     def send_email(
         self,
         to: str,
@@ -145,15 +232,7 @@ class EmailProvider:
                 msg.attach(MIMEText(body_text, "plain"))
             msg.attach(MIMEText(body_html, "html"))
             
-            if self.use_tls:
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-            else:
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
+            self._send(msg)
             
             logger.info(f"[Email] Successfully sent email to {to}")
             return True
@@ -213,21 +292,44 @@ class NotificationService:
         
         # Track SMS usage if successful
         if success:
-            try:
-                from app.db.session import SessionLocal
-                from app.services.api_usage import track_api_usage
-                async with SessionLocal() as db:
-                    await track_api_usage(
-                        db,
-                        service_name="sms",
-                        operation="send_sms",
-                        api_calls=1
-                    )
-            except Exception as e:
-                logger.debug(f"Failed to track SMS usage: {e}")
+            await self._track_sms_usage(1)
         
         return success
     
+    async def send_sms_many(self, messages: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Send several (to, message) SMS concurrently.
+        
+        Usage is recorded once for the whole batch rather than per message.
+        """
+        if not messages:
+            return []
+        if not self._sms_provider:
+            logger.warning("SMS provider not configured")
+            return [False] * len(messages)
+        
+        results = await asyncio.gather(
+            *(self._sms_provider.send_sms(to, message) for to, message in messages)
+        )
+        sent = sum(results)
+        if sent:
+            await self._track_sms_usage(sent)
+        return list(results)
+    
+    async def _track_sms_usage(self, count: int) -> None:
+        try:
+            from app.db.session import SessionLocal
+            from app.services.api_usage import track_api_usage
+            async with SessionLocal() as db:
+                await track_api_usage(
+                    db,
+                    service_name="sms",
+                    operation="send_sms",
+                    api_calls=count
+                )
+        except Exception as e:
+            logger.debug(f"Failed to track SMS usage: {e}")
+    
     def send_email(
         self,
         to: str,
@@ -244,31 +346,52 @@ class NotificationService:
         
         # Track email usage if successful (sync version)
         if success:
-            try:
-                import asyncio
-                from app.db.session import SessionLocal
-                from app.services.api_usage import track_api_usage
-                
-                async def _track():
-                    async with SessionLocal() as db:
-                        await track_api_usage(
-                            db,
-                            service_name="email",
-                            operation="send_email",
-                            api_calls=1
-                        )
-                
-                # Run in new event loop if needed
-                try:
-                    asyncio.get_running_loop()  # Check if loop is running
-                    asyncio.create_task(_track())
-                except RuntimeError:
-                    asyncio.run(_track())
-            except Exception as e:
-                logger.debug(f"Failed to track email usage: {e}")
+            self._track_email_usage(1)
         
         return success
     
+    def send_email_many(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Send several emails, each a dict of send_email keyword arguments.
+        
+        They go out back to back over the provider's pooled SMTP session, and
+        usage is recorded once for the batch instead of once per email.
+        """
+        if not messages:
+            return []
+        if not self._email_provider:
+            logger.warning("Email provider not configured")
+            return [False] * len(messages)
+        
+        results = [self._email_provider.send_email(**message) for message in messages]
+        sent = sum(results)
+        if sent:
+            self._track_email_usage(sent)
+        return results
+    
+    def _track_email_usage(self, count: int) -> None:
+        try:
+            from app.db.session import SessionLocal
+            from app.services.api_usage import track_api_usage
+            
+            async def _track():
+                async with SessionLocal() as db:
+                    await track_api_usage(
+                        db,
+                        service_name="email",
+                        operation="send_email",
+                        api_calls=count
+                    )
+            
+            # Run in new event loop if needed
+            try:
+                asyncio.get_running_loop()  # Check if loop is running
+                asyncio.create_task(_track())
+            except RuntimeError:
+                asyncio.run(_track())
+        except Exception as e:
+            logger.debug(f"Failed to track email usage: {e}")
+    
     def send_request_confirmation_branded(
         self,
         request_id: str,
@@ -5,11 +5,16 @@ Provides secure single sign-on authentication using OAuth 2.0 / OpenID Connect.
 Supports Google Sign-In and Microsoft Entra ID (Azure AD).
 """
 
-import httpx
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Tuple
 from urllib.parse import urlencode
 
+from sqlalchemy import event
+
+from app.core.http_client import get_http_client
+from app.models import SystemSecret
+
 logger = logging.getLogger(__name__)
 
 # OAuth endpoints
@@ -21,9 +26,45 @@ MICROSOFT_AUTH_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/autho
 MICROSOFT_TOKEN_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
 MICROSOFT_USERINFO_URL = "https://graph.microsoft.com/v1.0/me"
 
+# Seconds a provider's resolved config (or "not configured") is reused
+OAUTH_CONFIG_TTL = 60
+
+_oauth_config_cache: Dict[str, Tuple[float, Optional[Dict[str, str]]]] = {}
+
+
+def invalidate_oauth_config(provider: Optional[str] = None) -> None:
+    """Drop one provider's cached config, or all of them when provider is None."""
+    if provider is None:
+        _oauth_config_cache.clear()
+    else:
+        _oauth_config_cache.pop(provider.lower(), None)
+
+
+@event.listens_for(SystemSecret, "after_insert")
+@event.listens_for(SystemSecret, "after_update")
+def _invalidate_on_secret_write(mapper, connection, target):
+    if target.key_name and target.key_name.startswith("OAUTH_"):
+        invalidate_oauth_config()
+
 
 async def get_oauth_config(provider: str) -> Optional[Dict[str, str]]:
-    """Get OAuth configuration from Secret Manager."""
+    """
+    Get OAuth configuration from Secret Manager.
+    
+    Cached per provider for OAUTH_CONFIG_TTL seconds, so auth URL generation,
+    code exchange and SSO status polls don't each re-read and decrypt the
+    secrets. Writes to OAUTH_* SystemSecret rows clear the cache.
+    """
+    cached = _oauth_config_cache.get(provider.lower())
+    if cached and time.monotonic() - cached[0] < OAUTH_CONFIG_TTL:
+        return cached[1]
+    
+    config = await _load_oauth_config(provider)
+    _oauth_config_cache[provider.lower()] = (time.monotonic(), config)
+    return config
+
+
+async def _load_oauth_config(provider: str) -> Optional[Dict[str, str]]:
     from app.services.secret_manager import get_secret
     
     provider_upper = provider.upper()
@@ -89,50 +130,51 @@ async def exchange_google_code(code: str, redirect_uri: str) -> Optional[Dict[st
         return None
     
     try:
-        async with httpx.AsyncClient() as client:
-            # Exchange code for tokens
-            token_response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": config["client_id"],
-                    "client_secret": config["client_secret"],
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": redirect_uri,
-                }
-            )
-            
-            if token_response.status_code != 200:
-                logger.error(f"Google token exchange failed: {token_response.text}")
-                return None
-            
-            tokens = token_response.json()
-            access_token = tokens.get("access_token")
-            
-            if not access_token:
-                return None
-            
-            # Get user info
-            userinfo_response = await client.get(
-                GOOGLE_USERINFO_URL,
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-            
-            if userinfo_response.status_code != 200:
-                logger.error(f"Google userinfo failed: {userinfo_response.text}")
-                return None
-            
-            userinfo = userinfo_response.json()
-            
-            return {
-                "provider": "google",
-                "provider_id": userinfo.get("id"),
-                "email": userinfo.get("email"),
-                "email_verified": userinfo.get("verified_email", False),
-                "name": userinfo.get("name"),
-                "picture": userinfo.get("picture"),
+        # Shared pooled client: logins reuse keep-alive connections to the provider
+        client = get_http_client()
+        # Exchange code for tokens
+        token_response = await client.post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "client_id": config["client_id"],
+                "client_secret": config["client_secret"],
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": redirect_uri,
             }
-            
+        )
+        
+        if token_response.status_code != 200:
+            logger.error(f"Google token exchange failed: {token_response.text}")
+            return None
+        
+        tokens = token_response.json()
+        access_token = tokens.get("access_token")
+        
+        if not access_token:
+            return None
+        
+        # Get user info
+        userinfo_response = await client.get(
+            GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        
+        if userinfo_response.status_code != 200:
+            logger.error(f"Google userinfo failed: {userinfo_response.text}")
+            return None
+        
+        userinfo = userinfo_response.json()
+        
+        return {
+            "provider": "google",
+            "provider_id": userinfo.get("id"),
+            "email": userinfo.get("email"),
+            "email_verified": userinfo.get("verified_email", False),
+            "name": userinfo.get("name"),
+            "picture": userinfo.get("picture"),
+        }
+        
     except Exception as e:
         logger.error(f"Google OAuth error: {e}")
         return None
@@ -176,50 +218,51 @@ async def exchange_microsoft_code(code: str, redirect_uri: str) -> Optional[Dict
         return None
     
     try:
-        async with httpx.AsyncClient() as client:
-            # Exchange code for tokens
-            token_response = await client.post(
-                MICROSOFT_TOKEN_URL,
-                data={
-                    "client_id": config["client_id"],
-                    "client_secret": config["client_secret"],
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": redirect_uri,
-                }
-            )
-            
-            if token_response.status_code != 200:
-                logger.error(f"Microsoft token exchange failed: {token_response.text}")
-                return None
-            
-            tokens = token_response.json()
-            access_token = tokens.get("access_token")
-            
-            if not access_token:
-                return None
-            
-            # Get user info from Microsoft Graph
-            userinfo_response = await client.get(
-                MICROSOFT_USERINFO_URL,
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-            
-            if userinfo_response.status_code != 200:
-                logger.error(f"Microsoft userinfo failed: {userinfo_response.text}")
-                return None
-            
-            userinfo = userinfo_response.json()
-            
-            return {
-                "provider": "microsoft",
-                "provider_id": userinfo.get("id"),
-                "email": userinfo.get("mail") or userinfo.get("userPrincipalName"),
-                "email_verified": True,  # Microsoft accounts are always verified
-                "name": userinfo.get("displayName"),
-                "picture": None,  # Microsoft Graph requires separate call for photo
+        # Shared pooled client: logins reuse keep-alive connections to the provider
+        client = get_http_client()
+        # Exchange code for tokens
+        token_response = await client.post(
+            MICROSOFT_TOKEN_URL,
+            data={
+                "client_id": config["client_id"],
+                "client_secret": config["client_secret"],
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": redirect_uri,
             }
-            
+        )
+        
+        if token_response.status_code != 200:
+            logger.error(f"Microsoft token exchange failed: {token_response.text}")
+            return None
+        
+        tokens = token_response.json()
+        access_token = tokens.get("access_token")
+        
+        if not access_token:
+            return None
+        
+        # Get user info from Microsoft Graph
+        userinfo_response = await client.get(
+            MICROSOFT_USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        
+        if userinfo_response.status_code != 200:
+            logger.error(f"Microsoft userinfo failed: {userinfo_response.text}")
+            return None
+        
+        userinfo = userinfo_response.json()
+        
+        return {
+            "provider": "microsoft",
+            "provider_id": userinfo.get("id"),
+            "email": userinfo.get("mail") or userinfo.get("userPrincipalName"),
+            "email_verified": True,  # Microsoft accounts are always verified
+            "name": userinfo.get("displayName"),
+            "picture": None,  # Microsoft Graph requires separate call for photo
+        }
+        
     except Exception as e:
         logger.error(f"Microsoft OAuth error: {e}")
         return None
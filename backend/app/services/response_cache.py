@@ -0,0 +1,41 @@
+"""
+Redis cache for serialized JSON responses.
+
+Routers store a pre-rendered payload under a key and serve it back as-is on a
+hit. Redis being down is never an error: reads fall through to the database
+and writes/invalidations are skipped (entries still expire via their TTL).
+"""
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+from fastapi.responses import Response
+
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+async def get_cached(cache_key: str) -> Optional[Response]:
+    """Return a cached JSON payload as a response, or None on miss/Redis error"""
+    try:
+        cached = await redis_client.get(cache_key)
+        if cached:
+            return Response(content=cached, media_type="application/json")
+    except redis.RedisError:
+        logger.debug("Redis unavailable for cache read, proceeding without cache")
+    return None
+
+
+async def set_cached(cache_key: str, payload: bytes, ttl: int) -> None:
+    try:
+        await redis_client.setex(cache_key, ttl, payload)
+    except redis.RedisError:
+        logger.debug("Redis unavailable for cache write, continuing without caching")
+
+
+async def invalidate(*cache_keys: str) -> None:
+    try:
+        await redis_client.delete(*cache_keys)
+    except redis.RedisError:
+        logger.warning("Redis unavailable, %s not invalidated (stale until TTL expiry)", ", ".join(cache_keys))
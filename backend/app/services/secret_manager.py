@@ -158,11 +158,13 @@ def _get_secret_from_gcp(secret_name: str) -> Optional[Dict[str, str]]:
         return None
 
 
-async def get_secret(key_name: str) -> Optional[str]:
+async def get_secret(key_name: str, db_secrets: Optional[Dict[str, Any]] = None) -> Optional[str]:
     """
     Get a single secret value.
     
     Uses Google Secret Manager if available, falls back to database.
+    Callers that already loaded the SystemSecret rows can pass them as
+    db_secrets (keyed by key_name) to skip the database round trip.
     
     Secret key mappings:
     - AUTH0_* -> secret-auth bundle
@@ -191,6 +193,12 @@ async def get_secret(key_name: str) -> Optional[str]:
             return bundle[key_name]
     
     # Fallback to database
+    if db_secrets is not None:
+        from app.core.encryption import decrypt_safe
+        secret = db_secrets.get(key_name)
+        if secret and secret.key_value and secret.is_configured:
+            return decrypt_safe(secret.key_value)
+        return None
     return await _get_secret_from_db(key_name)
 
 
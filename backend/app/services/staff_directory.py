@@ -0,0 +1,51 @@
+"""
+Staff roster cache shared by the users router and every other User writer.
+
+The /users/staff and /users/staff/public responses are cached in Redis; any
+write touching a staff member's username, full_name, role, is_active or
+department_summary must call invalidate_staff_cache() after it commits.
+"""
+from typing import List
+
+from sqlalchemy import select, update, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User, Department, user_departments
+from app.services.response_cache import invalidate
+
+STAFF_CACHE_KEY = "users:staff"
+STAFF_PUBLIC_CACHE_KEY = "users:staff:public"
+STAFF_CACHE_TTL = 60  # seconds
+
+
+async def invalidate_staff_cache() -> None:
+    await invalidate(STAFF_CACHE_KEY, STAFF_PUBLIC_CACHE_KEY)
+
+
+def department_summary_expr():
+    """Correlated subquery rebuilding users.department_summary from user_departments."""
+    return (
+        select(func.coalesce(
+            func.json_agg(aggregate_order_by(
+                func.json_build_object("id", Department.id, "name", Department.name),
+                Department.name
+            )),
+            literal_column("'[]'::json")
+        ))
+        .select_from(user_departments.join(Department, Department.id == user_departments.c.department_id))
+        .where(user_departments.c.user_id == User.id)
+        .scalar_subquery()
+    )
+
+
+async def refresh_department_summaries(db: AsyncSession, user_ids: List[int]) -> None:
+    """Recompute department_summary for the given users. Caller commits, then invalidates the staff cache."""
+    if not user_ids:
+        return
+    await db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(department_summary=department_summary_expr())
+        .execution_options(synchronize_session=False)
+    )
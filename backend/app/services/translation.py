@@ -8,7 +8,9 @@ Flow:
 2. If not found, call Google Translate API via service account auth
 3. Store result in database for future use (persistent cache)
 """
-from typing import Optional, Dict, List
+from collections import OrderedDict
+from typing import Any, Optional, Dict, List, Tuple
+import asyncio
 import logging
 import json
 import httpx
@@ -18,6 +20,30 @@ logger = logging.getLogger(__name__)
 
 GOOGLE_TRANSLATE_API_URL = "https://translation.googleapis.com/language/translate/v2"
 
+# In-process LRU in front of the database cache: {(text, target_lang): translated}.
+# Category names and statuses repeat across list responses, so most lookups hit here.
+MEMORY_CACHE_SIZE = 10_000
+_memory_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_memory_stats = {"hits": 0, "misses": 0}
+
+
+def _memory_get(text: str, target_lang: str) -> Optional[str]:
+    key = (text, target_lang)
+    translated = _memory_cache.get(key)
+    if translated is None:
+        _memory_stats["misses"] += 1
+        return None
+    _memory_cache.move_to_end(key)
+    _memory_stats["hits"] += 1
+    return translated
+
+
+def _memory_put(text: str, target_lang: str, translated: str) -> None:
+    _memory_cache[(text, target_lang)] = translated
+    _memory_cache.move_to_end((text, target_lang))
+    if len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
 
 async def _get_auth_headers() -> Optional[Dict[str, str]]:
     """
@@ -76,7 +102,10 @@ async def get_api_key() -> Optional[str]:
 
 
 async def get_cached_translation(text: str, target_lang: str) -> Optional[str]:
-    """Check database for cached translation."""
+    """Check the in-process cache, then the database, for a cached translation."""
+    memo = _memory_get(text, target_lang)
+    if memo is not None:
+        return memo
     try:
         from app.db.session import SessionLocal
         from app.models import Translation
@@ -95,6 +124,7 @@ async def get_cached_translation(text: str, target_lang: str) -> Optional[str]:
             if cached:
                 from app.core.sanitize import sanitize_for_log
                 logger.debug(f"DB cache hit: '{text[:30]}...' -> '{sanitize_for_log(target_lang)}'")
+                _memory_put(text, target_lang, cached.translated_text)
                 return cached.translated_text
             return None
     except Exception as e:
@@ -102,8 +132,43 @@ async def get_cached_translation(text: str, target_lang: str) -> Optional[str]:
         return None
 
 
+async def get_cached_translations(texts: List[str], target_lang: str) -> Dict[str, str]:
+    """Look up cached translations for many texts in one query. Returns {text: translated}."""
+    found = {}
+    missing = []
+    for text in texts:
+        memo = _memory_get(text, target_lang)
+        if memo is not None:
+            found[text] = memo
+        else:
+            missing.append(text)
+    if not missing:
+        return found
+    try:
+        from app.db.session import SessionLocal
+        from app.models import Translation
+        
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(Translation.source_text, Translation.translated_text).where(
+                    and_(
+                        Translation.source_text.in_(missing),
+                        Translation.target_lang == target_lang
+                    )
+                )
+            )
+            for row in result:
+                found[row.source_text] = row.translated_text
+                _memory_put(row.source_text, target_lang, row.translated_text)
+            return found
+    except Exception as e:
+        logger.error(f"Failed to check translation cache: {e}")
+        return found
+
+
 async def save_translation_to_cache(text: str, target_lang: str, translated: str) -> None:
-    """Save translation to database cache."""
+    """Save translation to the in-process and database caches."""
+    _memory_put(text, target_lang, translated)
     try:
         from app.db.session import SessionLocal
         from app.models import Translation
@@ -233,13 +298,15 @@ async def translate_batch(
     results = {}
     uncached = []
     
-    # 1. Check database cache for each text
+    # 1. Check database cache for all texts in one query
+    texts = list(dict.fromkeys(texts))
+    cached_map = await get_cached_translations([t for t in texts if t and t.strip()], target_lang)
     for text in texts:
         if not text or not text.strip():
             results[text] = text
             continue
             
-        cached = await get_cached_translation(text, target_lang)
+        cached = cached_map.get(text)
         if cached:
             results[text] = cached
         else:
@@ -323,6 +390,60 @@ async def translate_service_response(service_dict: dict, target_lang: str) -> di
     return result
 
 
+def _collect_strings(data: Any, out: List[str]) -> None:
+    """Walk dicts/lists synchronously, appending every non-blank string leaf to out."""
+    if isinstance(data, str):
+        if data.strip():
+            out.append(data)
+    elif isinstance(data, dict):
+        for value in data.values():
+            _collect_strings(value, out)
+    elif isinstance(data, list):
+        for item in data:
+            _collect_strings(item, out)
+
+
+def _apply_translations(data: Any, translations: Dict[str, str]) -> Any:
+    """Return a copy of data with string leaves replaced from translations."""
+    if isinstance(data, str):
+        return translations.get(data) or data
+    if isinstance(data, dict):
+        return {key: _apply_translations(value, translations) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_apply_translations(item, translations) for item in data]
+    return data
+
+
+async def auto_translate_object(
+    data: dict,
+    source_lang: str = "en",
+    target_languages: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Translate every string in a (nested) dict into each target language.
+    Returns {lang: translated_copy}, including source_lang mapped to the original.
+    
+    The structure is walked once without awaiting; the only awaits are one
+    translate_batch per language, run concurrently.
+    """
+    if target_languages is None:
+        target_languages = list(get_supported_languages())
+    languages = [lang for lang in dict.fromkeys(target_languages) if lang != source_lang]
+    
+    texts: List[str] = []
+    _collect_strings(data, texts)
+    texts = list(dict.fromkeys(texts))
+    
+    batches = await asyncio.gather(
+        *(translate_batch(texts, source_lang, lang) for lang in languages)
+    )
+    
+    result: Dict[str, Any] = {source_lang: data}
+    for lang, translations in zip(languages, batches):
+        result[lang] = _apply_translations(data, translations)
+    return result
+
+
 def get_supported_languages() -> Dict[str, str]:
     """Get list of supported language codes and names."""
     return {
@@ -364,7 +485,8 @@ async def get_translation_cache_stats() -> Dict:
             
             return {
                 "total_cached": total_count,
-                "by_language": lang_counts
+                "by_language": lang_counts,
+                "memory": {"size": len(_memory_cache), **_memory_stats}
             }
     except Exception as e:
         logger.error(f"Failed to get cache stats: {e}")
@@ -8,15 +8,30 @@ This service analyzes service requests using Google's Gemini model to provide:
 - Safety flags
 """
 
+import asyncio
+import hashlib
 import json
 import re
 import logging
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Layer names that suggest critical infrastructure. One compiled alternation
+# scans the name once instead of a Python-level substring check per keyword.
+CRITICAL_LAYER_KEYWORDS = ["hospital", "fire station", "fire", "school", "emergency", "assisted living", "elderly", "police", "ems"]
+CRITICAL_LAYER_PATTERN = re.compile("|".join(map(re.escape, CRITICAL_LAYER_KEYWORDS)), re.IGNORECASE)
+
+VERTEX_SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
+
+# Credentials per service account fingerprint ("adc" for application default).
+# Built once per worker process; a token refresh only happens once it expires.
+_credentials_cache: Dict[str, Any] = {}
+_credentials_lock = threading.Lock()
+
 
 @dataclass
 class AnalysisResult:
@@ -77,7 +92,7 @@ def build_analysis_prompt(
 - **Submitted**: {submitted_date}
 """.format(
         service_type=request_data.get('service_name', 'Unknown'),
-        description=strip_pii(request_data.get('description', 'No description')),
+        description=request_data.get('description', 'No description'),
         address=request_data.get('address', 'No address provided'),
         submitted_date=request_data.get('submitted_date', 'Unknown')
     )
@@ -198,6 +213,52 @@ Provide your analysis in the following JSON format ONLY:
     return prompt
 
 
+def _credentials_fingerprint(service_account_json: Optional[str]) -> str:
+    """Stable cache key for a service account key, or "adc" when none is given."""
+    if not service_account_json:
+        return "adc"
+    sa_info = json.loads(service_account_json)
+    return hashlib.blake2b(json.dumps(sa_info, sort_keys=True).encode()).hexdigest()
+
+
+def _get_credentials(service_account_json: Optional[str] = None):
+    """Return cached, valid credentials for the given key (or default credentials)."""
+    import google.auth
+    from google.auth.transport.requests import Request
+    from google.oauth2 import service_account
+    
+    fingerprint = _credentials_fingerprint(service_account_json)
+    with _credentials_lock:
+        credentials = _credentials_cache.get(fingerprint)
+        if credentials is None:
+            if service_account_json:
+                credentials = service_account.Credentials.from_service_account_info(
+                    json.loads(service_account_json),
+                    scopes=VERTEX_SCOPES
+                )
+            else:
+                credentials, _ = google.auth.default(scopes=VERTEX_SCOPES)
+            _credentials_cache[fingerprint] = credentials
+        
+        if not credentials.valid:
+            credentials.refresh(Request())
+        return credentials
+
+
+async def get_credentials(service_account_json: Optional[str] = None):
+    """
+    Async wrapper around _get_credentials.
+    
+    Cached credentials that are still valid are returned straight away. Only
+    the first build and expiry refreshes, which make a blocking token request,
+    go through a worker thread.
+    """
+    credentials = _credentials_cache.get(_credentials_fingerprint(service_account_json))
+    if credentials is not None and credentials.valid:
+        return credentials
+    return await asyncio.to_thread(_get_credentials, service_account_json)
+
+
 async def analyze_with_gemini(
     project_id: str,
     location: str,
@@ -219,27 +280,9 @@ async def analyze_with_gemini(
         Parsed JSON response from Gemini
     """
     try:
-        import google.auth
-        from google.auth.transport.requests import Request
-        from google.oauth2 import service_account
         import aiohttp
         
-        # Set up authentication
-        if service_account_json:
-            # Use provided service account
-            sa_info = json.loads(service_account_json)
-            credentials = service_account.Credentials.from_service_account_info(
-                sa_info,
-                scopes=['https://www.googleapis.com/auth/cloud-platform']
-            )
-        else:
-            # Use default credentials (from environment)
-            credentials, _ = google.auth.default(
-                scopes=['https://www.googleapis.com/auth/cloud-platform']
-            )
-        
-        # Refresh the credentials
-        credentials.refresh(Request())
+        credentials = await get_credentials(service_account_json)
         
         # Build the API endpoint
         # Gemini 3 models are currently available on global endpoints
@@ -510,10 +553,7 @@ async def get_spatial_context(db, lat: float, long: float, service_code: str) ->
         
         for layer in all_layers:
             # Check if layer name suggests critical infrastructure
-            name_lower = layer.name.lower()
-            critical_keywords = ["hospital", "fire station", "fire", "school", "emergency", "assisted living", "elderly", "police", "ems"]
-            
-            if any(kw in name_lower for kw in critical_keywords):
+            if CRITICAL_LAYER_PATTERN.search(layer.name):
                 # Use PostGIS to check if request point is within 50m of any feature in this layer's GeoJSON
                 if layer.geojson and layer.geojson.get("features"):
                     try:
@@ -1,11 +1,12 @@
 from app.core.celery_app import celery_app
 from app.db.session import SessionLocal
-from app.models import ServiceRequest
+from app.models import ServiceRequest, SystemSecret
 from app.services.notifications import notification_service
 from app.services.geocoding import get_geocoding_service
 from sqlalchemy import select
 import asyncio
 import os
+import time
 
 
 def run_async(coro):
@@ -23,62 +24,90 @@ def run_async(coro):
     return asyncio.run(_runner())
 
 
-async def get_secret(db, key_name: str) -> str:
+async def get_secret(db, key_name: str, db_secrets=None) -> str:
     """Get a secret value from Secret Manager (checks GCP first, then DB)"""
     try:
         from app.services.secret_manager import get_secret as sm_get_secret
-        value = await sm_get_secret(key_name)
+        value = await sm_get_secret(key_name, db_secrets=db_secrets)
         return value if value else ""
     except Exception:
         return ""
 
 
+NOTIFICATION_SECRET_KEYS = (
+    "SMS_PROVIDER", "TWILIO_ACCOUNT_SID", "TWILIO_AUTH_TOKEN", "TWILIO_PHONE_NUMBER",
+    "SMS_HTTP_API_URL", "SMS_HTTP_API_KEY", "SMS_FROM_NUMBER",
+    "EMAIL_ENABLED", "SMTP_PORT", "SMTP_USE_TLS", "SMTP_HOST", "SMTP_USER",
+    "SMTP_PASSWORD", "SMTP_FROM_EMAIL", "SMTP_FROM_NAME",
+)
+
+# How long a worker keeps its notification providers before re-reading secrets
+NOTIFICATION_CONFIG_TTL = 60
+
+_notifications_configured_at: float = 0.0
 
 
 async def configure_notifications(db):
-    """Configure notification service from database secrets"""
+    """
+    Configure notification service from database secrets.
+    
+    The providers live on the notification_service singleton, so a worker
+    only reloads them every NOTIFICATION_CONFIG_TTL seconds. A reload reads
+    all the rows it needs in one query instead of one session per secret.
+    """
+    global _notifications_configured_at
     import logging
     logger = logging.getLogger(__name__)
     
+    if time.monotonic() - _notifications_configured_at < NOTIFICATION_CONFIG_TTL:
+        return
+    
+    result = await db.execute(
+        select(SystemSecret).where(SystemSecret.key_name.in_(NOTIFICATION_SECRET_KEYS))
+    )
+    secrets = {s.key_name: s for s in result.scalars().all()}
+    
     # Configure SMS provider
-    sms_provider = await get_secret(db, "SMS_PROVIDER")
+    sms_provider = await get_secret(db, "SMS_PROVIDER", secrets)
     logger.info(f"[SMS Config] SMS_PROVIDER: {'set' if sms_provider else 'empty'}")
     
     if sms_provider == "twilio":
         notification_service.configure_sms("twilio", {
-            "account_sid": await get_secret(db, "TWILIO_ACCOUNT_SID"),
-            "auth_token": await get_secret(db, "TWILIO_AUTH_TOKEN"),
-            "from_number": await get_secret(db, "TWILIO_PHONE_NUMBER")
+            "account_sid": await get_secret(db, "TWILIO_ACCOUNT_SID", secrets),
+            "auth_token": await get_secret(db, "TWILIO_AUTH_TOKEN", secrets),
+            "from_number": await get_secret(db, "TWILIO_PHONE_NUMBER", secrets)
         })
         logger.info("[SMS Config] Configured Twilio provider")
     elif sms_provider == "http":
-        api_url = await get_secret(db, "SMS_HTTP_API_URL")
-        api_key = await get_secret(db, "SMS_HTTP_API_KEY")
+        api_url = await get_secret(db, "SMS_HTTP_API_URL", secrets)
+        api_key = await get_secret(db, "SMS_HTTP_API_KEY", secrets)
         logger.info(f"[SMS Config] Configuring HTTP provider with URL: {'set' if api_url else 'EMPTY'}")
         notification_service.configure_sms("http", {
             "api_url": api_url,
             "api_key": api_key,
-            "from_number": await get_secret(db, "SMS_FROM_NUMBER")
+            "from_number": await get_secret(db, "SMS_FROM_NUMBER", secrets)
         })
         logger.info("[SMS Config] Configured HTTP/Textbelt provider")
     else:
         logger.warning("[SMS Config] Unknown or empty SMS_PROVIDER - SMS will not work")
     
     # Configure Email provider
-    email_enabled = await get_secret(db, "EMAIL_ENABLED")
+    email_enabled = await get_secret(db, "EMAIL_ENABLED", secrets)
     if email_enabled.lower() == "true":
-        smtp_port_str = await get_secret(db, "SMTP_PORT")
-        use_tls_str = await get_secret(db, "SMTP_USE_TLS")
+        smtp_port_str = await get_secret(db, "SMTP_PORT", secrets)
+        use_tls_str = await get_secret(db, "SMTP_USE_TLS", secrets)
         
         notification_service.configure_email({
-            "smtp_host": await get_secret(db, "SMTP_HOST"),
+            "smtp_host": await get_secret(db, "SMTP_HOST", secrets),
             "smtp_port": int(smtp_port_str) if smtp_port_str else 587,
-            "smtp_user": await get_secret(db, "SMTP_USER"),
-            "smtp_password": await get_secret(db, "SMTP_PASSWORD"),
-            "from_email": await get_secret(db, "SMTP_FROM_EMAIL"),
-            "from_name": await get_secret(db, "SMTP_FROM_NAME") or "Township 311",
+            "smtp_user": await get_secret(db, "SMTP_USER", secrets),
+            "smtp_password": await get_secret(db, "SMTP_PASSWORD", secrets),
+            "from_email": await get_secret(db, "SMTP_FROM_EMAIL", secrets),
+            "from_name": await get_secret(db, "SMTP_FROM_NAME", secrets) or "Township 311",
             "use_tls": use_tls_str.lower() != "false" if use_tls_str else True
         })
+    
+    _notifications_configured_at = time.monotonic()
 
 
 @celery_app.task(bind=True, max_retries=3)
@@ -148,16 +177,23 @@ def analyze_request(self, request_id: int):
             analysis_time = datetime.now(ZoneInfo("US/Eastern"))
             request_data["analysis_time"] = analysis_time.strftime("%Y-%m-%d %H:%M:%S %Z")
 
-            # Get historical & spatial context
-            historical_context = await get_historical_context(
-                db, request.address, request.service_code, request.lat, request.long, exclude_id=request.id, description=request.description or ""
-            )
-            spatial_context = await get_spatial_context(
-                db, request.lat, request.long, request.service_code
-            )
+            # Fetch real-time weather for triage location. It's an outside HTTP call
+            # that doesn't touch the session, so it runs while the context queries do.
+            weather_task = asyncio.create_task(get_weather_for_location(request.lat, request.long))
             
-            # Fetch real-time weather for triage location
-            request_data["current_weather"] = await get_weather_for_location(request.lat, request.long)
+            # Get historical & spatial context (same session, so these stay sequential)
+            try:
+                historical_context = await get_historical_context(
+                    db, request.address, request.service_code, request.lat, request.long, exclude_id=request.id, description=request.description or ""
+                )
+                spatial_context = await get_spatial_context(
+                    db, request.lat, request.long, request.service_code
+                )
+            except BaseException:
+                weather_task.cancel()
+                raise
+            
+            request_data["current_weather"] = await weather_task
 
             # Build the analysis prompt
             prompt = build_analysis_prompt(
@@ -566,6 +602,8 @@ def send_department_notification(request_id: int, department_email: str):
             department = dept_result.scalar_one_or_none()
             
             notified_staff = []
+            pending_emails = []
+            pending_sms = []
             
             if department:
                 # Query staff in this department with their notification preferences
@@ -616,12 +654,12 @@ def send_department_notification(request_id: int, department_email: str):
                     
                     # Send email if enabled
                     if prefs.get('email_new_requests', True) and staff.email:
-                        notification_service.send_email(
-                            to=staff.email,
-                            subject=subject,
-                            body_html=body_html,
-                            from_name=f"{township_name} 311"
-                        )
+                        pending_emails.append({
+                            "to": staff.email,
+                            "subject": subject,
+                            "body_html": body_html,
+                            "from_name": f"{township_name} 311"
+                        })
                         notified_staff.append({"email": staff.email, "type": "email"})
                     
                     # Send SMS if enabled globally and by user preference
@@ -633,8 +671,12 @@ New Request: {request.service_name}
 📍 {request.address or 'No address'}
 
 🔗 {staff_link}"""
-                        await notification_service.send_sms(staff.phone, sms_message)
+                        pending_sms.append((staff.phone, sms_message))
                         notified_staff.append({"phone": staff.phone, "type": "sms"})
+                
+                # Send the whole department in one batch per channel
+                notification_service.send_email_many(pending_emails)
+                await notification_service.send_sms_many(pending_sms)
             
             # Also send to department email as fallback/archive
             if department_email and not notified_staff:
@@ -859,6 +901,7 @@ def send_weekly_digest():
             
             sent_count = 0
             skipped_count = 0
+            digests = []
             
             for staff in staff_members:
                 # Check notification preferences
@@ -1020,14 +1063,13 @@ def send_weekly_digest():
                 </html>
                 """
                 
-                # Send email
-                notification_service.send_email(
-                    to=staff.email,
-                    subject=subject,
-                    body_html=body_html
-                )
+                digests.append({"to": staff.email, "subject": subject, "body_html": body_html})
+            
+            # Send all digests in one batch over the pooled SMTP session
+            notification_service.send_email_many(digests)
+            for digest in digests:
                 sent_count += 1
-                logger.info(f"[Weekly Digest] Sent to {staff.email}")
+                logger.info(f"[Weekly Digest] Sent to {digest['to']}")
             
             return {
                 "status": "success",